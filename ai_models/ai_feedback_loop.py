@@ -10,11 +10,13 @@ from core.risk_management import apply_risk_management
 from config import ENABLE_SELF_LEARNING, RETRAIN_MODEL_THRESHOLD, RETRAIN_MODEL_INTERVAL
 
 class AIFeedbackLoop:
-    def __init__(self):
+    def __init__(self, ai_model=None):
         """
         Initializes the AI feedback system for adaptive learning.
+        Args:
+            ai_model (PredictiveAI): Live model to retrain (a new one is created if omitted).
         """
-        self.ai_model = PredictiveAI()
+        self.ai_model = ai_model or PredictiveAI()
         self.trade_history = []
         self.prediction_count = 0  # Track how many times AI makes predictions
 
@@ -62,10 +64,10 @@ class AIFeedbackLoop:
 
         accuracy = self.calculate_trade_accuracy()
         if accuracy and accuracy < RETRAIN_MODEL_THRESHOLD:
-            print(f"⚠️ AI accuracy low ({accuracy:.2f}%). Retraining model...")
-            self.ai_model.train_new_model()  # Calls AI retraining function
-            self.trade_history.clear()  # Reset history after retraining
-            self.prediction_count = 0  # Reset prediction count
+            print(f"⚠️ AI accuracy low ({accuracy:.2f}%). Retraining model in background...")
+            if self.ai_model.train_new_model():  # Returns immediately; the model is swapped in when ready
+                self.trade_history.clear()  # Reset history after retraining
+                self.prediction_count = 0  # Reset prediction count
 
     def adaptive_trade_sizing(self, trade_signal, balance, market_data):
         """
@@ -9,11 +9,13 @@ from ai_models.predictive_ai import PredictiveAI
 from config import ENABLE_MARKET_ADAPTATION, TREND_WINDOW, VOLATILITY_WINDOW
 
 class AIMarketAdaptation:
-    def __init__(self):
+    def __init__(self, ai_model=None):
         """
         Initializes AI strategy adaptation module.
+        Args:
+            ai_model (PredictiveAI): Shared signal model (a new one is created if omitted).
         """
-        self.ai_model = PredictiveAI()
+        self.ai_model = ai_model or PredictiveAI()
         self.current_strategy = "scalping"  # Default strategy
 
     def detect_market_phase(self, market_data):
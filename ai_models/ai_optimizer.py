@@ -3,37 +3,257 @@
 # 🔬 AI OPTIMIZER – FINE-TUNING AI PARAMETERS 🔬
 # ==================================================
 
+import os
+import json
+import time
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 import numpy as np
-from ai_models.train_transformer import TrainTransformer
-from config import OPTIMIZATION_ROUNDS
+import pandas as pd
+from core.data_preprocessing import load_market_data
+from config import (
+    OPTIMIZATION_ROUNDS, HPO_MIN_EPOCHS, HPO_MAX_EPOCHS, HPO_REDUCTION_FACTOR,
+    HPO_VALIDATION_SPLIT, HPO_MAX_WORKERS, HPO_CACHE_DIR, HPO_SEED
+)
+
+# Per-process trainer, created once by each pool worker and reused across trials
+_worker_trainer = None
+
+
+def _init_worker(worker_counter, cores_per_worker):
+    """
+    Pins a pool worker to its own block of CPU cores.
+    Args:
+        worker_counter (multiprocessing.Value): Shared counter used to hand out core blocks.
+        cores_per_worker (int): Number of cores reserved for each worker.
+    """
+    with worker_counter.get_lock():
+        worker_index = worker_counter.value
+        worker_counter.value += 1
+
+    available = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(os.cpu_count() or 1))
+    start = (worker_index * cores_per_worker) % len(available)
+    cores = available[start:start + cores_per_worker] or available[:cores_per_worker]
+
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+
+    # ✅ Keep TensorFlow inside the pinned cores instead of oversubscribing the machine
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(len(cores))
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+
+def _run_trial(trial_id, settings, epochs, checkpoint_path, resume_epoch):
+    """
+    Trains one configuration up to an epoch budget inside a pool worker.
+    Args:
+        trial_id (int): Index of the trial in the search.
+        settings (dict): Sampled hyperparameters.
+        epochs (int): Total epoch budget for this rung.
+        checkpoint_path (str): Where the trial's weights are stored between rungs.
+        resume_epoch (int): Epochs already trained in the checkpoint (0 = start fresh).
+    Returns:
+        tuple: (trial_id, epochs, validation loss, training seconds)
+    """
+    global _worker_trainer
+    from tensorflow.keras.models import load_model
+    from ai_models.train_transformer import TrainTransformer
+
+    if _worker_trainer is None:
+        _worker_trainer = TrainTransformer()
+
+    if resume_epoch and os.path.exists(checkpoint_path):
+        _worker_trainer.model = load_model(checkpoint_path)
+    else:
+        resume_epoch = 0
+        _worker_trainer.model = _worker_trainer.build_model(learning_rate=settings["learning_rate"])
+
+    start_time = time.time()
+    val_loss = _worker_trainer.train_model(
+        epochs=epochs,
+        batch_size=settings["batch_size"],
+        initial_epoch=resume_epoch,
+        validation_split=HPO_VALIDATION_SPLIT,
+        save=False,
+        verbose=0,
+    )
+    _worker_trainer.model.save(checkpoint_path)
+    return trial_id, epochs, val_loss, time.time() - start_time
+
 
 class AIOptimizer:
-    def __init__(self):
-        """Initialize AI optimization process."""
-        self.model_trainer = TrainTransformer()
+    def __init__(self, n_trials=OPTIMIZATION_ROUNDS, max_workers=HPO_MAX_WORKERS, cache_dir=HPO_CACHE_DIR):
+        """
+        Initialize AI optimization process.
+        Args:
+            n_trials (int): Number of configurations sampled for the search.
+            max_workers (int): Size of the process pool (None = one per available core).
+            cache_dir (str): Directory holding finished trial results & checkpoints.
+        """
+        self.n_trials = n_trials
+        self.cache_dir = cache_dir
+        self.cache_file = os.path.join(cache_dir, "trials.json")
+        self.rng = np.random.default_rng(HPO_SEED)
+
+        available_cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+        self.max_workers = max(1, min(max_workers or available_cores, available_cores))
+        self.cores_per_worker = max(1, available_cores // self.max_workers)
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.results = self._load_cache()
+        self.data_fingerprint = self._fingerprint_data()
+
+    def _fingerprint_data(self):
+        """
+        Hashes the training data so cached trials are only reused on identical data.
+        Returns:
+            str: Hex digest of the market data.
+        """
+        df = load_market_data()
+        return hashlib.sha1(pd.util.hash_pandas_object(df, index=True).values.tobytes()).hexdigest()
+
+    def _load_cache(self):
+        """Loads finished trial results from disk."""
+        try:
+            if os.path.exists(self.cache_file):
+                with open(self.cache_file, "r") as file:
+                    return json.load(file)
+        except Exception as e:
+            print(f"⚠️ Trial cache unreadable, starting fresh: {e}")
+        return {}
+
+    def _save_cache(self):
+        """Atomically writes trial results to disk."""
+        tmp_path = f"{self.cache_file}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(self.results, file, indent=2)
+        os.replace(tmp_path, self.cache_file)
+
+    def _trial_key(self, settings, epochs):
+        """
+        Builds the cache key for a configuration trained to a given budget.
+        Args:
+            settings (dict): Hyperparameters.
+            epochs (int): Epoch budget.
+        Returns:
+            str: Cache key.
+        """
+        payload = json.dumps({"settings": settings, "epochs": int(epochs), "data": self.data_fingerprint}, sort_keys=True)
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+    def _checkpoint_path(self, settings):
+        """Returns the weights checkpoint path for a configuration."""
+        key = self._trial_key(settings, 0)
+        return os.path.join(self.cache_dir, f"trial_{key}.keras")
+
+    def sample_configurations(self):
+        """
+        Samples hyperparameter configurations for the search.
+        Returns:
+            list: Hyperparameter dictionaries.
+        """
+        return [
+            {
+                "learning_rate": float(10 ** self.rng.uniform(-4, -2)),  # Log-uniform in [1e-4, 1e-2]
+                "batch_size": int(self.rng.choice([16, 32, 64])),
+            }
+            for _ in range(self.n_trials)
+        ]
+
+    def rung_budgets(self):
+        """
+        Computes the epoch budget for each successive-halving rung.
+        Returns:
+            list: Increasing epoch budgets ending at HPO_MAX_EPOCHS.
+        """
+        budgets = []
+        epochs = HPO_MIN_EPOCHS
+        while epochs < HPO_MAX_EPOCHS:
+            budgets.append(epochs)
+            epochs *= HPO_REDUCTION_FACTOR
+        budgets.append(HPO_MAX_EPOCHS)
+        return budgets
+
+    def _run_rung(self, pool, configs, trial_ids, epochs, previous_epochs):
+        """
+        Evaluates the surviving trials at one rung, reusing cached results.
+        Args:
+            pool (ProcessPoolExecutor): Worker pool.
+            configs (list): All sampled configurations.
+            trial_ids (list): Trials promoted to this rung.
+            epochs (int): Epoch budget of this rung.
+            previous_epochs (int): Epoch budget already trained by the previous rung.
+        Returns:
+            dict: {trial_id: validation loss}
+        """
+        scores = {}
+        futures = []
+        for trial_id in trial_ids:
+            key = self._trial_key(configs[trial_id], epochs)
+            if key in self.results:
+                scores[trial_id] = self.results[key]["val_loss"]
+                continue
+            futures.append(pool.submit(
+                _run_trial, trial_id, configs[trial_id], epochs,
+                self._checkpoint_path(configs[trial_id]), previous_epochs
+            ))
+
+        for future in as_completed(futures):
+            try:
+                trial_id, trial_epochs, val_loss, seconds = future.result()
+            except Exception as e:
+                print(f"❌ Trial failed: {e}")
+                continue
+
+            scores[trial_id] = val_loss
+            self.results[self._trial_key(configs[trial_id], trial_epochs)] = {
+                "settings": configs[trial_id],
+                "epochs": trial_epochs,
+                "val_loss": val_loss,
+                "seconds": round(seconds, 2),
+            }
+            self._save_cache()  # Persist every finished trial so interrupted searches resume
+            print(f"🔍 Trial {trial_id} @ {trial_epochs} epochs: val_loss={val_loss:.6f} ({seconds:.1f}s)")
+
+        return scores
 
     def optimize_hyperparameters(self):
         """
-        Runs multiple AI training sessions with different hyperparameters.
+        Runs a parallel successive-halving search over AI training hyperparameters.
         Returns:
             dict: Best hyperparameter settings.
         """
-        best_performance = float("-inf")
-        best_settings = {}
+        configs = self.sample_configurations()
+        budgets = self.rung_budgets()
+        survivors = list(range(len(configs)))
+        scores = {}
+        previous_epochs = 0
 
-        for _ in range(OPTIMIZATION_ROUNDS):
-            learning_rate = np.random.uniform(0.0001, 0.01)
-            batch_size = np.random.choice([16, 32, 64])
-            epochs = np.random.choice([20, 40, 60])
+        print(f"🚀 Searching {len(configs)} configs over rungs {budgets} with {self.max_workers} workers "
+              f"({self.cores_per_worker} cores each)")
 
-            print(f"🔍 Testing config: LR={learning_rate}, Batch={batch_size}, Epochs={epochs}")
-            performance = self.model_trainer.train_model(epochs=epochs, batch_size=batch_size)
+        ctx = multiprocessing.get_context("spawn")  # TensorFlow is not fork-safe
+        worker_counter = ctx.Value("i", 0)
+        with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=ctx,
+                                 initializer=_init_worker, initargs=(worker_counter, self.cores_per_worker)) as pool:
+            for rung, epochs in enumerate(budgets):
+                scores = self._run_rung(pool, configs, survivors, epochs, previous_epochs)
+                if not scores:
+                    print("❌ No trials completed. Aborting search.")
+                    return {}
 
-            if performance > best_performance:
-                best_performance = performance
-                best_settings = {"learning_rate": learning_rate, "batch_size": batch_size, "epochs": epochs}
+                # ✅ Prune: only the best 1/eta trials move on to the next, larger budget
+                ranked = sorted(scores, key=scores.get)
+                if rung < len(budgets) - 1:
+                    survivors = ranked[:max(1, len(ranked) // HPO_REDUCTION_FACTOR)]
+                previous_epochs = epochs
 
-        print(f"✅ Best AI Settings: {best_settings}")
+        best_trial = min(scores, key=scores.get)
+        best_settings = {**configs[best_trial], "epochs": budgets[-1]}
+        print(f"✅ Best AI Settings: {best_settings} (val_loss={scores[best_trial]:.6f})")
         return best_settings
 
 # 🚀 START AI OPTIMIZATION
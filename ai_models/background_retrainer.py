@@ -0,0 +1,132 @@
+# background_retrainer.py
+# ==================================================
+# 🔄 BACKGROUND RETRAINER – NON-BLOCKING MODEL REFRESH 🔄
+# ==================================================
+
+import os
+import time
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from custom_logging.logger import Logger
+from config import MODEL_PATH, RETRAIN_EPOCHS, RETRAIN_BATCH_SIZE, RETRAIN_VALIDATION_SPLIT
+
+
+def _retrain_worker(model_json, weights, X, y, candidate_path):
+    """
+    Fine-tunes a copy of the live model in a separate process and scores it against the original.
+    Args:
+        model_json (str): Architecture of the live model.
+        weights (list): Weights of the live model at snapshot time.
+        X (np.array): Training windows.
+        y (np.array): Training targets.
+        candidate_path (str): Where the retrained model is written.
+    Returns:
+        tuple: (candidate validation loss, current validation loss, training seconds)
+    """
+    from tensorflow.keras.models import model_from_json
+
+    start_time = time.time()
+    split = max(1, int(len(X) * (1 - RETRAIN_VALIDATION_SPLIT)))
+    X_train, y_train, X_val, y_val = X[:split], y[:split], X[split:], y[split:]
+
+    current = model_from_json(model_json)
+    current.set_weights(weights)
+    current.compile(optimizer="adam", loss="mse")
+
+    candidate = model_from_json(model_json)
+    candidate.set_weights(weights)
+    candidate.compile(optimizer="adam", loss="mse")
+    candidate.fit(X_train, y_train, epochs=RETRAIN_EPOCHS, batch_size=RETRAIN_BATCH_SIZE, verbose=0)
+
+    if len(X_val) == 0:  # Too little data to hold out – score on the training windows
+        X_val, y_val = X_train, y_train
+    current_loss = float(current.evaluate(X_val, y_val, verbose=0))
+    candidate_loss = float(candidate.evaluate(X_val, y_val, verbose=0))
+
+    candidate.save(candidate_path)
+    return candidate_loss, current_loss, time.time() - start_time
+
+
+class BackgroundRetrainer:
+    def __init__(self, on_swap):
+        """
+        Initializes the background retraining worker.
+        Args:
+            on_swap (callable): Called with the new model once it has been validated & loaded.
+        """
+        self.on_swap = on_swap
+        self.candidate_path = MODEL_PATH.replace(".h5", ".candidate.h5")
+        self.executor = None
+        self.future = None
+        self.lock = threading.Lock()
+        self.stats = {"retrains": 0, "swaps": 0, "rejected": 0, "failed": 0, "last_retrain_seconds": None}
+
+    def is_running(self):
+        """Returns True while a retrain is in flight."""
+        return self.future is not None and not self.future.done()
+
+    def submit(self, model, X, y):
+        """
+        Starts a retrain on a snapshot of the live model & data without blocking the caller.
+        Args:
+            model: Live Keras model (only its architecture & weights are copied).
+            X (np.array): Training windows.
+            y (np.array): Training targets.
+        Returns:
+            bool: True if a retrain was started, False if one is already running.
+        """
+        with self.lock:
+            if self.is_running():
+                Logger.info("⏳ Retrain already in progress. Skipping request.")
+                return False
+
+            if self.executor is None:
+                # ✅ Separate process so the fit never competes with the trading thread for the GIL
+                self.executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+
+            self.future = self.executor.submit(
+                _retrain_worker, model.to_json(), model.get_weights(), X.copy(), y.copy(), self.candidate_path
+            )
+            self.future.add_done_callback(self._on_retrain_done)
+            self.stats["retrains"] += 1
+            Logger.info(f"🔄 Background retrain started on {len(X)} windows.")
+            return True
+
+    def _on_retrain_done(self, future):
+        """
+        Validates the finished candidate and hot-swaps it in if it beats the live model.
+        Args:
+            future (Future): Completed retrain job.
+        """
+        try:
+            candidate_loss, current_loss, seconds = future.result()
+        except Exception as e:
+            self.stats["failed"] += 1
+            Logger.error(f"❌ Background retrain failed: {e}")
+            return
+
+        self.stats["last_retrain_seconds"] = round(seconds, 2)
+        Logger.info(f"⏱️ Retrain finished in {seconds:.1f}s | candidate loss {candidate_loss:.6f} vs current {current_loss:.6f}")
+
+        if candidate_loss >= current_loss:
+            self.stats["rejected"] += 1
+            Logger.info("⚠️ Retrained model is not better. Keeping current model.")
+            return
+
+        try:
+            from tensorflow.keras.models import load_model
+            new_model = load_model(self.candidate_path)
+            os.replace(self.candidate_path, MODEL_PATH)  # Atomic on-disk swap
+            self.on_swap(new_model)
+            self.stats["swaps"] += 1
+            Logger.info(f"✅ Model hot-swapped (swap #{self.stats['swaps']}).")
+        except Exception as e:
+            self.stats["failed"] += 1
+            Logger.error(f"❌ Model swap failed: {e}")
+
+    def shutdown(self):
+        """Stops the worker process without waiting for an in-flight retrain."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
@@ -0,0 +1,100 @@
+# online_learner.py
+# ==================================================
+# 📚 ONLINE LEARNER – INCREMENTAL MODEL FINE-TUNING 📚
+# ==================================================
+
+import os
+from collections import deque
+import numpy as np
+from custom_logging.logger import Logger
+from config import (
+    PAIR, ONLINE_BUFFER_SIZE, ONLINE_BATCH_SIZE, ONLINE_LEARNING_RATE, ONLINE_CHECKPOINT_INTERVAL
+)
+
+
+class OnlineLearner:
+    def __init__(self, buffer_size=ONLINE_BUFFER_SIZE, batch_size=ONLINE_BATCH_SIZE, checkpoint_path=None):
+        """
+        Initializes the online learner.
+        Args:
+            buffer_size (int): Maximum number of labelled windows kept for replay (per symbol).
+            batch_size (int): Samples per gradient step.
+            checkpoint_path (str): Where the model is saved every ONLINE_CHECKPOINT_INTERVAL updates
+                (None = never; only the live PredictiveAI passes MODEL_PATH).
+        """
+        self.buffer_size = buffer_size
+        self.buffers = {}  # symbol -> bounded deque of (window, target); old windows fall off automatically
+        self.batch_size = batch_size
+        self.checkpoint_path = checkpoint_path
+        self.rng = np.random.default_rng()
+        self.updates = 0
+        self.tuned_model_id = None
+        self.last_loss = None
+
+    def add_samples(self, X, y, symbol=PAIR):
+        """
+        Adds freshly labelled windows to a symbol's replay buffer.
+        Args:
+            X (np.array): Indicator windows.
+            y (np.array): Realized close that followed each window.
+            symbol (str): Trading pair the windows come from.
+        Returns:
+            deque: The symbol's buffer.
+        """
+        buffer = self.buffers.get(symbol)
+        if buffer is None:
+            buffer = self.buffers[symbol] = deque(maxlen=self.buffer_size)
+        buffer.extend(zip(X, y))
+        return buffer
+
+    def update(self, model, X_new, y_new, symbol=PAIR):
+        """
+        Applies one small warm-started gradient step on new samples mixed with replayed ones of the same symbol.
+        Args:
+            model: Live Keras model (updated in place).
+            X_new (np.array): Newly labelled windows.
+            y_new (np.array): Their realized targets.
+            symbol (str): Trading pair the samples come from.
+        Returns:
+            float or None: Batch loss, or None if there was nothing to learn from.
+        """
+        if len(X_new) == 0:
+            return None
+
+        buffer = self.add_samples(X_new, y_new, symbol)
+
+        # ✅ Newest samples first, topped up with random replay to avoid overfitting the last candle
+        X_batch, y_batch = list(X_new[-self.batch_size:]), list(y_new[-self.batch_size:])
+        n_replay = min(self.batch_size - len(X_batch), len(buffer) - len(X_new))
+        if n_replay > 0:
+            for i in self.rng.choice(len(buffer) - len(X_new), size=n_replay, replace=False):
+                x, target = buffer[i]
+                X_batch.append(x)
+                y_batch.append(target)
+
+        if self.tuned_model_id != id(model):  # New or hot-swapped model – use a small step size
+            model.optimizer.learning_rate.assign(ONLINE_LEARNING_RATE)
+            self.tuned_model_id = id(model)
+
+        self.last_loss = float(np.ravel(model.train_on_batch(np.stack(X_batch), np.asarray(y_batch)))[0])
+        self.updates += 1
+
+        if self.checkpoint_path and self.updates % ONLINE_CHECKPOINT_INTERVAL == 0:
+            self.checkpoint(model)
+        return self.last_loss
+
+    def checkpoint(self, model):
+        """
+        Atomically writes the model to the checkpoint path.
+        Args:
+            model: Keras model to persist.
+        """
+        if not self.checkpoint_path:
+            return
+        tmp_path = self.checkpoint_path.replace(".h5", ".tmp.h5")
+        try:
+            model.save(tmp_path)
+            os.replace(tmp_path, self.checkpoint_path)
+            Logger.info(f"💾 Online model checkpoint saved after {self.updates} updates (loss {self.last_loss:.6f}).")
+        except Exception as e:
+            Logger.error(f"❌ Online checkpoint failed: {e}")
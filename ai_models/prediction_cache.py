@@ -0,0 +1,104 @@
+# prediction_cache.py
+# ==================================================
+# 🗃️ PREDICTION CACHE – SKIPS REDUNDANT MODEL INFERENCE 🗃️
+# ==================================================
+
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from config import PREDICTION_CACHE_SIZE, PREDICTION_CACHE_TTL
+
+
+class PredictionCache:
+    def __init__(self, max_entries=PREDICTION_CACHE_SIZE, ttl=PREDICTION_CACHE_TTL):
+        """
+        Initializes an LRU prediction cache with time-based expiry.
+        Args:
+            max_entries (int): Maximum cached predictions before the least recently used is evicted.
+            ttl (float): Seconds a prediction stays valid.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()  # key -> (expires_at, value)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def make_key(model_version, symbol, last_candle, features):
+        """
+        Builds a cache key for one model input.
+        Args:
+            model_version (int): Version of the model that produced the prediction.
+            symbol (str): Trading pair.
+            last_candle: Timestamp (or index) of the last candle in the window.
+            features (np.array): Exact model input, hashed so in-progress candle updates miss the cache.
+        Returns:
+            tuple: Cache key.
+        """
+        feature_hash = hashlib.blake2b(features.tobytes(), digest_size=16).hexdigest()
+        return model_version, symbol, str(last_candle), feature_hash
+
+    def get(self, key):
+        """
+        Looks up a cached prediction.
+        Args:
+            key (tuple): Cache key.
+        Returns:
+            Cached value or None on a miss.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self.entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)  # Mark as most recently used
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """
+        Stores a prediction, evicting the least recently used entry if full.
+        Args:
+            key (tuple): Cache key.
+            value: Prediction to cache.
+        """
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drops every cached prediction (e.g. after a model swap)."""
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        """
+        Returns cache effectiveness metrics.
+        Returns:
+            dict: Hits, misses, hit rate, evictions, expirations & current size.
+        """
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self.entries),
+            }
@@ -9,13 +9,34 @@ from tensorflow.keras.models import load_model, Sequential
 from tensorflow.keras.layers import LSTM, Dense, Dropout
 import pandas as pd
 import os
-from config import MODEL_PATH, RETRAIN_MODEL_INTERVAL
+import hashlib
+from ai_models.background_retrainer import BackgroundRetrainer
+from ai_models.online_learner import OnlineLearner
+from ai_models.prediction_cache import PredictionCache
+from config import (
+    MODEL_PATH, RETRAIN_MODEL_INTERVAL, ONLINE_LEARNING, ONLINE_LEARNING_SYMBOLS, PAIR, PREDICT_BATCH_SIZE
+)
+
+INDICATORS = ['rsi', 'macd', 'signal', 'momentum', 'volatility']
+WINDOW_SIZE = 30
 
 class PredictiveAI:
-    def __init__(self):
-        """Load AI model for trade signal prediction."""
+    def __init__(self, live=False):
+        """
+        Load AI model for trade signal prediction.
+        Args:
+            live (bool): Live trading instance – only then can online learning (ONLINE_LEARNING) fine-tune
+                the model and checkpoint it to MODEL_PATH. Backtests & simulations never train it.
+        """
         self.model = self.load_or_create_model()
+        self.model_version = 0  # Bumped whenever the weights change (swap, online update, retrain)
+        self.prediction_cache = PredictionCache()
         self.prediction_count = 0  # Track AI prediction usage
+        self.latest_market_data = None  # Most recent data seen, used as the retraining snapshot
+        self.retrainer = BackgroundRetrainer(on_swap=self.swap_model)
+        self.online_learner = OnlineLearner(checkpoint_path=MODEL_PATH) if live and ONLINE_LEARNING else None
+        self.last_labelled_candle = {}  # symbol -> timestamp of the newest candle already used as a label
+        self._weights_fingerprint = None  # (model_version, digest) – recomputed only after the weights change
 
     def load_or_create_model(self):
         """Loads AI model if available, otherwise creates a new model."""
@@ -49,29 +70,89 @@ class PredictiveAI:
         Returns:
             np.array: Processed input data for model
         """
-        indicators = ['rsi', 'macd', 'signal', 'momentum', 'volatility']
-        if not all(indicator in market_data.columns for indicator in indicators):
+        if not all(indicator in market_data.columns for indicator in INDICATORS):
             print("⚠️ Missing required indicators in market data. Returning HOLD.")
-            return np.zeros((1, 30, 5))  # Return dummy data to prevent errors
+            return np.zeros((1, WINDOW_SIZE, len(INDICATORS)))  # Return dummy data to prevent errors
 
-        data = market_data[indicators].tail(30).values  # Last 30 time steps
+        data = market_data[INDICATORS].tail(WINDOW_SIZE).values  # Last 30 time steps
         return np.expand_dims(data, axis=0)  # Reshape for model input
 
-    def generate_trade_signal(self, market_data):
+    def prepare_training_windows(self, market_data):
+        """
+        Builds labelled training windows from market data.
+        Args:
+            market_data (DataFrame): Market data with close prices & indicators.
+        Returns:
+            tuple: (X, y) – 30-step indicator windows and the close that followed each one.
+        """
+        features = market_data[INDICATORS].to_numpy(dtype=np.float32)
+        closes = market_data['close'].to_numpy(dtype=np.float32)
+        if len(features) <= WINDOW_SIZE:
+            return np.empty((0, WINDOW_SIZE, len(INDICATORS)), dtype=np.float32), np.empty(0, dtype=np.float32)
+
+        windows = np.lib.stride_tricks.sliding_window_view(features, WINDOW_SIZE, axis=0)  # (n, 5, 30)
+        X = np.ascontiguousarray(windows[:-1].transpose(0, 2, 1))
+        y = closes[WINDOW_SIZE:]
+        return X, y
+
+    def learn_from_closed_candles(self, market_data, symbol=PAIR):
+        """
+        Live-only hook: labels windows with newly closed candles and applies one small online update.
+        The last row is treated as the still-forming candle and is never used as a label. Only the
+        symbols in ONLINE_LEARNING_SYMBOLS train the model, so pairs on other price scales never mix into it.
+        Args:
+            market_data (DataFrame): Latest market data with indicators.
+            symbol (str): Trading pair the data belongs to (each has its own label cursor & replay buffer).
+        Returns:
+            float or None: Update loss, or None if no new candle has closed.
+        """
+        if self.online_learner is None or symbol not in ONLINE_LEARNING_SYMBOLS:
+            return None
+
+        closed = market_data.iloc[:-1]
+        if len(closed) <= WINDOW_SIZE or not all(indicator in closed.columns for indicator in INDICATORS):
+            return None
+
+        label_keys = closed['timestamp'] if 'timestamp' in closed.columns else closed.index.to_series()
+        label_keys = label_keys.iloc[WINDOW_SIZE:]
+        cursor = self.last_labelled_candle.get(symbol)
+        is_new = (label_keys > cursor).to_numpy() if cursor is not None else np.ones(len(label_keys), dtype=bool)
+        if not is_new.any():
+            return None
+
+        X, y = self.prepare_training_windows(closed)
+        self.last_labelled_candle[symbol] = label_keys.iloc[-1]
+        loss = self.online_learner.update(self.model, X[is_new], y[is_new], symbol=symbol)
+        if loss is not None:
+            self.model_version += 1  # Weights changed – cached predictions are stale
+        return loss
+
+    def generate_trade_signal(self, market_data, symbol=PAIR):
         """
         Uses AI model to generate a trade signal.
         Args:
             market_data (DataFrame): Latest market data.
+            symbol (str): Trading pair the data belongs to (part of the prediction cache key).
         Returns:
             str: "BUY", "SELL", or "HOLD"
         """
         if len(market_data) < 30:
             return "HOLD"  # Not enough data for AI model
 
+        self.latest_market_data = market_data
         input_data = self.prepare_data(market_data)
-        predicted_price = self.model.predict(input_data, verbose=0)[0][0]
         latest_price = market_data['close'].iloc[-1]
 
+        # ✅ Reuse the last forward pass if nothing in the model input has changed
+        model_version = self.model_version  # Read before the model so a swap can only orphan, not poison, an entry
+        last_candle = market_data['timestamp'].iloc[-1] if 'timestamp' in market_data.columns else market_data.index[-1]
+        cache_key = PredictionCache.make_key(model_version, symbol, last_candle, input_data)
+        predicted_price = self.prediction_cache.get(cache_key)
+        if predicted_price is None:
+            model = self.model  # Single read, so a concurrent hot swap never splits a prediction
+            predicted_price = float(model.predict(input_data, verbose=0)[0][0])
+            self.prediction_cache.put(cache_key, predicted_price)
+
         # Track predictions
         self.prediction_count += 1
 
@@ -82,20 +163,111 @@ class PredictiveAI:
             return "SELL"
         return "HOLD"
 
+    def predict_history(self, market_data, chunk_size=65536):
+        """
+        Predicts the next price for every bar of a history in batched forward passes.
+        Bar i uses the 30-step window ending at bar i, exactly like a live call on market_data.iloc[:i + 1].
+        Args:
+            market_data (DataFrame): Market data with indicators.
+            chunk_size (int): Windows materialized per forward pass (bounds memory on long histories).
+        Returns:
+            np.array: Predicted price per bar (NaN for the first 29 bars).
+        """
+        features = market_data[INDICATORS].to_numpy(dtype=np.float32)
+        predictions = np.full(len(features), np.nan)
+        if len(features) < WINDOW_SIZE:
+            return predictions
+
+        windows = np.lib.stride_tricks.sliding_window_view(features, WINDOW_SIZE, axis=0)  # View, no copy
+        model = self.model
+        for start in range(0, len(windows), chunk_size):
+            batch = np.ascontiguousarray(windows[start:start + chunk_size].transpose(0, 2, 1))
+            end = start + len(batch)
+            predictions[WINDOW_SIZE - 1 + start:WINDOW_SIZE - 1 + end] = \
+                model.predict(batch, batch_size=PREDICT_BATCH_SIZE, verbose=0).ravel()
+        return predictions
+
+    def weights_fingerprint(self):
+        """
+        Content hash of the current weights; unlike model_version it is stable across restarts,
+        so it can key results persisted to disk (e.g. the signal tape).
+        Returns:
+            str: Hex digest.
+        """
+        model, version = self.model, self.model_version
+        if self._weights_fingerprint is None or self._weights_fingerprint[0] != version:
+            digest = hashlib.blake2b(digest_size=16)
+            for weights in model.get_weights():
+                digest.update(np.ascontiguousarray(weights).tobytes())
+            self._weights_fingerprint = (version, digest.hexdigest())
+        return self._weights_fingerprint[1]
+
+    def generate_signal_history(self, market_data):
+        """
+        Computes the trade signal for every bar of a history in one batched pass.
+        Args:
+            market_data (DataFrame): Market data with close prices & indicators.
+        Returns:
+            pd.Series: "BUY", "SELL", or "HOLD" per bar.
+        """
+        predicted = self.predict_history(market_data)
+        closes = market_data['close'].to_numpy(dtype=np.float64)
+        signals = np.where(predicted > closes * 1.005, "BUY", np.where(predicted < closes * 0.995, "SELL", "HOLD"))
+        return pd.Series(signals.astype(object), index=market_data.index, name="signal")
+
     def retrain_if_needed(self, training_data, labels):
         """
-        Retrains the AI model after a certain number of predictions.
+        Retrains the AI model after a certain number of predictions (skipped in online-learning mode).
         Args:
             training_data (np.array): Training data for the model.
             labels (np.array): Target labels for training.
         """
+        if self.online_learner is not None:
+            return  # Online mode keeps the model current incrementally & checkpoints on its own schedule
+
         if self.prediction_count >= RETRAIN_MODEL_INTERVAL:
             print("🔄 Retraining AI model...")
             self.model.fit(training_data, labels, epochs=3, batch_size=16, verbose=1)
             self.model.save(MODEL_PATH)
+            self.model_version += 1
             self.prediction_count = 0
             print("✅ AI Model Retrained and Saved.")
 
+    def train_new_model(self, market_data=None):
+        """
+        Starts a background retrain on a snapshot of recent market data.
+        The live model keeps serving predictions until the retrained one is validated & swapped in.
+        Args:
+            market_data (DataFrame): Data to retrain on (defaults to the latest data seen).
+        Returns:
+            bool: True if a retrain was started.
+        """
+        snapshot = market_data if market_data is not None else self.latest_market_data
+        if snapshot is None:
+            print("⚠️ No market data available for retraining.")
+            return False
+
+        X, y = self.prepare_training_windows(snapshot)
+        if len(X) == 0:
+            print("⚠️ Not enough market data for retraining.")
+            return False
+
+        return self.retrainer.submit(self.model, X, y)
+
+    def swap_model(self, new_model):
+        """
+        Atomically replaces the live model.
+        Args:
+            new_model: Validated Keras model.
+        """
+        self.model = new_model
+        self.model_version += 1
+        self.prediction_cache.clear()
+
+    def shutdown(self):
+        """Stops background retraining."""
+        self.retrainer.shutdown()
+
 # 🚀 Example usage
 if __name__ == "__main__":
     print("🔍 AI Model Testing...")
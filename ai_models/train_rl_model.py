@@ -8,6 +8,7 @@ import pandas as pd
 from reinforcement_learning.rl_trading_agent import RLTradingAgent
 from core.exchange_connector import ExchangeConnector
 from core.data_preprocessing import load_market_data
+from core.artifact_cache import ArtifactCache
 from config import RL_TRAIN_EPISODES, RL_BATCH_SIZE
 
 class TrainRLModel:
@@ -17,6 +18,13 @@ class TrainRLModel:
         self.episodes = RL_TRAIN_EPISODES
         self.exchange = ExchangeConnector()
         self.market_data = load_market_data()
+        self.indicators = ['rsi', 'macd', 'signal', 'momentum', 'volatility']
+        # ✅ Feature matrix cached by data hash; each state is a view into it instead of a DataFrame slice
+        self.features = ArtifactCache().cached_arrays(
+            "rl_features",
+            lambda: {"features": self.market_data[self.indicators].to_numpy(dtype=np.float64)},
+            self.market_data[self.indicators], indicators=self.indicators,
+        )["features"]
 
     def train(self):
         """Trains the RL model using past & simulated trades."""
@@ -50,9 +58,7 @@ class TrainRLModel:
         Returns:
             np.array: Market indicators for AI input.
         """
-        indicators = ['rsi', 'macd', 'signal', 'momentum', 'volatility']
-        state_data = self.market_data[indicators].iloc[step:step+30].values
-        return np.expand_dims(state_data, axis=0)
+        return self.features[None, step:step+30]
 
     def simulate_trade(self, action, step):
         """
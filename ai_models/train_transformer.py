@@ -8,13 +8,19 @@ import pandas as pd
 import tensorflow as tf
 from tensorflow.keras.models import Sequential, load_model
 from tensorflow.keras.layers import LSTM, Dense, Dropout
+from tensorflow.keras.optimizers import Adam
 from config import MODEL_PATH, TRAIN_EPOCHS, TRAIN_BATCH_SIZE
 from core.data_preprocessing import load_market_data
+from core.artifact_cache import ArtifactCache
+
+INDICATORS = ['rsi', 'macd', 'signal', 'momentum', 'volatility']
+WINDOW_SIZE = 30
 
 class TrainTransformer:
     def __init__(self):
         """Initialize AI training module."""
         self.df = load_market_data()
+        self.cache = ArtifactCache()
         self.model = self.load_or_create_model()
 
     def load_or_create_model(self):
@@ -31,45 +37,71 @@ class TrainTransformer:
             model = self.build_model()
         return model
 
-    def build_model(self):
+    def build_model(self, learning_rate=0.001):
         """
         Builds a Transformer-based AI model for price prediction.
+        Args:
+            learning_rate (float): Adam learning rate.
         Returns:
             Sequential: Compiled AI model.
         """
         model = Sequential([
-            LSTM(128, return_sequences=True, input_shape=(30, 5)),
+            LSTM(128, return_sequences=True, input_shape=(WINDOW_SIZE, len(INDICATORS))),
             Dropout(0.3),
             LSTM(64, return_sequences=False),
             Dropout(0.2),
             Dense(32, activation='relu'),
             Dense(1)  # Output: Predicted price movement
         ])
-        model.compile(optimizer='adam', loss='mse')
+        model.compile(optimizer=Adam(learning_rate=learning_rate), loss='mse')
         return model
 
     def prepare_training_data(self):
         """
         Prepares historical market data for AI training.
+        Window tensors are cached by data hash, so repeated runs on the same data load them memory-mapped.
         Returns:
             tuple: (X_train, y_train) for model training.
         """
-        indicators = ['rsi', 'macd', 'signal', 'momentum', 'volatility']
-        X, y = [], []
-        for i in range(30, len(self.df) - 1):
-            X.append(self.df[indicators].iloc[i-30:i].values)
-            y.append(self.df['close'].iloc[i + 1])
+        def compute():
+            features = self.df[INDICATORS].to_numpy(dtype=np.float32)
+            closes = self.df['close'].to_numpy(dtype=np.float32)
+            n_windows = max(len(features) - WINDOW_SIZE - 1, 0)
+            if n_windows == 0:
+                return {"X": np.empty((0, WINDOW_SIZE, len(INDICATORS)), dtype=np.float32),
+                        "y": np.empty(0, dtype=np.float32)}
+            # ✅ Window i covers rows i..i+29 and is labelled with the close two rows after it ends
+            windows = np.lib.stride_tricks.sliding_window_view(features, WINDOW_SIZE, axis=0)[:n_windows]
+            return {"X": np.ascontiguousarray(windows.transpose(0, 2, 1)), "y": closes[WINDOW_SIZE + 1:]}
 
-        return np.array(X), np.array(y)
+        arrays = self.cache.cached_arrays("transformer_windows", compute, self.df[INDICATORS + ['close']],
+                                          indicators=INDICATORS, window=WINDOW_SIZE)
+        return arrays["X"], arrays["y"]
 
-    def train_model(self):
+    def train_model(self, epochs=TRAIN_EPOCHS, batch_size=TRAIN_BATCH_SIZE, initial_epoch=0,
+                    validation_split=0.0, save=True, verbose=1):
         """
         Trains the AI model on historical market data.
+        Args:
+            epochs (int): Epoch to stop at (counted from the start of training).
+            batch_size (int): Training batch size.
+            initial_epoch (int): Epoch to resume from when continuing a checkpoint.
+            validation_split (float): Fraction of the most recent windows held out for scoring.
+            save (bool): Whether to overwrite MODEL_PATH after training.
+            verbose (int): Keras verbosity level.
+        Returns:
+            float: Final validation loss (training loss if no validation split is used).
         """
         X_train, y_train = self.prepare_training_data()
-        self.model.fit(X_train, y_train, epochs=TRAIN_EPOCHS, batch_size=TRAIN_BATCH_SIZE, verbose=1)
-        self.model.save(MODEL_PATH)
-        print("✅ AI Model Training Complete & Saved.")
+        history = self.model.fit(X_train, y_train, epochs=int(epochs), batch_size=int(batch_size),
+                                 initial_epoch=int(initial_epoch), validation_split=validation_split,
+                                 verbose=verbose)
+        if save:
+            self.model.save(MODEL_PATH)
+            print("✅ AI Model Training Complete & Saved.")
+
+        losses = history.history.get("val_loss") or history.history["loss"]
+        return float(losses[-1])
 
 # 🚀 TRAIN THE MODEL
 if __name__ == "__main__":
@@ -17,8 +17,20 @@ API_SECRET = os.getenv("e0f23c28c7274bafb4ce46e92b0e7bb9")
 # ✅ Trading Pair
 PAIR = "PI/USDT"  # Change this as per your trading pair
 
+# ✅ Multi-Asset Trading
+TRADING_PAIRS = ["PI/USDT", "BTC/USDT", "ETH/USDT"]  # Pairs scanned by MultiAssetTrading
+SCAN_INTERVAL = 60  # Seconds between multi-asset scans (scan time included)
+MULTI_ASSET_WORKERS = 16  # Pairs processed concurrently per scan
+PAIR_TIMEOUT = 10  # Seconds one pair may take before the scan stops waiting for it
+SCAN_TIMEOUT = 30  # Upper bound on a whole scan
+
 # ✅ Grid Trading Parameters (Add the BASE_GRID_SIZE here)
 BASE_GRID_SIZE = 10  # You can adjust this value based on your desired grid size
+GRID_SIZE = 10  # Levels in the static grid
+GRID_SPACING = 0.5  # Static grid spacing in percent
+GRID_PRICE_TOLERANCE = 0.001  # Live orders within 0.1% of a level are kept instead of replaced
+GRID_SPACING_STEP = 0.05  # Grid spacing is quantized to 0.05% so small volatility changes don't rebuild the grid
+GRID_ORDER_WORKERS = 8  # Concurrent order requests when the batch endpoint isn't used
 
 # ✅ Trading Features
 ENABLE_ARBITRAGE = True
@@ -27,27 +39,100 @@ ENABLE_HEDGE_TRADING = True
 ENABLE_SELF_LEARNING = True
 ENABLE_MARKET_ADAPTATION = True
 ENABLE_DYNAMIC_GRID = True  # Added ENABLE_DYNAMIC_GRID to match with main.py
+ENABLE_HFT = True  # Order-book driven HFTEngine
 
 # ✅ Backtesting Parameters
 BACKTEST_START_DATE = "2023-01-01"
 BACKTEST_END_DATE = "2024-01-01"
+BACKTEST_FEE_RATE = 0.001  # 0.1% taker fee per fill
+BACKTEST_SLIPPAGE = 0.0005  # 0.05% assumed slippage per fill
+BACKTEST_ALLOW_SHORT = False  # Spot trading: SELL flattens instead of going short
+SIM_MAKER_FEE_RATE = 0.0  # Maker fee for resting limit orders in the simulated exchange
+SIM_LATENCY = 0.05  # Seconds between sending an order and the simulated matching engine seeing it
+BACKTEST_PERIODS_PER_YEAR = 525600  # 1-minute bars per year (used when bar spacing can't be inferred)
+TRADE_STORE_CAPACITY = 4096  # Initial rows preallocated by the columnar trade & equity store
+SIGNAL_TAPE_DIR = "cache/signal_tapes"  # Precomputed signals keyed by model weights & data hash
 
 # ✅ Risk Management
 STOP_LOSS_PERCENT = 0.02  # 2% stop loss
 TAKE_PROFIT_PERCENT = 0.05  # 5% take profit
 RISK_PER_TRADE = 0.02  # 2% of balance per trade
 MAX_DRAWDOWN = 0.1  # Maximum acceptable drawdown (10%)
+RISK_TRIGGER_CAPACITY = 256  # Initial positions preallocated by the stop-loss / take-profit trigger engine
+RISK_EXIT_WORKERS = 8  # Exit orders dispatched concurrently when triggers fire
+MAX_PORTFOLIO_EXPOSURE = 1.0  # Maximum gross notional across all positions, as a multiple of equity
+MAX_ASSET_EXPOSURE = 0.5  # Maximum notional in a single symbol, as a multiple of equity
+ALLOW_SHORT = False  # Spot account: a SELL only reduces a held position, it never opens a short
 
 # ✅ Performance Optimization
 MAX_SLIPPAGE = 0.001  # 0.1% max slippage
 LATENCY_OPTIMIZATION = True
 HFT_TRADE_INTERVAL = 1  # High-frequency trading interval (1 sec)
+RETRY_ATTEMPTS = 3  # Order submission attempts in OrderRouter
+RETRY_DELAY = 1  # Seconds between order retries
+ORDER_PIPELINE_WORKERS = 8  # Orders sent concurrently by the order pipeline
+ORDER_HISTORY_SIZE = 1000  # Settled order handles kept for lookups
+ORDER_ACK_TTL = 3600  # Seconds an ACKNOWLEDGED handle may go without news before the pipeline drops it
+TRADE_MONITOR_INTERVAL = 5  # Seconds between TradeMonitor health checks
+ORDER_RECONCILE_INTERVAL = 60  # Seconds between order-store reconciliations with the exchange's open orders
+ORDER_RETENTION = 86400  # Seconds filled / canceled / rejected orders stay in the order store
+
+# ✅ Order Book Recording & Replay
+ORDER_BOOK_DEPTH = 20  # Levels per side requested, recorded & served during replay
+ORDER_BOOK_RECORD_INTERVAL = 0.5  # Seconds between depth polls while recording
+ORDER_BOOK_KEYFRAME_INTERVAL = 600  # Full snapshot every N records (diffs in between)
+ORDER_BOOK_DIR = "data/order_books"  # Recorded sessions
 
 # ✅ AI & RL Model Training
 MODEL_PATH = "ai_models/trade_model.h5"
 RETRAIN_MODEL_INTERVAL = 500  # Retrain after 500 predictions
 RETRAIN_MODEL_THRESHOLD = 75.0  # Retrain model if accuracy is below this threshold (percentage)
 RL_BATCH_SIZE = 32
+RL_TRAIN_EPISODES = 100  # Episodes per TrainRLModel run
+TRAIN_EPOCHS = 50  # Full training run length
+TRAIN_BATCH_SIZE = 32
+RETRAIN_EPOCHS = 5  # Fine-tuning epochs for background retrains
+RETRAIN_BATCH_SIZE = 16
+RETRAIN_VALIDATION_SPLIT = 0.2  # Most recent windows used to compare candidate vs live model
+
+# ✅ Online Learning (incremental fine-tuning on closed candles)
+ONLINE_LEARNING = False  # Live PredictiveAI only: replaces periodic full retrains with per-candle updates
+ONLINE_LEARNING_SYMBOLS = [PAIR]  # Pairs whose candles may train the model (one price scale per model)
+ONLINE_BUFFER_SIZE = 5000  # Labelled windows kept for replay
+ONLINE_BATCH_SIZE = 32  # Samples per incremental gradient step
+ONLINE_LEARNING_RATE = 0.0001  # Small step size for warm-started updates
+ONLINE_CHECKPOINT_INTERVAL = 50  # Save the model every 50 updates, not every update
+
+PREDICT_BATCH_SIZE = 4096  # Windows per forward pass for batched history prediction
+
+# ✅ Prediction Cache
+PREDICTION_CACHE_SIZE = 256  # Max memoized predictions (LRU eviction)
+PREDICTION_CACHE_TTL = 60  # Seconds a memoized prediction stays valid (one 1m candle)
+
+# ✅ Preprocessing Artifact Cache
+MARKET_DATA_FILE = "data/market_data.csv"  # Historical candles for training & backtests (fetched live if missing)
+ARTIFACT_CACHE_ENABLED = True  # Reuse cleaned candles, feature matrices & window tensors across runs
+ARTIFACT_CACHE_DIR = "cache/artifacts"  # Memory-mappable artifacts keyed by source-data & parameter hash
+ARTIFACT_CACHE_MAX_BYTES = 2 * 1024 ** 3  # Least recently used artifacts are evicted above 2 GB
+
+# ✅ Hyperparameter Search
+OPTIMIZATION_ROUNDS = 27  # Number of sampled configurations per search
+HPO_MIN_EPOCHS = 5  # Epoch budget of the first successive-halving rung
+HPO_MAX_EPOCHS = 60  # Epoch budget of the final rung
+HPO_REDUCTION_FACTOR = 3  # Keep the top 1/3 of trials at each rung
+HPO_VALIDATION_SPLIT = 0.2  # Most recent 20% of windows used for scoring
+HPO_MAX_WORKERS = None  # None = one worker per available CPU core
+HPO_CACHE_DIR = "cache/hpo"  # Finished trial results & checkpoints
+HPO_SEED = 42  # Fixed seed so reruns sample the same configs and hit the cache
+
+# ✅ Strategy Parameter Sweeps
+SWEEP_MAX_WORKERS = None  # Sweep process pool size (None = one per available core)
+SWEEP_CACHE_DIR = "cache/sweeps"  # Memory-mapped data & streamed result chunks (enables resume)
+SWEEP_TASK_SIZE = 8  # Configs evaluated per worker task
+SWEEP_FLUSH_SIZE = 256  # Result rows buffered before a chunk is written to disk
+SWEEP_SEED = 42  # Seed for random-search sampling
+WALK_FORWARD_TRAIN_BARS = 43200  # 30 days of 1-minute candles per training window
+WALK_FORWARD_TEST_BARS = 10080  # 7 days of 1-minute candles per out-of-sample window
 
 # ✅ Logging & Monitoring
 LOG_FILE = "logs/trading.log"
@@ -56,10 +141,56 @@ PROFIT_TRACKER_FILE = "logs/profit.json"
 # ✅ Order Limits
 ORDER_MINIMUM_VALUE = 5  # Minimum order value in USDT
 MAX_CONCURRENT_POSITIONS = 5  # Limit concurrent open positions
+POSITION_BOOK_CAPACITY = 1024  # Initial rows preallocated by PortfolioManager's columnar position book
 MAX_QUANTUM_TRADES = 10  # Limit quantum trades to avoid overtrading
+QUANTUM_BACKEND = "analytic"  # "analytic" (closed form, batched) or "pennylane" (reference simulator)
+
+# ✅ Sentiment Scoring
+SENTIMENT_CACHE_SIZE = 50000  # Scores kept in memory (LRU)
+SENTIMENT_CACHE_FILE = "cache/sentiment_scores.sqlite"  # On-disk score cache keyed by content hash
+SENTIMENT_CHUNK_SIZE = 256  # Texts per worker task; smaller batches are scored inline
+SENTIMENT_MAX_WORKERS = None  # None = one worker per CPU core
+
+SENTIMENT_HALF_LIFE = 3600  # Seconds for an item's weight in the sentiment index to halve
+SENTIMENT_DEDUP_SIZE = 100000  # Recent item hashes kept to suppress duplicates & syndicated copies
+SENTIMENT_ASSET_KEYWORDS = {
+    "BTC": ["bitcoin", "btc"],
+    "ETH": ["ethereum", "eth"],
+    "PI": ["pi network", "$pi"],
+}
+
+# ✅ News & Social Ingestion
+INGESTION_POLL_INTERVAL = 30  # Seconds between concurrent polls of all sources
+INGESTION_STATE_FILE = "cache/ingestion_state.json"  # Cursors, ETags & seen IDs
+INGESTION_SEEN_TTL = 86400  # Remember item IDs for 24h to drop re-served items
+INGESTION_TIMEOUT = 10  # Per-poll HTTP timeout (seconds)
+INGESTION_RETRIES = 3  # Retries per poll after a 5xx response or timeout
+INGESTION_BACKOFF = 1.0  # First retry delay in seconds (doubles on every further retry)
+
+# ✅ Stress Testing
+STRESS_TEST_TRADES = 100  # Live market orders fired by StressTester.simulate_trades
+STRESS_PATHS = 5000  # Synthetic price paths per Monte Carlo scenario
+STRESS_STEPS = 1440  # Steps per path (one day of 1-minute bars)
+STRESS_VOLATILITY = 0.8  # Annualized volatility of the base process
+STRESS_SEED = 7  # Seed so scenario runs are reproducible
+LOAD_TEST_CONCURRENCY = 32  # Max in-flight order requests during a load test
+LOAD_TEST_RATE = 200  # Target orders per second (None = closed loop, as fast as possible)
+LOAD_TEST_DURATION = 10  # Seconds per load-test run
+LOAD_TEST_REPORT_FILE = "logs/load_test_report.json"  # Machine-readable load-test report
+STANDIN_LATENCY = 0.005  # Service time of the local exchange stand-in (seconds)
+STANDIN_RATE_LIMIT = None  # Stand-in request limit per second (None = unlimited); excess gets HTTP 429
 
 # ✅ Simulation Mode (Add if required by your project)
 ENABLE_SIMULATION_MODE = False  # Add this if simulation mode is needed
 
 # ✅ Trading Interval Configuration (Added TRADE_INTERVAL here)
 TRADE_INTERVAL = 60  # 60 seconds between trades (adjust as needed)
+
+# ✅ Event-Driven Runtime
+CANDLE_INTERVAL = 60  # Candle length in seconds (1m klines); a cycle starts when one closes
+CANDLE_POLL_INTERVAL = 1  # Seconds between kline polls once a candle close is due
+CANDLE_HISTORY = 200  # Candles kept in the rolling window fed to the pipeline
+STAGE_QUEUE_SIZE = 8  # Bounded queue between pipeline stages
+STAGE_LATENCY_WINDOW = 500  # Latency samples kept per stage for p50 / p99
+RUNTIME_METRICS_INTERVAL = 30  # Seconds between runtime metrics reports
+RUNTIME_METRICS_FILE = "logs/runtime_metrics.json"  # Latest per-stage queue depth & latency
@@ -0,0 +1,198 @@
+# artifact_cache.py
+# ==================================================
+# 🧊 ARTIFACT CACHE – CONTENT-ADDRESSED PREPROCESSING RESULTS 🧊
+# ==================================================
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import numpy as np
+import pandas as pd
+from custom_logging.logger import Logger
+from config import ARTIFACT_CACHE_DIR, ARTIFACT_CACHE_MAX_BYTES, ARTIFACT_CACHE_ENABLED
+
+
+def fingerprint(*parts, **params):
+    """
+    Content hash of transform inputs.
+    Args:
+        *parts: Source data (DataFrames, Series, arrays) or any JSON-serializable value.
+        **params: Transform parameters (window sizes, indicator settings, column lists, ...).
+    Returns:
+        str: Hex digest.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if isinstance(part, (pd.DataFrame, pd.Series)):
+            columns = part.columns if isinstance(part, pd.DataFrame) else [part.name]
+            digest.update(",".join(map(str, columns)).encode())
+            digest.update(pd.util.hash_pandas_object(part, index=True).values.tobytes())
+        elif isinstance(part, np.ndarray):
+            digest.update(f"{part.dtype}{part.shape}".encode())
+            digest.update(np.ascontiguousarray(part).tobytes())
+        else:
+            digest.update(json.dumps(part, sort_keys=True, default=str).encode())
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+class ArtifactCache:
+    def __init__(self, cache_dir=ARTIFACT_CACHE_DIR, max_bytes=ARTIFACT_CACHE_MAX_BYTES, enabled=ARTIFACT_CACHE_ENABLED):
+        """
+        Disk cache for derived arrays (cleaned candles, feature matrices, window tensors).
+        Each artifact is a directory of .npy files keyed by a hash of its inputs, loaded memory-mapped,
+        and the least recently used artifacts are evicted once the cache exceeds max_bytes.
+        Args:
+            cache_dir (str): Cache directory.
+            max_bytes (int): Size bound for all artifacts together.
+            enabled (bool): False computes everything and stores nothing.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def path(self, namespace, key):
+        """Returns the directory of one artifact."""
+        return os.path.join(self.cache_dir, f"{namespace}-{key}")
+
+    # ------------------------------------------------------------------
+    # 🧮 Arrays
+    # ------------------------------------------------------------------
+    def get_arrays(self, namespace, key):
+        """
+        Loads an artifact's arrays memory-mapped.
+        Returns:
+            dict or None: {name: np.memmap} (None on a miss).
+        """
+        arrays = self._open(self.path(namespace, key))
+        self.stats["hits" if arrays is not None else "misses"] += 1
+        return arrays
+
+    def _open(self, path):
+        """Memory-maps an artifact directory and marks it as recently used (None if missing or partial)."""
+        meta_file = os.path.join(path, "meta.json")
+        try:
+            with open(meta_file) as file:
+                meta = json.load(file)
+            arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in meta["arrays"]}
+        except (OSError, ValueError, KeyError):
+            return None
+        os.utime(meta_file)  # ✅ Recency for LRU eviction
+        return arrays
+
+    def put_arrays(self, namespace, key, arrays, meta=None):
+        """
+        Writes an artifact atomically, then enforces the size bound.
+        Args:
+            namespace (str): Artifact kind, e.g. "preprocess" or "transformer_windows".
+            key (str): Input fingerprint.
+            arrays (dict): {name: np.array}.
+            meta (dict): Extra JSON-serializable metadata.
+        Returns:
+            dict: The arrays reopened memory-mapped (or as given when the cache is disabled).
+        """
+        if not self.enabled:
+            return arrays
+        path = self.path(namespace, key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_path, f"{name}.npy"), np.asarray(array))
+        with open(os.path.join(tmp_path, "meta.json"), "w") as file:
+            json.dump({"arrays": list(arrays), "created": time.time(), **(meta or {})}, file)
+        try:
+            os.replace(tmp_path, path)
+        except OSError:  # Another process stored the same artifact first
+            shutil.rmtree(tmp_path, ignore_errors=True)
+        self.evict()
+        return self._open(path) or arrays
+
+    def cached_arrays(self, namespace, compute, *parts, **params):
+        """
+        Returns the arrays for these inputs, computing & storing them on a miss.
+        Args:
+            namespace (str): Artifact kind.
+            compute (callable): Zero-argument function returning {name: np.array}.
+            *parts, **params: Inputs hashed into the key (see fingerprint).
+        Returns:
+            dict: {name: array}.
+        """
+        if not self.enabled:
+            return compute()
+        key = fingerprint(*parts, **params)
+        arrays = self.get_arrays(namespace, key)
+        if arrays is None:
+            arrays = self.put_arrays(namespace, key, compute())
+        return arrays
+
+    # ------------------------------------------------------------------
+    # 📋 DataFrames
+    # ------------------------------------------------------------------
+    def cached_frame(self, namespace, compute, *parts, **params):
+        """
+        DataFrame version of cached_arrays (one array per column plus the index).
+        Args:
+            namespace (str): Artifact kind.
+            compute (callable): Zero-argument function returning a DataFrame.
+            *parts, **params: Inputs hashed into the key.
+        Returns:
+            pd.DataFrame: Cached or freshly computed frame.
+        """
+        if not self.enabled:
+            return compute()
+        key = fingerprint(*parts, **params)
+        arrays = self.get_arrays(namespace, key)
+        if arrays is None:
+            df = compute()
+            if df is None or df.columns.duplicated().any() or any(dtype.kind not in "biufmM" for dtype in df.dtypes):
+                return df  # Only plain numeric/datetime frames are stored
+            columns = {f"col{i}": df[column].to_numpy() for i, column in enumerate(df.columns)}
+            self.put_arrays(namespace, key, {**columns, "index": df.index.to_numpy()},
+                            meta={"columns": [str(column) for column in df.columns], "index_name": df.index.name})
+            return df
+
+        with open(os.path.join(self.path(namespace, key), "meta.json")) as file:
+            meta = json.load(file)
+        index = pd.Index(arrays["index"], name=meta.get("index_name"))
+        return pd.DataFrame({column: arrays[f"col{i}"] for i, column in enumerate(meta["columns"])}, index=index)
+
+    # ------------------------------------------------------------------
+    # 🧹 Eviction
+    # ------------------------------------------------------------------
+    def _entries(self):
+        """(last used, bytes, path) for every stored artifact."""
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            meta_file = os.path.join(path, "meta.json")
+            if name.endswith(".tmp") or not os.path.exists(meta_file):
+                continue
+            size = sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+            entries.append((os.path.getmtime(meta_file), size, path))
+        return entries
+
+    def size(self):
+        """Total bytes stored."""
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """Deletes least recently used artifacts until the cache fits in max_bytes."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            self.stats["evictions"] += 1
+            Logger.info(f"🧹 Artifact evicted: {os.path.basename(path)} ({size / 1e6:.1f} MB)")
+
+    def clear(self):
+        """Deletes every artifact."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
@@ -0,0 +1,106 @@
+# columnar_book.py
+# ==================================================
+# 🗃️ COLUMNAR BOOK – ID-KEYED ROWS STORED AS NUMPY COLUMNS 🗃️
+# ==================================================
+
+import numpy as np
+
+
+class ColumnarBook:
+    def __init__(self, dtypes, capacity):
+        """
+        Rows keyed by ID and stored column-wise (one NumPy array per field), with a per-symbol price vector,
+        so a whole book is evaluated in a few vectorized operations. Not thread-safe – owners lock around it.
+        Args:
+            dtypes (dict): Column name -> NumPy dtype. A "symbol" column holds symbol indexes.
+            capacity (int): Initial rows preallocated (doubles when full).
+        """
+        self.count = 0
+        self.ids = []  # row -> ID
+        self.rows = {}  # ID -> row
+        self.symbols = []  # symbol index -> symbol
+        self.symbol_index = {}
+        self.prices = np.full(0, np.nan)  # Latest price per symbol index
+        self.columns = {name: np.zeros(capacity, dtype=dtype) for name, dtype in dtypes.items()}
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, row_id):
+        return row_id in self.rows
+
+    def symbol(self, symbol):
+        """Index of a symbol, registering it on first use."""
+        index = self.symbol_index.get(symbol)
+        if index is None:
+            index = self.symbol_index[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+            self.prices = np.append(self.prices, np.nan)
+        return index
+
+    def row(self, row_id):
+        """Row of an ID, appending one (and growing the columns if full) on first use."""
+        row = self.rows.get(row_id)
+        if row is None:
+            if self.count == len(next(iter(self.columns.values()))):
+                for name, column in self.columns.items():
+                    self.columns[name] = np.concatenate([column, np.zeros_like(column)])
+            row = self.rows[row_id] = self.count
+            self.ids.append(row_id)
+            self.count += 1
+        return row
+
+    def set(self, row_id, values):
+        """
+        Writes a row (creating it if needed).
+        Args:
+            row_id (str): Row ID.
+            values (dict): Column name -> value; a "symbol" value is the symbol itself, not its index.
+        Returns:
+            int: The row.
+        """
+        row = self.row(row_id)
+        for name, value in values.items():
+            self.columns[name][row] = self.symbol(value) if name == "symbol" else value
+        return row
+
+    def remove(self, row_id):
+        """
+        Drops a row in O(1) by moving the last row into its slot.
+        Returns:
+            bool: Whether the ID was present.
+        """
+        row = self.rows.pop(row_id, None)
+        if row is None:
+            return False
+        last = self.count - 1
+        if row != last:
+            for column in self.columns.values():
+                column[row] = column[last]
+            moved = self.ids[last]
+            self.ids[row] = moved
+            self.rows[moved] = row
+        self.ids.pop()
+        self.count = last
+        return True
+
+    def active(self):
+        """Views of every column over the occupied rows."""
+        return {name: column[:self.count] for name, column in self.columns.items()}
+
+    def update_prices(self, tickers):
+        """
+        Updates the per-symbol price vector from a bulk ticker snapshot (unknown symbols are ignored).
+        Args:
+            tickers (dict): {symbol: {"last": price}} or {symbol: price}.
+        Returns:
+            np.array: Latest price per symbol index (NaN where unknown).
+        """
+        for symbol, ticker in (tickers or {}).items():
+            index = self.symbol_index.get(symbol)
+            if index is None:
+                continue
+            price = ticker.get("last") if isinstance(ticker, dict) else ticker
+            if price is not None:
+                self.prices[index] = float(price)
+        return self.prices
@@ -2,20 +2,28 @@
 # 📊 DATA PREPROCESSING – CLEANS & FORMATS MARKET DATA 📊
 # ==================================================
 
+import os
 import pandas as pd
 import numpy as np
 import ta  # ✅ Technical Analysis Library
+from core.artifact_cache import ArtifactCache
 from custom_logging.logger import Logger
+from config import PAIR, MARKET_DATA_FILE
+
+# Bump "version" whenever the indicator code changes so cached outputs are recomputed
+PREPROCESS_PARAMS = {"rsi_window": 14, "volatility_window": 10, "version": 1}
 
 
 class DataPreprocessing:
-    def __init__(self, df):
+    def __init__(self, df, cache=None):
         """
         Initializes the data preprocessing module.
         Args:
             df (pd.DataFrame): Raw market data.
+            cache (ArtifactCache): Cache for preprocessed frames (a default one if None).
         """
         self.df = df.copy()
+        self.cache = cache or ArtifactCache()
 
     def apply_technical_indicators(self):
         """
@@ -32,20 +40,20 @@ class DataPreprocessing:
             Logger.info("📊 Applying Technical Indicators...")
 
             # ✅ Relative Strength Index (RSI)
-            self.df["rsi"] = ta.momentum.RSIIndicator(self.df["close"], window=14).rsi()
+            self.df["rsi"] = ta.momentum.RSIIndicator(self.df["close"], window=PREPROCESS_PARAMS["rsi_window"]).rsi()
 
             # ✅ Moving Average Convergence Divergence (MACD)
             macd = ta.trend.MACD(self.df["close"])
             self.df["macd"], self.df["signal"] = macd.macd(), macd.macd_signal()
 
             # ✅ Volatility (Rolling Standard Deviation)
-            self.df["volatility"] = self.df["close"].rolling(window=10).std()
+            self.df["volatility"] = self.df["close"].rolling(window=PREPROCESS_PARAMS["volatility_window"]).std()
 
             # ✅ Momentum (Percentage Change)
             self.df["momentum"] = self.df["close"].pct_change()
 
             # ✅ Fix missing values after calculations
-            self.df.fillna(method="bfill", inplace=True)  # Backfill missing values
+            self.df.bfill(inplace=True)  # Backfill missing values
             self.df.dropna(inplace=True)  # Drop remaining NaNs
 
             Logger.info("✅ Technical Indicators Applied Successfully.")
@@ -67,7 +75,7 @@ class DataPreprocessing:
         self.df.replace([np.inf, -np.inf], np.nan, inplace=True)
 
         # ✅ Fill missing values with the previous valid observation
-        self.df.fillna(method="bfill", inplace=True)
+        self.df.bfill(inplace=True)
         self.df.dropna(inplace=True)
 
         Logger.info("✅ Data Cleaning Complete.")
@@ -76,11 +84,38 @@ class DataPreprocessing:
     def preprocess(self):
         """
         Runs all preprocessing steps and returns cleaned data.
+        Identical raw data is only processed once; later calls load the cached result.
         Returns:
             pd.DataFrame: Fully processed market data.
         """
-        self.apply_technical_indicators()
-        return self.clean_data()
+        def compute():
+            self.apply_technical_indicators()
+            return self.clean_data()
+
+        self.df = self.cache.cached_frame("preprocess", compute, self.df, **PREPROCESS_PARAMS)
+        return self.df
+
+
+def load_market_data(pair=PAIR, path=MARKET_DATA_FILE, cache=None):
+    """
+    Loads historical candles (from path if it exists, otherwise the latest candles from the exchange)
+    with indicators applied.
+    Args:
+        pair (str): Trading pair fetched when no file is available.
+        path (str): CSV of candles with timestamp, open, high, low, close & volume.
+        cache (ArtifactCache): Cache for the preprocessed frame.
+    Returns:
+        pd.DataFrame: Preprocessed market data (None if nothing could be loaded).
+    """
+    if path and os.path.exists(path):
+        df = pd.read_csv(path, parse_dates=["timestamp"])
+    else:
+        from core.exchange_connector import ExchangeConnector
+        df = ExchangeConnector().fetch_market_data(pair)
+        if df is None:
+            return None
+        df[["open", "high", "low", "close", "volume"]] = df[["open", "high", "low", "close", "volume"]].astype(float)
+    return DataPreprocessing(df, cache).preprocess().reset_index(drop=True)
 
 # 🚀 EXAMPLE USAGE
 if __name__ == "__main__":
@@ -1,4 +1,6 @@
 import os
+import json
+import uuid
 import requests
 import pandas as pd
 import time
@@ -27,16 +29,19 @@ class ExchangeConnector:
             Logger.error(f"❌ MEXC API Initialization Failed: {e}")
             exit()
 
-    def fetch_market_data(self, pair="PI/USDT"):
+    def fetch_market_data(self, pair="PI/USDT", limit=200):
         """
         Fetch latest market data for the given pair.
+        Args:
+            pair (str): Trading pair.
+            limit (int): Number of 1-minute candles (the last one is still forming).
         """
         try:
             url = f"{self.base_url}/klines"  # ✅ FIXED ENDPOINT
             params = {
                 'symbol': pair.replace("/", ""),  # ✅ Convert "PI/USDT" -> "PIUSDT"
                 'interval': '1m',
-                'limit': 200
+                'limit': limit
             }
 
             response = self.session.get(url, params=params)
@@ -44,7 +49,7 @@ class ExchangeConnector:
             if response.status_code == 429:
                 Logger.warning("⚠️ Rate limit hit. Retrying in 60 seconds...")
                 time.sleep(60)
-                return self.fetch_market_data(pair)  # Retry the request
+                return self.fetch_market_data(pair, limit)  # Retry the request
 
             # ✅ Log raw response for debugging
             Logger.info(f"API Response: {response.text[:200]}")  # Log first 200 chars
@@ -146,6 +151,269 @@ class ExchangeConnector:
             Logger.error(f"❌ Error placing order: {e}")
             return None
 
+    def fetch_ticker(self, pair="PI/USDT"):
+        """
+        Fetch the latest price for the given pair (ccxt-style ticker used by the strategies).
+        """
+        try:
+            url = f"{self.base_url}/ticker/price"
+            response = self.session.get(url, params={'symbol': pair.replace("/", "")})
+            data = response.json()
+
+            if not isinstance(data, dict) or "price" not in data:
+                Logger.error(f"❌ Unexpected ticker response: {data}")
+                return None
+
+            return {"symbol": pair, "last": float(data["price"])}
+
+        except requests.exceptions.RequestException as e:
+            Logger.error(f"❌ Network error: {e}")
+            return None
+        except Exception as e:
+            Logger.error(f"❌ Error fetching ticker: {e}")
+            return None
+
+    def fetch_tickers(self, pairs=None):
+        """
+        Fetch the latest prices of many pairs in one request (ticker/price without a symbol lists every pair).
+        Args:
+            pairs (list): Pairs to return (default: all, keyed by exchange symbol).
+        Returns:
+            dict: {pair: ccxt-style ticker}, or None on error.
+        """
+        try:
+            url = f"{self.base_url}/ticker/price"
+            response = self.session.get(url)
+            data = response.json()
+
+            if not isinstance(data, list):
+                Logger.error(f"❌ Unexpected tickers response: {data}")
+                return None
+
+            names = {pair.replace("/", ""): pair for pair in pairs} if pairs else None
+            tickers = {}
+            for item in data:
+                pair = names.get(item.get("symbol")) if names else item.get("symbol")
+                if pair is not None and "price" in item:
+                    tickers[pair] = {"symbol": pair, "last": float(item["price"])}
+            return tickers
+
+        except requests.exceptions.RequestException as e:
+            Logger.error(f"❌ Network error: {e}")
+            return None
+        except Exception as e:
+            Logger.error(f"❌ Error fetching tickers: {e}")
+            return None
+
+    def fetch_order_book(self, pair="PI/USDT", limit=20):
+        """
+        Fetch the order book (depth) for the given pair.
+        Returns:
+            dict: {"bids": [[price, qty], ...], "asks": [[price, qty], ...], "timestamp", "nonce"} or None.
+        """
+        try:
+            url = f"{self.base_url}/depth"
+            response = self.session.get(url, params={'symbol': pair.replace("/", ""), 'limit': limit})
+            data = response.json()
+
+            if not isinstance(data, dict) or "bids" not in data or "asks" not in data:
+                Logger.error(f"❌ Unexpected order book response: {data}")
+                return None
+
+            return {
+                "bids": [[float(price), float(qty)] for price, qty in data["bids"]],
+                "asks": [[float(price), float(qty)] for price, qty in data["asks"]],
+                "timestamp": data.get("timestamp", time.time() * 1000) / 1000,
+                "nonce": data.get("lastUpdateId"),
+            }
+
+        except requests.exceptions.RequestException as e:
+            Logger.error(f"❌ Network error: {e}")
+            return None
+        except Exception as e:
+            Logger.error(f"❌ Error fetching order book: {e}")
+            return None
+
+    def create_limit_order(self, pair, side, amount, price):
+        """
+        Places a limit order (BUY or SELL).
+        Returns:
+            dict or None: Order response if accepted, otherwise None.
+        """
+        if amount <= 0 or price <= 0:
+            Logger.error(f"❌ Invalid limit order: {amount} @ {price}")
+            return None
+
+        try:
+            url = f"{self.base_url}/order"
+            params = {
+                'symbol': pair.replace("/", ""),
+                'side': side.upper(),
+                'type': 'LIMIT',
+                'quantity': amount,
+                'price': price,
+            }
+            data = self.session.post(url, params=params).json()
+
+            if not isinstance(data, dict) or ("orderId" not in data and data.get("code") != 200):
+                Logger.error(f"❌ Error placing limit order: {data}")
+                return None
+            return data
+
+        except requests.exceptions.RequestException as e:
+            Logger.error(f"❌ Network error: {e}")
+            return None
+        except Exception as e:
+            Logger.error(f"❌ Error placing limit order: {e}")
+            return None
+
+    def create_limit_buy_order(self, pair, amount, price):
+        """ccxt-style alias used by the grid strategies."""
+        return self.create_limit_order(pair, "buy", amount, price)
+
+    def create_limit_sell_order(self, pair, amount, price):
+        """ccxt-style alias used by the grid strategies."""
+        return self.create_limit_order(pair, "sell", amount, price)
+
+    def create_batch_orders(self, orders):
+        """
+        Places up to 20 limit orders per request via the batch endpoint. Each order carries a client order ID,
+        so responses are matched to orders by ID rather than by position in the reply.
+        Args:
+            orders (list): Dicts with symbol, side, amount & price (one symbol per call), optionally client_id.
+        Returns:
+            list: Response per order, in order (None where the order was rejected or missing from the reply).
+        """
+        results = []
+        for start in range(0, len(orders), 20):
+            chunk = orders[start:start + 20]
+            client_ids = [order.get("client_id") or uuid.uuid4().hex[:16] for order in chunk]
+            payload = [{
+                'symbol': order["symbol"].replace("/", ""),
+                'side': order["side"].upper(),
+                'type': 'LIMIT',
+                'quantity': order["amount"],
+                'price': order["price"],
+                'newClientOrderId': client_id,
+            } for order, client_id in zip(chunk, client_ids)]
+            try:
+                url = f"{self.base_url}/batchOrders"
+                data = self.session.post(url, params={'batchOrders': json.dumps(payload)}).json()
+                if not isinstance(data, list):
+                    Logger.error(f"❌ Error placing batch orders: {data}")
+                    results.extend([None] * len(chunk))
+                    continue
+
+                by_client = {}
+                for item in data:
+                    if isinstance(item, dict):
+                        client_id = item.get("clientOrderId") or item.get("newClientOrderId")
+                        if client_id is not None:
+                            by_client[str(client_id)] = item
+                if by_client:
+                    replies = [by_client.get(client_id) for client_id in client_ids]
+                elif len(data) == len(chunk):
+                    replies = data
+                else:  # Can't tell which orders the replies belong to
+                    Logger.error(f"❌ Batch reply has {len(data)} entries for {len(chunk)} orders; marking all failed.")
+                    replies = [None] * len(chunk)
+                results.extend(item if isinstance(item, dict) and "orderId" in item else None for item in replies)
+            except Exception as e:
+                Logger.error(f"❌ Error placing batch orders: {e}")
+                results.extend([None] * len(chunk))
+        return results
+
+    def cancel_order(self, order_id, pair="PI/USDT"):
+        """
+        Cancels an open order.
+        Returns:
+            dict or None: Cancel response, or None if the cancel failed.
+        """
+        try:
+            url = f"{self.base_url}/order"
+            data = self.session.delete(url, params={'symbol': pair.replace("/", ""), 'orderId': order_id}).json()
+            if not isinstance(data, dict) or ("orderId" not in data and data.get("code") != 200):
+                Logger.error(f"❌ Error canceling order {order_id}: {data}")
+                return None
+            return data
+
+        except requests.exceptions.RequestException as e:
+            Logger.error(f"❌ Network error: {e}")
+            return None
+        except Exception as e:
+            Logger.error(f"❌ Error canceling order {order_id}: {e}")
+            return None
+
+    def fetch_open_orders(self, pair="PI/USDT"):
+        """
+        Fetch open orders for the given pair.
+        Returns:
+            list or None: ccxt-style orders ({"id", "symbol", "side", "price", "amount", "status"}), None on error.
+        """
+        try:
+            url = f"{self.base_url}/openOrders"
+            data = self.session.get(url, params={'symbol': pair.replace("/", "")}).json()
+            if not isinstance(data, list):
+                Logger.error(f"❌ Unexpected open orders response: {data}")
+                return None
+            return [{
+                "id": str(order["orderId"]),
+                "symbol": pair,
+                "side": order["side"].upper(),
+                "price": float(order["price"]),
+                "amount": float(order["origQty"]),
+                "filled": float(order.get("executedQty", 0)),
+                "status": "open",
+            } for order in data]
+
+        except requests.exceptions.RequestException as e:
+            Logger.error(f"❌ Network error: {e}")
+            return None
+        except Exception as e:
+            Logger.error(f"❌ Error fetching open orders: {e}")
+            return None
+
+    def fetch_order(self, order_id, pair="PI/USDT"):
+        """
+        Fetch one order's current status.
+        Returns:
+            dict or None: {"id", "symbol", "side", "price", "amount", "filled", "status"} (status as reported by MEXC).
+        """
+        try:
+            url = f"{self.base_url}/order"
+            data = self.session.get(url, params={'symbol': pair.replace("/", ""), 'orderId': order_id}).json()
+            if not isinstance(data, dict) or "orderId" not in data:
+                Logger.error(f"❌ Unexpected order response: {data}")
+                return None
+            return {
+                "id": str(data["orderId"]),
+                "symbol": pair,
+                "side": data.get("side", "").upper(),
+                "price": float(data.get("price") or 0),
+                "amount": float(data.get("origQty") or 0),
+                "filled": float(data.get("executedQty") or 0),
+                "status": data.get("status"),
+            }
+
+        except requests.exceptions.RequestException as e:
+            Logger.error(f"❌ Network error: {e}")
+            return None
+        except Exception as e:
+            Logger.error(f"❌ Error fetching order {order_id}: {e}")
+            return None
+
+    def create_market_order(self, pair, side, amount):
+        """ccxt-style alias used by HFTEngine."""
+        return self.place_order(pair, side, amount)
+
+    def create_market_buy_order(self, pair, amount):
+        """ccxt-style alias used by OrderRouter & the strategies."""
+        return self.place_order(pair, "buy", amount)
+
+    def create_market_sell_order(self, pair, amount):
+        """ccxt-style alias used by OrderRouter & the strategies."""
+        return self.place_order(pair, "sell", amount)
+
 # 🚀 EXAMPLE USAGE
 if __name__ == "__main__":
     exchange = ExchangeConnector()
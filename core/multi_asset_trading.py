@@ -4,60 +4,182 @@
 # ==================================================
 
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from core.exchange_connector import ExchangeConnector
 from ai_models.predictive_ai import PredictiveAI
 from core.risk_management import validate_trade
 from core.order_manager import OrderManager
+from core.order_pipeline import FILLED
+from core.order_store import OrderStore
+from core.portfolio_risk import PortfolioRiskEngine
 from core.portfolio_manager import PortfolioManager
-from config import TRADING_PAIRS, SCAN_INTERVAL
+from core.trading_runtime import LatencyStats
+from config import TRADING_PAIRS, SCAN_INTERVAL, MULTI_ASSET_WORKERS, PAIR_TIMEOUT, SCAN_TIMEOUT
 
 class MultiAssetTrading:
-    def __init__(self):
-        """Initialize multi-asset trading system."""
-        self.exchange = ExchangeConnector()
-        self.order_manager = OrderManager(self.exchange)
-        self.portfolio_manager = PortfolioManager(self.exchange)
-        self.ai_model = PredictiveAI()
+    def __init__(self, ai_model=None, exchange=None, pairs=TRADING_PAIRS, max_workers=MULTI_ASSET_WORKERS,
+                 pair_timeout=PAIR_TIMEOUT, scan_timeout=SCAN_TIMEOUT):
+        """
+        Initialize multi-asset trading system.
+        Args:
+            ai_model (PredictiveAI): Shared signal model (a new one is created if omitted).
+            exchange (ExchangeConnector): Exchange connection (a new one if None).
+            pairs (list): Pairs scanned every cycle.
+            max_workers (int): Pairs processed concurrently.
+            pair_timeout (float): Seconds a pair may run before the scan stops waiting for it.
+            scan_timeout (float): Upper bound on one scan (covers pairs still queued behind stalled ones).
+        """
+        self.exchange = exchange or ExchangeConnector()
+        self.order_store = OrderStore()
+        self.portfolio_risk = PortfolioRiskEngine()  # Enforces MAX_CONCURRENT_POSITIONS & MAX_DRAWDOWN across pairs
+        self.order_store.subscribe(self.portfolio_risk.on_order_update)
+        self.order_manager = OrderManager(self.exchange, store=self.order_store)
+        self.portfolio_manager = PortfolioManager()
+        self.ai_model = ai_model or PredictiveAI()
+        self.pairs = list(pairs)
+        self.pair_timeout = pair_timeout
+        self.scan_timeout = scan_timeout
+        self.executor = ThreadPoolExecutor(max_workers=max_workers + 1, thread_name_prefix="pair")  # +1 for the balance
+        self.model_lock = threading.Lock()  # One forward pass at a time on the shared Keras model
+        self.started = {}  # pair -> start time of its running task
+        self.scan_latency = LatencyStats()
+        self.pair_latency = {pair: LatencyStats() for pair in self.pairs}
+        self.stats = {"scans": 0, "timeouts": 0, "skipped": 0, "errors": 0, "orders": 0}
 
-    def trade_assets(self):
+    def trade_pair(self, pair, balance):
         """
-        Scans & trades multiple assets based on AI signals.
+        Runs one pair's pipeline: market data, signal, validation & order submission.
+        Args:
+            pair (str): Trading pair.
+            balance (Future): The scan's shared balance snapshot.
+        Returns:
+            OrderHandle or None: Submitted order, if any.
         """
-        for pair in TRADING_PAIRS:
+        start = self.started[pair] = time.time()
+        try:
             market_data = self.exchange.fetch_market_data(pair)
-            balance = self.exchange.fetch_balance()
-
-            if market_data is None or balance is None:
+            if market_data is None:
                 print(f"⚠️ No valid market data for {pair}. Skipping.")
-                continue
+                return None
+            self.portfolio_risk.on_price(pair, float(market_data["close"].iloc[-1]))
 
             # 🤖 Generate AI Trading Signal
-            trade_signal = self.ai_model.generate_trade_signal(market_data)
+            with self.model_lock:
+                trade_signal = self.ai_model.generate_trade_signal(market_data, symbol=pair)
 
             if trade_signal == "HOLD":
                 print(f"⏳ No strong signal for {pair}. Holding...")
-                continue
+                return None
 
             # 🛡️ Validate Trade
-            trade_decision = validate_trade(trade_signal, market_data, balance)
+            balance = balance.result(timeout=max(0.0, start + self.pair_timeout - time.time()))
+            if balance is None:
+                print(f"⚠️ No balance snapshot for {pair}. Skipping.")
+                return None
+            if self.portfolio_risk.peak_equity == 0:  # First snapshot sets the equity drawdown is measured from
+                self.portfolio_risk.set_capital(float(balance["USDT"]))
+            trade_decision = validate_trade(trade_signal, market_data, balance, portfolio_risk=self.portfolio_risk,
+                                            symbol=pair)
 
             if not trade_decision["valid"]:
                 print(f"⚠️ Trade not valid for {pair}: {trade_decision['reason']}. Skipping...")
+                return None
+
+            # 🚀 Submit Trade (non-blocking – the pair's worker is free again right away)
+            trade_decision["symbol"] = pair
+            handle = self.order_manager.submit_order(trade_signal, trade_decision)
+            if not handle:
+                self.portfolio_risk.release(trade_decision.get("client_id"))  # Never sent – free its reservation
+            else:
+                self.stats["orders"] += 1
+                handle.add_callback(lambda h: h.state == FILLED and print(
+                    f"✅ Trade Executed: {trade_signal} {trade_decision['position_size']} {pair}"))
+            return handle
+        finally:
+            self.pair_latency[pair].add(time.time() - start)
+            self.started.pop(pair, None)
+
+    def trade_assets(self):
+        """
+        Scans & trades multiple assets based on AI signals. Pairs run concurrently against one balance
+        snapshot; a pair that overruns pair_timeout is left to finish in the background and skipped by
+        later scans until it does.
+        Returns:
+            dict: Scan summary (duration, completed, timed-out & skipped pairs).
+        """
+        start = time.time()
+        balance = self.executor.submit(self.exchange.fetch_balance)
+        futures = {}
+        skipped = []
+        for pair in self.pairs:
+            if pair in self.started:  # Still stuck from an earlier scan
+                skipped.append(pair)
                 continue
+            futures[self.executor.submit(self.trade_pair, pair, balance)] = pair
+
+        completed, timed_out = self._wait(futures, start)
+        duration = time.time() - start
+        self.scan_latency.add(duration)
+        self.stats["scans"] += 1
+        self.stats["timeouts"] += len(timed_out)
+        self.stats["skipped"] += len(skipped)
+        summary = {"duration": duration, "completed": completed, "timed_out": timed_out, "skipped": skipped}
+        print(f"🔎 Scan {self.stats['scans']}: {len(completed)}/{len(self.pairs)} pairs in {duration:.2f}s"
+              + (f" | timed out: {timed_out}" if timed_out else "") + (f" | skipped: {skipped}" if skipped else ""))
+        return summary
+
+    def _wait(self, futures, scan_start):
+        """
+        Waits for pair tasks, giving each one pair_timeout from when it actually started.
+        Returns:
+            tuple: (completed pairs, timed-out pairs).
+        """
+        completed, timed_out = [], []
+        pending = set(futures)
+        scan_deadline = scan_start + self.scan_timeout
+        while pending:
+            timeout = max(0.0, self._next_deadline(pending, futures, scan_deadline) - time.time())
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                completed.append(futures[future])
+                if future.exception() is not None:
+                    self.stats["errors"] += 1
+                    print(f"❌ Error trading {futures[future]}: {future.exception()}")
+            now = time.time()
+            for future in list(pending):
+                started = self.started.get(futures[future])
+                if now >= scan_deadline or (started is not None and now - started >= self.pair_timeout):
+                    future.cancel()  # Drops it if still queued; a running pair finishes in the background
+                    pending.discard(future)
+                    timed_out.append(futures[future])
+        return completed, timed_out
 
-            # 🚀 Execute Trade
-            order = self.order_manager.execute_order(trade_signal, trade_decision)
+    def _next_deadline(self, pending, futures, scan_deadline):
+        """Earliest pair timeout among running tasks (or the scan deadline)."""
+        started = [self.started.get(futures[future]) for future in pending]
+        return min([start + self.pair_timeout for start in started if start is not None] + [scan_deadline])
 
-            if order:
-                print(f"✅ Trade Executed: {trade_signal} {trade_decision['position_size']} {pair}")
+    def scan_metrics(self):
+        """
+        Returns:
+            dict: Scan-duration & per-pair latency statistics, counters & prediction-cache hit rate.
+        """
+        return {**self.stats, "scan": self.scan_latency.summary(),
+                "pairs": {pair: stats.summary() for pair, stats in self.pair_latency.items()},
+                "prediction_cache": self.ai_model.prediction_cache.stats()}
 
     def start_multi_asset_trading(self):
         """
         Continuously scans & trades multiple assets in a loop.
         """
         while True:
-            self.trade_assets()
-            time.sleep(SCAN_INTERVAL)
+            summary = self.trade_assets()
+            try:  # Resolves orders left ACKNOWLEDGED – their fills reach portfolio_risk through the store
+                self.order_store.maybe_reconcile(self.exchange, self.pairs)
+            except Exception as e:
+                print(f"❌ Order reconciliation failed: {e}")
+            time.sleep(max(0.0, SCAN_INTERVAL - summary["duration"]))
 
 # 🚀 START MULTI-ASSET TRADING
 if __name__ == "__main__":
@@ -5,18 +5,59 @@
 
 import time
 from core.exchange_connector import ExchangeConnector
+from core.order_pipeline import OrderPipeline
 from config import ENABLE_SIMULATION_MODE, ORDER_MINIMUM_VALUE, STOP_LOSS_PERCENT, TAKE_PROFIT_PERCENT
 from custom_logging.logger import Logger
 
 
 class OrderManager:
-    def __init__(self, exchange: ExchangeConnector):
+    def __init__(self, exchange: ExchangeConnector, pipeline=None, store=None):
         """
         Initializes the order manager with exchange connection.
         Args:
             exchange (ExchangeConnector): The exchange API connection.
+            pipeline (OrderPipeline): Shared non-blocking order pipeline (created on first submit_order if None).
+            store (OrderStore): Order store mirroring every submitted order.
         """
         self.exchange = exchange
+        self.pipeline = pipeline
+        self.store = store
+        if pipeline is not None and store is not None:
+            pipeline.subscribe(store.on_order_update)
+            store.subscribe(pipeline.on_store_update)  # Reconciled fills / cancels settle the pipeline handle
+
+    def submit_order(self, trade_type, trade_decision):
+        """
+        Non-blocking execute_order: checks the order, then hands it to the order pipeline.
+        Args:
+            trade_type (str): "BUY" or "SELL".
+            trade_decision (dict): Contains trade size & risk parameters (and the portfolio-risk "client_id"
+                reservation, which becomes the order's client ID).
+        Returns:
+            OrderHandle or None: Handle tracking the order, or None if it failed the minimum-size check.
+        """
+        symbol = trade_decision.get("symbol", "PI/USDT")
+        position_size = trade_decision["position_size"]
+        entry_price = trade_decision["entry_price"]
+
+        if position_size * entry_price < ORDER_MINIMUM_VALUE:
+            Logger.warning(f"⚠️ Trade size too small! Must be at least {ORDER_MINIMUM_VALUE} USDT.")
+            return None
+
+        if self.pipeline is None:
+            self.pipeline = OrderPipeline(self.exchange)
+            if self.store is not None:
+                self.pipeline.subscribe(self.store.on_order_update)
+                self.store.subscribe(self.pipeline.on_store_update)
+
+        if ENABLE_SIMULATION_MODE:
+            Logger.info(f"🛠️ [SIMULATION] {trade_type} {position_size} {symbol} @ {entry_price}")
+            order = {"id": "SIM_ORDER", "status": "simulated", "symbol": symbol, "side": trade_type}
+            return self.pipeline.resolved(symbol, trade_type, position_size, order,
+                                          client_id=trade_decision.get("client_id"))
+
+        Logger.info(f"📈 Submitting {trade_type} Order: {position_size} {symbol}...")
+        return self.pipeline.submit(symbol, trade_type, position_size, client_id=trade_decision.get("client_id"))
 
     def execute_order(self, trade_type, trade_decision):
         """
@@ -0,0 +1,278 @@
+# order_pipeline.py
+# ==================================================
+# 🚦 ORDER PIPELINE – NON-BLOCKING ORDER SUBMISSION & TRACKING 🚦
+# ==================================================
+
+import time
+import uuid
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from custom_logging.logger import Logger
+from config import RETRY_ATTEMPTS, RETRY_DELAY, ORDER_PIPELINE_WORKERS, ORDER_HISTORY_SIZE, ORDER_ACK_TTL
+
+# ✅ Order states (terminal states resolve the handle and leave the in-flight table)
+PENDING, SENT, ACKNOWLEDGED, FILLED, REJECTED, CANCELED = (
+    "pending", "sent", "acknowledged", "filled", "rejected", "canceled"
+)
+TERMINAL_STATES = {FILLED, REJECTED, CANCELED}
+SETTLED_STATES = TERMINAL_STATES | {ACKNOWLEDGED}
+
+EXCHANGE_STATUS = {
+    "FILLED": FILLED, "closed": FILLED,
+    "NEW": ACKNOWLEDGED, "PARTIALLY_FILLED": ACKNOWLEDGED, "open": ACKNOWLEDGED, "pending": ACKNOWLEDGED,
+    "CANCELED": CANCELED, "PARTIALLY_CANCELED": CANCELED, "canceled": CANCELED,
+    "REJECTED": REJECTED, "rejected": REJECTED, "simulated": FILLED,
+}
+
+
+def order_state(order):
+    """
+    Maps an exchange response (MEXC REST, ccxt-style or SimulatedExchange dict) to a pipeline state.
+    Args:
+        order (dict): Exchange response.
+    Returns:
+        str: ACKNOWLEDGED unless the response reports a fill, cancel or reject.
+    """
+    data = order.get("data") if isinstance(order.get("data"), dict) else order
+    return EXCHANGE_STATUS.get(data.get("status"), ACKNOWLEDGED)
+
+
+class OrderHandle:
+    def __init__(self, client_id, symbol, side, amount):
+        """
+        Tracks one order from submission to its final state.
+        Args:
+            client_id (str): Pipeline-assigned ID.
+            symbol (str): Trading pair.
+            side (str): "BUY" or "SELL".
+            amount (float): Order size.
+        """
+        self.client_id = client_id
+        self.symbol = symbol
+        self.side = side
+        self.amount = amount
+        self.state = PENDING
+        self.order = None
+        self.error = None
+        self.attempts = 0
+        self.created = time.time()
+        self.history = [(PENDING, self.created)]
+        self.future = Future()
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    @property
+    def exchange_id(self):
+        """Exchange order ID once acknowledged."""
+        if not self.order:
+            return None
+        data = self.order.get("data") if isinstance(self.order.get("data"), dict) else self.order
+        return data.get("orderId") or data.get("id")
+
+    def add_callback(self, fn):
+        """
+        Calls fn(handle) on every later state change (immediately if already settled).
+        """
+        with self._lock:
+            self._callbacks.append(fn)
+            settled = self.state in SETTLED_STATES
+        if settled:
+            self._notify(fn)
+
+    def _notify(self, fn):
+        try:
+            fn(self)
+        except Exception as e:
+            Logger.error(f"❌ Order callback failed for {self.client_id}: {e}")
+
+    def _transition(self, state, order=None, error=None):
+        """Records a state change and fires callbacks; the future resolves once the order is settled."""
+        with self._lock:
+            if self.state in TERMINAL_STATES:
+                return False
+            self.state = state
+            self.order = order if order is not None else self.order
+            self.error = error if error is not None else self.error
+            self.history.append((state, time.time()))
+            callbacks = list(self._callbacks)
+        for fn in callbacks:
+            self._notify(fn)
+        if state in SETTLED_STATES and not self.future.done():
+            self.future.set_result(self.order if state in (ACKNOWLEDGED, FILLED) else None)
+        return True
+
+    def done(self):
+        return self.future.done()
+
+    def result(self, timeout=None):
+        """
+        Blocks until the order is acknowledged, filled or rejected.
+        Returns:
+            dict or None: Exchange response, or None if the order was rejected / canceled.
+        """
+        return self.future.result(timeout)
+
+    def __await__(self):
+        return asyncio.wrap_future(self.future).__await__()
+
+    def __repr__(self):
+        return f"OrderHandle({self.client_id}, {self.side} {self.amount} {self.symbol}, {self.state})"
+
+
+class OrderPipeline:
+    def __init__(self, exchange, max_workers=ORDER_PIPELINE_WORKERS, retry_attempts=RETRY_ATTEMPTS,
+                 retry_delay=RETRY_DELAY, history_size=ORDER_HISTORY_SIZE, ack_ttl=ORDER_ACK_TTL):
+        """
+        Sends orders on a worker pool so callers get a handle immediately and several orders go out at once.
+        Args:
+            exchange: ExchangeConnector (or any object with create_market_buy_order / create_market_sell_order).
+            max_workers (int): Orders sent concurrently.
+            retry_attempts (int): Sends per order before it is rejected.
+            retry_delay (float): Seconds between attempts (spent on the worker, not the caller).
+            history_size (int): Settled handles kept for lookups.
+            ack_ttl (float): Seconds an ACKNOWLEDGED handle may go without a fill / cancel before it is dropped
+                (the order store, if any, keeps tracking the order itself).
+        """
+        self.exchange = exchange
+        self.retry_attempts = retry_attempts
+        self.retry_delay = retry_delay
+        self.history_size = history_size
+        self.ack_ttl = ack_ttl
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="order")
+        self.orders = OrderedDict()  # client_id -> OrderHandle
+        self.listeners = []
+        self.lock = threading.Lock()
+        self.stats = {"submitted": 0, "filled": 0, "acknowledged": 0, "rejected": 0, "retries": 0, "expired": 0}
+
+        # ✅ One pooled HTTP connection per worker so concurrent sends don't queue on the session
+        session = getattr(exchange, "session", None)
+        if session is not None:
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+
+    def subscribe(self, fn):
+        """Calls fn(handle) on every state change of every order."""
+        self.listeners.append(fn)
+
+    def submit(self, symbol, side, amount, guard=None, client_id=None):
+        """
+        Queues a market order and returns without waiting for the exchange.
+        Args:
+            symbol (str): Trading pair.
+            side (str): "BUY" or "SELL".
+            amount (float): Order size.
+            guard (callable): Optional pre-send check run on the worker; returns None to send or a
+                rejection reason (e.g. a slippage check against a fresh ticker).
+            client_id (str): ID to use (e.g. a portfolio-risk reservation); generated if None.
+        Returns:
+            OrderHandle: Tracks the order (await it, call result(), or add callbacks).
+        """
+        handle = OrderHandle(client_id or uuid.uuid4().hex[:16], symbol, side.upper(), amount)
+        for listener in self.listeners:
+            handle.add_callback(listener)
+        with self.lock:
+            self.orders[handle.client_id] = handle
+            self.stats["submitted"] += 1
+            self._trim()
+        self.executor.submit(self._send, handle, guard)
+        return handle
+
+    def resolved(self, symbol, side, amount, order, client_id=None):
+        """Registers an order that never needs sending (e.g. simulation mode) as already filled."""
+        handle = OrderHandle(client_id or uuid.uuid4().hex[:16], symbol, side.upper(), amount)
+        for listener in self.listeners:
+            handle.add_callback(listener)
+        with self.lock:
+            self.orders[handle.client_id] = handle
+            self.stats["submitted"] += 1
+            self._trim()
+        self._finish(handle, FILLED, order=order)
+        return handle
+
+    def _send(self, handle, guard):
+        """Worker: runs the guard, sends with retries and records the outcome."""
+        try:
+            reason = guard() if guard else None
+        except Exception as e:
+            reason = f"guard failed: {e}"
+        if reason:
+            Logger.warning(f"⚠️ Order {handle.client_id} rejected before sending: {reason}")
+            self._finish(handle, REJECTED, error=reason)
+            return
+
+        send = self.exchange.create_market_buy_order if handle.side == "BUY" else self.exchange.create_market_sell_order
+        for attempt in range(1, self.retry_attempts + 1):
+            handle.attempts = attempt
+            handle._transition(SENT)
+            try:
+                order = send(handle.symbol, handle.amount)
+                if order:
+                    self._finish(handle, order_state(order), order=order)
+                    return
+                handle.error = "exchange returned no order"
+            except Exception as e:
+                handle.error = str(e)
+                Logger.warning(f"⚠️ Order {handle.client_id} attempt {attempt} failed: {e}")
+            if attempt < self.retry_attempts:
+                self.stats["retries"] += 1
+                time.sleep(self.retry_delay)
+
+        Logger.error(f"❌ Order {handle.client_id} failed after {self.retry_attempts} attempts.")
+        self._finish(handle, REJECTED)
+
+    def _finish(self, handle, state, order=None, error=None):
+        handle._transition(state, order=order, error=error)
+        with self.lock:
+            self.stats[state] = self.stats.get(state, 0) + 1
+
+    def update(self, client_id, state, order=None):
+        """
+        Applies a later notification (fill, cancel) to an acknowledged order.
+        Returns:
+            bool: Whether the handle changed.
+        """
+        handle = self.orders.get(client_id)
+        return handle._transition(state, order=order) if handle else False
+
+    def on_store_update(self, record, previous, delta):
+        """
+        OrderStore listener (store.subscribe): settles a handle once reconciliation or an execution report
+        finds its order filled, canceled or rejected.
+        """
+        if record.state in TERMINAL_STATES and self.update(record.client_id, record.state):
+            with self.lock:
+                self.stats[record.state] = self.stats.get(record.state, 0) + 1
+
+    def get(self, client_id):
+        return self.orders.get(client_id)
+
+    def in_flight(self):
+        """Orders not yet in a terminal state."""
+        with self.lock:
+            return [handle for handle in self.orders.values() if handle.state not in TERMINAL_STATES]
+
+    def _trim(self):
+        """
+        Drops ACKNOWLEDGED handles idle for longer than ack_ttl, then the oldest terminal handles beyond
+        history_size (caller holds the lock).
+        """
+        cutoff = time.time() - self.ack_ttl
+        for client_id in [cid for cid, handle in self.orders.items()
+                          if handle.state == ACKNOWLEDGED and handle.history[-1][1] < cutoff]:
+            Logger.warning(f"⚠️ Order {client_id} still only acknowledged after {self.ack_ttl}s; no longer tracked.")
+            del self.orders[client_id]
+            self.stats["expired"] += 1
+
+        excess = len(self.orders) - self.history_size
+        if excess <= 0:
+            return
+        for client_id in [cid for cid, handle in self.orders.items() if handle.state in TERMINAL_STATES][:excess]:
+            del self.orders[client_id]
+
+    def shutdown(self, wait=True):
+        """Stops accepting orders; waits for in-flight sends if wait is True."""
+        self.executor.shutdown(wait=wait)
@@ -3,21 +3,23 @@
 # 📡 ORDER ROUTER – EXECUTES & MANAGES TRADES 📡
 # ==================================================
 
-import time
 from core.exchange_connector import ExchangeConnector
+from core.order_pipeline import OrderPipeline
 from core.risk_management import validate_trade
 from custom_logging.logger import Logger
 
-from config import MAX_SLIPPAGE, RETRY_ATTEMPTS, RETRY_DELAY
+from config import MAX_SLIPPAGE
 
 class OrderRouter:
-    def __init__(self, exchange: ExchangeConnector):
+    def __init__(self, exchange: ExchangeConnector, pipeline=None):
         """
         Initializes the order router.
         Args:
             exchange (ExchangeConnector): The exchange connection instance.
+            pipeline (OrderPipeline): Order pipeline used for sending & retries (a new one if None).
         """
         self.exchange = exchange
+        self.pipeline = pipeline or OrderPipeline(exchange)
 
     def place_order(self, trade_signal, market_data, balance):
         """
@@ -29,6 +31,20 @@ class OrderRouter:
         Returns:
             dict or None: Order details if successful, None if failed.
         """
+        handle = self.submit_order(trade_signal, market_data, balance)
+        return handle.result() if handle else None
+
+    def submit_order(self, trade_signal, market_data, balance):
+        """
+        Non-blocking place_order: validates the trade and returns a handle right away.
+        The slippage check against a fresh ticker and the retries run on the pipeline's workers.
+        Args:
+            trade_signal (str): "BUY" or "SELL".
+            market_data (DataFrame): Latest market data.
+            balance (dict): Available balance.
+        Returns:
+            OrderHandle or None: Handle tracking the order, or None if validation failed.
+        """
         try:
             # ✅ Validate trade
             trade_decision = validate_trade(trade_signal, market_data, balance)
@@ -39,26 +55,31 @@ class OrderRouter:
             symbol = "PI/USDT"
             position_size = trade_decision["position_size"]
             entry_price = trade_decision["entry_price"]
-
-            # ✅ Check slippage before placing the order
-            latest_price = self.exchange.fetch_ticker(symbol)["last"]
-            allowed_slippage = entry_price * MAX_SLIPPAGE
-            slippage_limit = entry_price + allowed_slippage if trade_signal == "BUY" else entry_price - allowed_slippage
-
-            if (trade_signal == "BUY" and latest_price > slippage_limit) or (trade_signal == "SELL" and latest_price < slippage_limit):
-                Logger.warning(f"⚠️ Trade rejected due to high slippage: {latest_price} (Limit: {slippage_limit})")
-                return None
-
-            # ✅ Execute order
-            return self._execute_trade_with_retry(symbol, trade_signal, position_size)
+            return self.pipeline.submit(symbol, trade_signal, position_size,
+                                        guard=lambda: self._check_slippage(symbol, trade_signal, entry_price))
 
         except Exception as e:
             Logger.error(f"❌ OrderRouter.place_order failed: {e}")
             return None
 
+    def _check_slippage(self, symbol, trade_signal, entry_price):
+        """
+        Compares the latest price with the entry price.
+        Returns:
+            str or None: Rejection reason, or None if the order may be sent.
+        """
+        latest_price = self.exchange.fetch_ticker(symbol)["last"]
+        allowed_slippage = entry_price * MAX_SLIPPAGE
+        slippage_limit = entry_price + allowed_slippage if trade_signal == "BUY" else entry_price - allowed_slippage
+
+        if (trade_signal == "BUY" and latest_price > slippage_limit) or (trade_signal == "SELL" and latest_price < slippage_limit):
+            Logger.warning(f"⚠️ Trade rejected due to high slippage: {latest_price} (Limit: {slippage_limit})")
+            return f"slippage {latest_price} beyond {slippage_limit}"
+        return None
+
     def _execute_trade_with_retry(self, symbol, trade_signal, position_size):
         """
-        Tries to execute a trade multiple times if it fails.
+        Executes a trade through the pipeline (which retries failed sends) and waits for the outcome.
         Args:
             symbol (str): Trading pair.
             trade_signal (str): "BUY" or "SELL".
@@ -66,25 +87,7 @@ class OrderRouter:
         Returns:
             dict or None: Order details if successful, None if failed.
         """
-        for attempt in range(1, RETRY_ATTEMPTS + 1):
-            try:
-                Logger.info(f"📡 Attempting {trade_signal} order for {symbol} (Size: {position_size}) - Try {attempt}/{RETRY_ATTEMPTS}")
-                
-                if trade_signal == "BUY":
-                    order = self.exchange.create_market_buy_order(symbol, position_size)
-                else:
-                    order = self.exchange.create_market_sell_order(symbol, position_size)
-
-                if order:
-                    Logger.info(f"✅ Order Successful: {order}")
-                    return order
-
-            except Exception as e:
-                Logger.warning(f"⚠️ Trade attempt {attempt} failed: {e}")
-                time.sleep(RETRY_DELAY)  # Wait before retrying
-
-        Logger.error(f"❌ Order execution failed after {RETRY_ATTEMPTS} attempts.")
-        return None
+        return self.pipeline.submit(symbol, trade_signal, position_size).result()
 
 # 🚀 TEST ORDER ROUTER (DEBUG ONLY)
 if __name__ == "__main__":
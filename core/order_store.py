@@ -0,0 +1,270 @@
+# order_store.py
+# ==================================================
+# 🗂️ ORDER STORE – IN-MEMORY ORDER STATE WITH O(1) LOOKUPS 🗂️
+# ==================================================
+
+import time
+import threading
+from collections import defaultdict
+from core.order_pipeline import (
+    PENDING, SENT, ACKNOWLEDGED, FILLED, REJECTED, CANCELED, TERMINAL_STATES, EXCHANGE_STATUS
+)
+from custom_logging.logger import Logger
+from config import PAIR, ORDER_RECONCILE_INTERVAL, ORDER_RETENTION
+
+PARTIALLY_FILLED = "partially_filled"
+OPEN_STATES = {PENDING, SENT, ACKNOWLEDGED, PARTIALLY_FILLED}
+
+# ✅ Allowed transitions; anything else (e.g. a late "acknowledged" after a fill) is ignored
+TRANSITIONS = {
+    PENDING: {SENT, ACKNOWLEDGED, PARTIALLY_FILLED, FILLED, REJECTED, CANCELED},
+    SENT: {SENT, ACKNOWLEDGED, PARTIALLY_FILLED, FILLED, REJECTED, CANCELED},
+    ACKNOWLEDGED: {PARTIALLY_FILLED, FILLED, CANCELED},
+    PARTIALLY_FILLED: {PARTIALLY_FILLED, FILLED, CANCELED},
+    FILLED: set(),
+    REJECTED: set(),
+    CANCELED: set(),
+}
+REPORT_STATUS = {**EXCHANGE_STATUS, "PARTIALLY_FILLED": PARTIALLY_FILLED, "partially_filled": PARTIALLY_FILLED}
+
+
+class OrderRecord:
+    """One order's current state."""
+
+    __slots__ = ("client_id", "exchange_id", "symbol", "side", "type", "price", "amount", "filled", "average",
+                 "state", "created", "updated")
+
+    def __init__(self, client_id, symbol, side, amount, price=None, order_type="market", state=PENDING):
+        self.client_id = client_id
+        self.exchange_id = None
+        self.symbol = symbol
+        self.side = side.upper()
+        self.type = order_type
+        self.price = price
+        self.amount = amount
+        self.filled = 0.0
+        self.average = None
+        self.state = state
+        self.created = time.time()
+        self.updated = self.created
+
+    @property
+    def remaining(self):
+        return self.amount - self.filled
+
+    def to_dict(self):
+        """ccxt-style order dict (the shape TradeMonitor & the dashboard consume)."""
+        return {"id": self.exchange_id or self.client_id, "client_id": self.client_id, "symbol": self.symbol,
+                "side": self.side, "type": self.type, "price": self.price if self.price is not None else self.average,
+                "amount": self.amount, "filled": self.filled, "remaining": self.remaining, "average": self.average,
+                "status": self.state, "timestamp": self.created}
+
+
+class OrderStore:
+    def __init__(self, reconcile_interval=ORDER_RECONCILE_INTERVAL, retention=ORDER_RETENTION):
+        """
+        Orders indexed by client ID, exchange ID, symbol & state, fed by our own submissions and by
+        exchange execution reports, and reconciled against the exchange only every reconcile_interval.
+        Args:
+            reconcile_interval (float): Minimum seconds between reconciliations in maybe_reconcile.
+            retention (float): Seconds terminal orders are kept; maybe_reconcile prunes older ones.
+        """
+        self.reconcile_interval = reconcile_interval
+        self.retention = retention
+        self.by_client = {}
+        self.by_exchange = {}
+        self.by_symbol = defaultdict(set)
+        self.by_state = defaultdict(set)
+        self.listeners = []
+        self.lock = threading.RLock()
+        self.last_reconcile = 0.0
+        self.stats = {"transitions": 0, "ignored": 0, "reports": 0, "reconciles": 0}
+
+    def subscribe(self, fn):
+        """Calls fn(record, previous_state, filled_delta) after every accepted change."""
+        self.listeners.append(fn)
+
+    # ------------------------------------------------------------------
+    # ✍️ Updates
+    # ------------------------------------------------------------------
+    def add(self, client_id, symbol, side, amount, price=None, order_type="market", state=PENDING, exchange_id=None):
+        """
+        Registers an order.
+        Returns:
+            OrderRecord: The new (or already registered) record.
+        """
+        with self.lock:
+            record = self.by_client.get(client_id)
+            if record is not None:
+                return record
+            record = OrderRecord(client_id, symbol, side, amount, price, order_type, state)
+            self.by_client[client_id] = record
+            self.by_symbol[symbol].add(client_id)
+            self.by_state[state].add(client_id)
+            if exchange_id is not None:
+                self._set_exchange_id(record, exchange_id)
+            return record
+
+    def _set_exchange_id(self, record, exchange_id):
+        record.exchange_id = str(exchange_id)
+        self.by_exchange[record.exchange_id] = record
+
+    def transition(self, record, state, filled=None, average=None, exchange_id=None):
+        """
+        Moves an order to a new state if the state machine allows it.
+        Args:
+            record (OrderRecord): Order to update.
+            state (str): New state.
+            filled (float): Cumulative filled quantity, if known.
+            average (float): Average fill price, if known.
+            exchange_id (str): Exchange order ID, if newly known.
+        Returns:
+            bool: Whether the change was applied.
+        """
+        with self.lock:
+            if exchange_id is not None and record.exchange_id is None:
+                self._set_exchange_id(record, exchange_id)
+            previous = record.state
+            if state != previous and state not in TRANSITIONS[previous]:
+                self.stats["ignored"] += 1
+                return False
+            if state == FILLED and filled is None:
+                filled = record.amount
+            delta = 0.0
+            if filled is not None and filled > record.filled:
+                delta = filled - record.filled
+                record.filled = filled
+            if average is not None:
+                record.average = average
+            if state == previous and delta == 0:
+                return False
+            self.by_state[previous].discard(record.client_id)
+            self.by_state[state].add(record.client_id)
+            record.state = state
+            record.updated = time.time()
+            self.stats["transitions"] += 1
+        for fn in self.listeners:
+            try:
+                fn(record, previous, delta)
+            except Exception as e:
+                Logger.error(f"❌ Order store listener failed: {e}")
+        return True
+
+    def on_order_update(self, handle):
+        """
+        OrderPipeline listener: mirrors our own submissions (subscribe it with pipeline.subscribe).
+        Args:
+            handle (OrderHandle): Pipeline handle.
+        """
+        record = self.add(handle.client_id, handle.symbol, handle.side, handle.amount)
+        self.transition(record, handle.state, exchange_id=handle.exchange_id)
+
+    def on_execution_report(self, report):
+        """
+        Applies an exchange order update (REST order response, ccxt order or user-stream execution report).
+        Args:
+            report (dict): Needs an order ID & status; filled / average / client ID are used when present.
+        Returns:
+            OrderRecord or None: The updated record.
+        """
+        data = report.get("data") if isinstance(report.get("data"), dict) else report
+        exchange_id = data.get("orderId") or data.get("id")
+        client_id = data.get("clientOrderId") or data.get("client_id")
+        state = REPORT_STATUS.get(data.get("status"))
+        if exchange_id is None or state is None:
+            return None
+        self.stats["reports"] += 1
+
+        record = self.by_exchange.get(str(exchange_id)) or (self.by_client.get(client_id) if client_id else None)
+        if record is None:  # Placed outside this process – start tracking it
+            record = self.add(client_id or str(exchange_id), data.get("symbol", PAIR), data.get("side", "BUY"),
+                              float(data.get("amount") or data.get("origQty") or 0.0),
+                              price=float(data["price"]) if data.get("price") else None,
+                              order_type=str(data.get("type", "limit")).lower(), state=ACKNOWLEDGED,
+                              exchange_id=exchange_id)
+        filled = data.get("filled", data.get("executedQty"))
+        if state == ACKNOWLEDGED and filled is not None and float(filled) > 0:
+            state = PARTIALLY_FILLED
+        average = data.get("average")
+        self.transition(record, state, filled=float(filled) if filled is not None else None,
+                        average=float(average) if average else None, exchange_id=exchange_id)
+        return record
+
+    # ------------------------------------------------------------------
+    # 🔄 Reconciliation
+    # ------------------------------------------------------------------
+    def reconcile(self, exchange, symbols=None):
+        """
+        Aligns the store with the exchange's open orders: unknown open orders are added, and orders we
+        consider open but the exchange doesn't list are resolved via fetch_order (if available).
+        Args:
+            exchange: Client with fetch_open_orders(symbol) (and optionally fetch_order(id, symbol)).
+            symbols (list): Symbols to reconcile (default: every symbol with open orders, or PAIR).
+        """
+        symbols = symbols or self.open_symbols() or [PAIR]
+        for symbol in symbols:
+            open_orders = exchange.fetch_open_orders(symbol)
+            if open_orders is None:
+                continue
+            listed = set()
+            for order in open_orders:
+                record = self.on_execution_report({**order, "symbol": order.get("symbol", symbol),
+                                                   "status": order.get("status", "open")})
+                if record is not None:
+                    listed.add(record.client_id)
+            for record in self.open_orders(symbol):
+                if record.client_id in listed or record.exchange_id is None or record.state in (PENDING, SENT):
+                    continue
+                order = exchange.fetch_order(record.exchange_id, symbol) if hasattr(exchange, "fetch_order") else None
+                if order:
+                    self.on_execution_report({**order, "id": record.exchange_id})
+                else:
+                    Logger.warning(f"⚠️ Order {record.exchange_id} no longer open on the exchange; final state unknown.")
+        self.last_reconcile = time.time()
+        self.stats["reconciles"] += 1
+
+    def maybe_reconcile(self, exchange, symbols=None):
+        """Reconciles (and prunes terminal orders past retention) if reconcile_interval has passed."""
+        if time.time() - self.last_reconcile >= self.reconcile_interval:
+            self.reconcile(exchange, symbols)
+            self.prune(self.retention)
+            return True
+        return False
+
+    # ------------------------------------------------------------------
+    # 🔎 Lookups
+    # ------------------------------------------------------------------
+    def get(self, client_id):
+        return self.by_client.get(client_id)
+
+    def get_by_exchange_id(self, exchange_id):
+        return self.by_exchange.get(str(exchange_id))
+
+    def with_state(self, state, symbol=None):
+        """Orders in one state (optionally for one symbol)."""
+        with self.lock:
+            ids = self.by_state[state] if symbol is None else self.by_state[state] & self.by_symbol[symbol]
+            return [self.by_client[client_id] for client_id in ids]
+
+    def open_symbols(self):
+        """Symbols that still have open orders."""
+        with self.lock:
+            return sorted({self.by_client[client_id].symbol for state in OPEN_STATES for client_id in self.by_state[state]})
+
+    def open_orders(self, symbol=None):
+        """Orders not yet filled, canceled or rejected."""
+        return [record for state in OPEN_STATES for record in self.with_state(state, symbol)]
+
+    def prune(self, max_age):
+        """Forgets terminal orders older than max_age seconds."""
+        cutoff = time.time() - max_age
+        with self.lock:
+            for state in TERMINAL_STATES:
+                for client_id in [cid for cid in self.by_state[state] if self.by_client[cid].updated < cutoff]:
+                    record = self.by_client.pop(client_id)
+                    self.by_state[state].discard(client_id)
+                    self.by_symbol[record.symbol].discard(client_id)
+                    if not self.by_symbol[record.symbol]:
+                        del self.by_symbol[record.symbol]
+                    if record.exchange_id is not None:
+                        self.by_exchange.pop(record.exchange_id, None)
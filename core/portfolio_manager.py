@@ -4,17 +4,32 @@
 # ==================================================
 
 import time
+import numpy as np
 from core.exchange_connector import ExchangeConnector
+from core.columnar_book import ColumnarBook
 from custom_logging.logger import Logger
 
-from config import PAIR, ORDER_MINIMUM_VALUE
+from config import PAIR, ORDER_MINIMUM_VALUE, POSITION_BOOK_CAPACITY
 
 class PortfolioManager:
-    def __init__(self):
-        """Initialize portfolio management system."""
-        self.exchange = ExchangeConnector()
+    def __init__(self, exchange=None, capacity=POSITION_BOOK_CAPACITY):
+        """
+        Initialize portfolio management system. Positions are stored column-wise (one NumPy array per field),
+        so the whole book is marked to market in a few vectorized operations.
+        Args:
+            exchange (ExchangeConnector): Exchange connection (a new one if None).
+            capacity (int): Initial rows preallocated (doubles when full).
+        """
+        self.exchange = exchange or ExchangeConnector()
         self.balance = {"USDT": 0, "PI": 0}
-        self.positions = []  # ✅ Stores active positions
+        self.book = ColumnarBook({
+            "size": np.float64,
+            "entry_price": np.float64,
+            "side": np.int8,  # +1 BUY, -1 SELL
+            "symbol": np.int32,
+            "opened": np.float64,  # Epoch seconds
+        }, capacity)
+        self._next_position_id = 1
 
     def update_balance(self):
         """
@@ -23,58 +38,125 @@ class PortfolioManager:
         self.balance = self.exchange.fetch_balance()
         Logger.info(f"💰 Updated Balance: {self.balance}")
 
-    def track_unrealized_pnl(self):
-        """
-        Calculate unrealized profit/loss on open positions.
-        """
-        if not self.positions:
-            Logger.info("📊 No open positions to track.")
-            return
-
-        market_price = self.exchange.fetch_ticker_price(PAIR)
-        for pos in self.positions:
-            entry_price = pos["entry_price"]
-            position_size = pos["size"]
-            trade_type = pos["trade_type"]
-
-            # ✅ Calculate Unrealized P/L
-            if trade_type == "BUY":
-                pnl = (market_price - entry_price) * position_size
-            else:
-                pnl = (entry_price - market_price) * position_size
-
-            Logger.info(f"📊 Unrealized P/L for {pos['trade_type']} Position: {pnl:.2f} USDT")
-
-    def add_position(self, trade_signal, position_size, entry_price):
+    # ------------------------------------------------------------------
+    # 📚 Position book
+    # ------------------------------------------------------------------
+    def add_position(self, trade_signal, position_size, entry_price, trade_id=None, symbol=PAIR):
         """
         Add a new position to the portfolio.
         Args:
             trade_signal (str): "BUY" or "SELL".
             position_size (float): Amount of asset.
             entry_price (float): Trade entry price.
+            trade_id (str): ID used by close_position (generated if None).
+            symbol (str): Trading pair.
+        Returns:
+            str or None: Trade ID of the position, or None if it was skipped.
         """
         if position_size * entry_price < ORDER_MINIMUM_VALUE:
-            Logger.warning(f"⚠️ Position size too small: {position_size:.6f} PI. Skipping...")
-            return
+            Logger.warning(f"⚠️ Position size too small: {position_size:.6f} {symbol}. Skipping...")
+            return None
 
-        position = {
-            "trade_type": trade_signal,
-            "size": position_size,
-            "entry_price": entry_price,
-            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
-        }
-        self.positions.append(position)
-        Logger.info(f"✅ Position Added: {position}")
+        if trade_id is None:
+            trade_id = f"POS-{self._next_position_id}"
+            self._next_position_id += 1
+        self.book.set(trade_id, {"size": position_size, "entry_price": entry_price,
+                                 "side": 1 if trade_signal == "BUY" else -1, "symbol": symbol, "opened": time.time()})
+        index = self.book.symbol_index[symbol]
+        if np.isnan(self.book.prices[index]):
+            self.book.prices[index] = entry_price
+        Logger.info(f"✅ Position Added: {trade_id} {trade_signal} {position_size} {symbol} @ {entry_price}")
+        return trade_id
 
     def close_position(self, trade_id):
         """
-        Close an active position.
+        Close an active position in O(1) (swap-remove).
         Args:
             trade_id (str): The ID of the trade to close.
         """
-        self.positions = [pos for pos in self.positions if pos.get("trade_id") != trade_id]
+        if not self.book.remove(trade_id):
+            return
         Logger.info(f"📉 Closed Trade ID: {trade_id}")
 
+    def position(self, trade_id):
+        """Returns one position as a dict (None if unknown)."""
+        row = self.book.rows.get(trade_id)
+        if row is None:
+            return None
+        columns = self.book.columns
+        return {
+            "trade_id": trade_id,
+            "trade_type": "BUY" if columns["side"][row] > 0 else "SELL",
+            "symbol": self.book.symbols[columns["symbol"][row]],
+            "size": float(columns["size"][row]),
+            "entry_price": float(columns["entry_price"][row]),
+            "timestamp": float(columns["opened"][row]),
+        }
+
+    @property
+    def positions(self):
+        """Active positions keyed by trade ID (built on demand – use the columns for bulk work)."""
+        return {trade_id: self.position(trade_id) for trade_id in self.book.ids}
+
+    # ------------------------------------------------------------------
+    # 💹 Mark-to-market
+    # ------------------------------------------------------------------
+    def update_prices(self, tickers):
+        """
+        Updates the per-symbol price vector.
+        Args:
+            tickers (dict): {symbol: ticker dict with "last"} or {symbol: price}.
+        """
+        self.book.update_prices(tickers)
+
+    def mark_to_market(self, prices=None):
+        """
+        Values every position against a price vector in one vectorized pass.
+        Args:
+            prices (np.array): Price per symbol index (default: the latest prices).
+        Returns:
+            dict: Per-position arrays (pnl, notional, weight) and totals, with per-symbol exposure.
+        """
+        n = self.book.count
+        prices = self.book.prices if prices is None else np.asarray(prices, dtype=float)
+        columns = self.book.active()
+        size, entry, side, symbol = columns["size"], columns["entry_price"], columns["side"], columns["symbol"]
+
+        price = prices[symbol]
+        pnl = side * (price - entry) * size
+        notional = price * size
+        gross = notional.sum()
+        weights = notional / gross if gross > 0 else np.zeros(n)
+        net = np.bincount(symbol, weights=side * notional, minlength=len(self.book.symbols))
+        return {
+            "ids": self.book.ids[:n],
+            "pnl": pnl,
+            "notional": notional,
+            "weights": weights,
+            "unrealized_pnl": float(pnl.sum()),
+            "gross_exposure": float(gross),
+            "net_exposure": float(net.sum()),
+            "exposure_by_symbol": dict(zip(self.book.symbols, net.tolist())),
+        }
+
+    def track_unrealized_pnl(self):
+        """
+        Calculate unrealized profit/loss on open positions: one bulk ticker request for every symbol held,
+        then one vectorized valuation.
+        Returns:
+            dict or None: mark_to_market() result, or None if there are no positions.
+        """
+        if not self.book.count:
+            Logger.info("📊 No open positions to track.")
+            return None
+
+        held = np.unique(self.book.active()["symbol"])
+        self.update_prices(self.exchange.fetch_tickers([self.book.symbols[i] for i in held]))
+        valuation = self.mark_to_market()
+        Logger.info(f"📊 Unrealized P/L: {valuation['unrealized_pnl']:.2f} USDT across {self.book.count} positions "
+                    f"| Gross exposure: {valuation['gross_exposure']:.2f} USDT")
+        return valuation
+
 # 🚀 EXAMPLE USAGE
 if __name__ == "__main__":
     portfolio = PortfolioManager()
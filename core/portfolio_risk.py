@@ -0,0 +1,236 @@
+# portfolio_risk.py
+# ==================================================
+# 🧮 PORTFOLIO RISK – INCREMENTAL EXPOSURE & DRAWDOWN LIMITS 🧮
+# ==================================================
+
+import threading
+from collections import defaultdict
+from core.order_pipeline import TERMINAL_STATES
+from custom_logging.logger import Logger
+from config import MAX_CONCURRENT_POSITIONS, MAX_DRAWDOWN, MAX_PORTFOLIO_EXPOSURE, MAX_ASSET_EXPOSURE, ALLOW_SHORT
+
+
+class PortfolioRiskEngine:
+    def __init__(self, capital=None, max_positions=MAX_CONCURRENT_POSITIONS, max_drawdown=MAX_DRAWDOWN,
+                 max_exposure=MAX_PORTFOLIO_EXPOSURE, max_asset_exposure=MAX_ASSET_EXPOSURE, allow_short=ALLOW_SHORT):
+        """
+        Portfolio-level risk state kept up to date on every fill and price tick, so a pre-trade check is a
+        handful of lookups against precomputed aggregates instead of a recomputation.
+        Args:
+            capital (float): Starting equity in quote currency (set later with set_capital if unknown).
+            max_positions (int): Maximum symbols with an open position.
+            max_drawdown (float): Drawdown from peak equity at which only risk-reducing orders pass.
+            max_exposure (float): Maximum gross notional as a multiple of equity.
+            max_asset_exposure (float): Maximum notional in one symbol as a multiple of equity.
+            allow_short (bool): Whether a SELL may open a short (False for spot: sells only reduce a long).
+        """
+        self.max_positions = max_positions
+        self.max_drawdown = max_drawdown
+        self.max_exposure = max_exposure
+        self.max_asset_exposure = max_asset_exposure
+        self.allow_short = allow_short
+        self.positions = {}  # symbol -> [signed quantity, average entry price, last price]
+        self.notional = {}  # symbol -> |quantity| * last price
+        self.prices = {}  # symbol -> last seen price (also for symbols without a position)
+        self.capital = 0.0
+        self.exposure = 0.0  # Gross notional across symbols
+        self.open_positions = 0
+        self.realized_pnl = 0.0
+        self.unrealized_pnl = 0.0
+        self.peak_equity = 0.0
+        self.reservations = {}  # client ID -> [symbol, signed quantity not yet filled, price]
+        self.pending = defaultdict(float)  # symbol -> signed quantity reserved by unfilled orders
+        self.reserved_exposure = 0.0  # Notional reserved by unfilled orders
+        self.lock = threading.Lock()
+        if capital is not None:
+            self.set_capital(capital)
+
+    # ------------------------------------------------------------------
+    # 📊 Aggregates
+    # ------------------------------------------------------------------
+    @property
+    def equity(self):
+        return self.capital + self.realized_pnl + self.unrealized_pnl
+
+    @property
+    def drawdown(self):
+        return 1 - self.equity / self.peak_equity if self.peak_equity > 0 else 0.0
+
+    def set_capital(self, capital):
+        """Sets the starting equity (e.g. from the first balance snapshot)."""
+        with self.lock:
+            self.capital = float(capital)
+            self.peak_equity = max(self.peak_equity, self.equity)
+
+    def _mark(self, symbol, position, price):
+        """Re-marks one symbol and applies the change to the aggregates (caller holds the lock)."""
+        quantity, entry, last = position
+        old_unrealized = quantity * (last - entry)
+        old_notional = self.notional.get(symbol, 0.0)
+        position[2] = price
+        new_notional = abs(quantity) * price
+        self.unrealized_pnl += quantity * (price - entry) - old_unrealized
+        self.exposure += new_notional - old_notional
+        self.notional[symbol] = new_notional
+        equity = self.equity
+        if equity > self.peak_equity:
+            self.peak_equity = equity
+
+    # ------------------------------------------------------------------
+    # 📥 Updates
+    # ------------------------------------------------------------------
+    def on_price(self, symbol, price):
+        """Price tick: re-marks the symbol's position in O(1)."""
+        with self.lock:
+            self.prices[symbol] = float(price)
+            position = self.positions.get(symbol)
+            if position is not None:
+                self._mark(symbol, position, float(price))
+
+    def on_fill(self, symbol, side, quantity, price, fee=0.0, client_id=None):
+        """
+        Applies a fill: updates the position, realized PnL and every aggregate in O(1).
+        Args:
+            symbol (str): Trading pair.
+            side (str): "BUY" or "SELL".
+            quantity (float): Filled quantity.
+            price (float): Fill price.
+            fee (float): Fee in quote currency.
+            client_id (str): Order whose reservation the fill converts into a position.
+        """
+        signed = quantity if side.upper() == "BUY" else -quantity
+        price = float(price)
+        with self.lock:
+            if client_id is not None:
+                self._unreserve(client_id, quantity)
+            self.prices[symbol] = price
+            position = self.positions.get(symbol)
+            if signed < 0 and not self.allow_short:  # Spot: sells beyond the tracked long are untracked inventory
+                signed = -min(quantity, max(position[0], 0.0) if position is not None else 0.0)
+                if signed == 0:
+                    Logger.warning(f"⚠️ Spot SELL fill on {symbol} without a tracked position; not booked as a short.")
+                    return
+            if position is None:
+                position = self.positions[symbol] = [0.0, price, price]
+            self._mark(symbol, position, price)
+            held, entry, _ = position
+            was_open = held != 0
+
+            if held == 0 or (held > 0) == (signed > 0):  # Opening or adding
+                total = held + signed
+                position[1] = (held * entry + signed * price) / total
+            else:  # Reducing, closing or flipping
+                closed = min(abs(signed), abs(held))
+                self.realized_pnl += closed * (price - entry) * (1 if held > 0 else -1)
+                total = held + signed
+                if total != 0 and (total > 0) != (held > 0):
+                    position[1] = price  # Flipped – the remainder opens at the fill price
+            self.unrealized_pnl -= held * (price - entry)
+            position[0] = total if abs(total) > 1e-12 else 0.0
+            self.unrealized_pnl += position[0] * (price - position[1])
+            self.realized_pnl -= fee
+
+            self.open_positions += (position[0] != 0) - was_open
+            new_notional = abs(position[0]) * price
+            self.exposure += new_notional - self.notional.get(symbol, 0.0)
+            self.notional[symbol] = new_notional
+            if self.equity > self.peak_equity:
+                self.peak_equity = self.equity
+
+    def on_order_update(self, record, previous, delta):
+        """
+        OrderStore listener (store.subscribe): feeds newly filled quantity into on_fill and releases what is
+        left of an order's reservation once it is filled, canceled or rejected.
+        """
+        if delta > 0:
+            price = record.average or record.price or self.prices.get(record.symbol)
+            if price is None:
+                Logger.warning(f"⚠️ Fill on {record.symbol} without a price; portfolio risk not updated.")
+                self.release(record.client_id)
+                return
+            self.on_fill(record.symbol, record.side, delta, price, client_id=record.client_id)
+        if record.state in TERMINAL_STATES:
+            self.release(record.client_id)
+
+    # ------------------------------------------------------------------
+    # 🔒 Reservations (submitted but unfilled orders)
+    # ------------------------------------------------------------------
+    def _unreserve(self, client_id, quantity=None):
+        """Takes quantity (all of it if None) off an order's reservation (caller holds the lock)."""
+        reservation = self.reservations.get(client_id)
+        if reservation is None:
+            return
+        symbol, signed, price = reservation
+        taken = abs(signed) if quantity is None else min(abs(signed), quantity)
+        taken_signed = taken if signed > 0 else -taken
+        reservation[1] = signed - taken_signed
+        self.pending[symbol] -= taken_signed
+        self.reserved_exposure -= taken * price
+        if abs(reservation[1]) <= 1e-12:
+            del self.reservations[client_id]
+        if abs(self.pending[symbol]) <= 1e-12:
+            del self.pending[symbol]
+            if not self.reservations:
+                self.reserved_exposure = 0.0  # Drop float residue once nothing is reserved
+
+    def release(self, client_id):
+        """Frees an order's remaining reservation (rejected, canceled or never sent)."""
+        if client_id is None:
+            return
+        with self.lock:
+            self._unreserve(client_id)
+
+    # ------------------------------------------------------------------
+    # 🛡️ Pre-trade check
+    # ------------------------------------------------------------------
+    def check(self, symbol, side, quantity, price, reserve=None):
+        """
+        Pre-trade check against the portfolio limits, counting orders that are submitted but not yet filled.
+        Orders that only reduce a position always pass.
+        Args:
+            symbol (str): Trading pair.
+            side (str): "BUY" or "SELL".
+            quantity (float): Order size.
+            price (float): Expected fill price.
+            reserve (str): Client ID to reserve the order's exposure & position slot under if it passes
+                (checked & reserved atomically, so concurrent orders can't all pass against the same totals).
+        Returns:
+            dict: {"valid": bool, "reason": str} (same shape as validate_trade's rejections).
+        """
+        signed = quantity if side.upper() == "BUY" else -quantity
+        if signed < 0 and not self.allow_short:
+            return {"valid": True, "reason": "Spot SELL only reduces holdings"}
+        with self.lock:
+            position = self.positions.get(symbol)
+            held = (position[0] if position is not None else 0.0) + self.pending.get(symbol, 0.0)
+            after = held + signed
+            if abs(after) <= abs(held) and (after == 0 or (after > 0) == (held > 0)):
+                return {"valid": True, "reason": "Reduces exposure"}
+
+            if self.drawdown >= self.max_drawdown:
+                return {"valid": False, "reason": f"Drawdown {self.drawdown:.2%} at MAX_DRAWDOWN limit"}
+            slots = self.open_positions + sum(1 for pending_symbol in self.pending
+                                              if not self.positions.get(pending_symbol, [0.0])[0])
+            if held == 0 and slots >= self.max_positions:
+                return {"valid": False, "reason": f"{slots} positions open or pending (MAX_CONCURRENT_POSITIONS)"}
+
+            equity = self.equity
+            added = (abs(after) - abs(held)) * price
+            if equity > 0:
+                if self.exposure + self.reserved_exposure + added > self.max_exposure * equity:
+                    return {"valid": False, "reason": "Portfolio exposure limit reached"}
+                if abs(after) * price > self.max_asset_exposure * equity:
+                    return {"valid": False, "reason": f"Exposure limit reached for {symbol}"}
+
+            if reserve is not None:
+                self.reservations[reserve] = [symbol, signed, float(price)]
+                self.pending[symbol] += signed
+                self.reserved_exposure += quantity * price
+            return {"valid": True, "reason": "Within portfolio limits"}
+
+    def summary(self):
+        """Current aggregates (for logs & the dashboard)."""
+        return {"equity": self.equity, "peak_equity": self.peak_equity, "drawdown": self.drawdown,
+                "exposure": self.exposure, "open_positions": self.open_positions, "realized_pnl": self.realized_pnl,
+                "unrealized_pnl": self.unrealized_pnl, "notional": dict(self.notional),
+                "reserved_exposure": self.reserved_exposure, "pending_orders": len(self.reservations)}
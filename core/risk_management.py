@@ -3,9 +3,10 @@
 # 🛡️ RISK MANAGEMENT – PROTECTS TRADING STRATEGY 🛡️
 # ==================================================
 
-from config import STOP_LOSS_PERCENT, TAKE_PROFIT_PERCENT, RISK_PER_TRADE, ORDER_MINIMUM_VALUE
+from config import PAIR, STOP_LOSS_PERCENT, TAKE_PROFIT_PERCENT, RISK_PER_TRADE, ORDER_MINIMUM_VALUE
 from custom_logging.logger import Logger
 
+import uuid
 import pandas as pd
 
 def calculate_risk_levels(entry_price, trade_type):
@@ -27,15 +28,18 @@ def calculate_risk_levels(entry_price, trade_type):
     Logger.info(f"📊 Risk Levels | {trade_type}: Stop-Loss: {stop_loss:.6f}, Take-Profit: {take_profit:.6f}")
     return {"stop_loss": stop_loss, "take_profit": take_profit}
 
-def validate_trade(trade_signal, market_data, balance):
+def validate_trade(trade_signal, market_data, balance, portfolio_risk=None, symbol=PAIR):
     """
     Validates a trade before execution, ensuring proper risk management.
     Args:
         trade_signal (str): "BUY" or "SELL".
         market_data (DataFrame): Market data for analysis.
         balance (dict): Available balance in USDT & assets.
+        portfolio_risk (PortfolioRiskEngine): Portfolio limits (position count, exposure, drawdown) to enforce.
+        symbol (str): Traded pair (used by the portfolio check).
     Returns:
-        dict: Trade validation result.
+        dict: Trade validation result. With portfolio_risk, a valid result carries the "client_id" its exposure
+            is reserved under – submit the order with it, or release it (portfolio_risk.release) if not sent.
     """
     if trade_signal not in ["BUY", "SELL"]:
         return {"valid": False, "reason": "Invalid trade signal"}
@@ -65,6 +69,15 @@ def validate_trade(trade_signal, market_data, balance):
         Logger.warning("⚠️ Trade size below exchange minimum order value. Trade skipped.")
         return {"valid": False, "reason": "Trade size too small"}
 
+    # ✅ Portfolio Limits (O(1) against the engine's running aggregates)
+    client_id = None
+    if portfolio_risk is not None:
+        client_id = uuid.uuid4().hex[:16]
+        portfolio_check = portfolio_risk.check(symbol, trade_signal, position_size, latest_price, reserve=client_id)
+        if not portfolio_check["valid"]:
+            Logger.warning(f"⚠️ Trade not valid: {portfolio_check['reason']}.")
+            return {"valid": False, "reason": portfolio_check["reason"]}
+
     # ✅ Apply Risk Management
     risk_levels = calculate_risk_levels(latest_price, trade_signal)
 
@@ -74,7 +87,8 @@ def validate_trade(trade_signal, market_data, balance):
         "position_size": position_size,
         "entry_price": latest_price,
         "stop_loss": risk_levels['stop_loss'],
-        "take_profit": risk_levels['take_profit']
+        "take_profit": risk_levels['take_profit'],
+        "client_id": client_id,
     }
 
 def apply_risk_management(trade_signal, market_data, balance):
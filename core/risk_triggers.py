@@ -0,0 +1,148 @@
+# risk_triggers.py
+# ==================================================
+# 🎯 RISK TRIGGERS – VECTORIZED STOP-LOSS & TAKE-PROFIT CHECKS 🎯
+# ==================================================
+
+import threading
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from core.columnar_book import ColumnarBook
+from core.risk_management import calculate_risk_levels
+from custom_logging.logger import Logger
+from config import RISK_TRIGGER_CAPACITY, RISK_EXIT_WORKERS
+
+STOP_LOSS, TAKE_PROFIT = "stop_loss", "take_profit"
+
+
+class RiskTriggerEngine:
+    def __init__(self, capacity=RISK_TRIGGER_CAPACITY, max_workers=RISK_EXIT_WORKERS):
+        """
+        Stop-loss & take-profit levels of every open position in NumPy arrays, so one price snapshot is
+        checked against all triggers in a single vectorized comparison.
+        Args:
+            capacity (int): Initial rows preallocated (doubles when full).
+            max_workers (int): Exit orders dispatched concurrently.
+        """
+        self.book = ColumnarBook({
+            "symbol": np.int32,
+            "direction": np.int8,  # +1 long (BUY), -1 short (SELL)
+            "quantity": np.float64,
+            "entry": np.float64,
+            "stop": np.float64,
+            "target": np.float64,
+        }, capacity)
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="exit")
+
+    def __len__(self):
+        return len(self.book)
+
+    def __contains__(self, position_id):
+        return position_id in self.book
+
+    def add(self, position_id, symbol, side, quantity, entry_price, stop_loss=None, take_profit=None):
+        """
+        Registers (or replaces) a position's triggers.
+        Args:
+            position_id (str): Position / order ID.
+            symbol (str): Trading pair.
+            side (str): "BUY" (long) or "SELL" (short).
+            quantity (float): Position size.
+            entry_price (float): Entry price.
+            stop_loss (float): Stop level (default from STOP_LOSS_PERCENT).
+            take_profit (float): Target level (default from TAKE_PROFIT_PERCENT).
+        """
+        side = side.upper()
+        if stop_loss is None or take_profit is None:
+            levels = calculate_risk_levels(entry_price, side)
+            stop_loss = levels["stop_loss"] if stop_loss is None else stop_loss
+            take_profit = levels["take_profit"] if take_profit is None else take_profit
+
+        with self.lock:
+            self.book.set(position_id, {"symbol": symbol, "direction": 1 if side == "BUY" else -1,
+                                        "quantity": quantity, "entry": entry_price, "stop": stop_loss,
+                                        "target": take_profit})
+
+    def update_quantity(self, position_id, quantity):
+        """Sets a position's size (e.g. after a partial fill)."""
+        with self.lock:
+            row = self.book.rows.get(position_id)
+            if row is not None:
+                self.book.columns["quantity"][row] = quantity
+
+    def remove(self, position_id):
+        """Drops a position in O(1) (swap-remove)."""
+        with self.lock:
+            return self.book.remove(position_id)
+
+    def price_vector(self, tickers):
+        """
+        Updates the per-symbol price vector from a bulk ticker snapshot.
+        Args:
+            tickers (dict): {symbol: {"last": price}} or {symbol: price}.
+        Returns:
+            np.array: Latest price per symbol index (NaN where unknown).
+        """
+        return self.book.update_prices(tickers)
+
+    def evaluate(self, prices=None):
+        """
+        Checks every trigger against the current prices in one vectorized pass.
+        Args:
+            prices (np.array): Price per symbol index (default: the latest price vector).
+        Returns:
+            list: (position_id, STOP_LOSS / TAKE_PROFIT, price) for each breached position.
+        """
+        with self.lock:
+            if not self.book.count:
+                return []
+            prices = self.book.prices if prices is None else prices
+            a = self.book.active()
+            price = prices[a["symbol"]]
+            # ✅ Direction-signed distances: breach when the price has crossed the level against / for the position
+            stop_hit = a["direction"] * (price - a["stop"]) <= 0
+            target_hit = a["direction"] * (price - a["target"]) >= 0
+            hit = np.flatnonzero(stop_hit | target_hit)  # NaN prices compare False
+            return [(self.book.ids[row], STOP_LOSS if stop_hit[row] else TAKE_PROFIT, float(price[row])) for row in hit]
+
+    def on_price(self, symbol, price):
+        """
+        Streaming update for one symbol.
+        Returns:
+            list: Breaches among that symbol's positions.
+        """
+        index = self.book.symbol_index.get(symbol)
+        if index is None:
+            return []
+        self.book.prices[index] = price
+        return [breach for breach in self.evaluate() if self.book.columns["symbol"][self.book.rows[breach[0]]] == index]
+
+    def position(self, position_id):
+        """Returns a position's trigger row as a dict (None if unknown)."""
+        row = self.book.rows.get(position_id)
+        if row is None:
+            return None
+        values = {name: column[row].item() for name, column in self.book.columns.items()}
+        values["symbol"] = self.book.symbols[values["symbol"]]
+        values["side"] = "BUY" if values.pop("direction") > 0 else "SELL"
+        return values
+
+    def dispatch(self, breaches, exit_fn):
+        """
+        Sends exits for breached positions concurrently. Positions are removed first so a slow exit
+        is never dispatched twice.
+        Args:
+            breaches (list): evaluate() output.
+            exit_fn (callable): exit_fn(position, reason, price) with position as returned by position().
+        Returns:
+            list: Futures of the exit calls.
+        """
+        futures = []
+        for position_id, reason, price in breaches:
+            position = self.position(position_id)
+            if position is None or not self.remove(position_id):
+                continue
+            position["id"] = position_id
+            Logger.warning(f"🚨 {reason} hit for {position_id} ({position['symbol']}) at {price}. Exiting...")
+            futures.append(self.executor.submit(exit_fn, position, reason, price))
+        return futures
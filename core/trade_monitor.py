@@ -6,23 +6,35 @@
 import time
 import logging
 from core.exchange_connector import ExchangeConnector
-from core.risk_management import apply_risk_management
-from config import TRADE_MONITOR_INTERVAL, ENABLE_SIMULATION_MODE
+from core.risk_triggers import RiskTriggerEngine, TAKE_PROFIT
+from core.order_store import OrderStore
+from config import TRADE_MONITOR_INTERVAL, ENABLE_SIMULATION_MODE, ALLOW_SHORT
 
 class TradeMonitor:
-    def __init__(self):
-        """Initializes trade monitoring system."""
-        self.exchange = ExchangeConnector()
+    def __init__(self, exchange=None, store=None):
+        """
+        Initializes trade monitoring system. Every fill in the order store opens (or grows) a position whose
+        stop-loss & take-profit levels live in a RiskTriggerEngine until the position is exited.
+        Args:
+            exchange (ExchangeConnector): Exchange connection (a new one if None).
+            store (OrderStore): Shared order store (fed by OrderManager); a private one if None.
+        """
+        self.exchange = exchange or ExchangeConnector()
+        self.store = store or OrderStore()
+        self.triggers = RiskTriggerEngine()
+        self.exit_orders = set()  # Exchange IDs of our own exit orders (their fills close, not open, positions)
+        self.store.subscribe(self._track)
         logging.basicConfig(level=logging.INFO)
 
     def get_open_trades(self):
         """
-        Fetches all open trades from the exchange.
+        Returns open trades from the order store; the exchange is only polled every ORDER_RECONCILE_INTERVAL.
         Returns:
             list: List of open trades.
         """
         try:
-            open_orders = self.exchange.fetch_open_orders()
+            self.store.maybe_reconcile(self.exchange)
+            open_orders = [record.to_dict() for record in self.store.open_orders()]
             if open_orders:
                 logging.info(f"📊 Found {len(open_orders)} open trades.")
             else:
@@ -32,41 +44,117 @@ class TradeMonitor:
             logging.error(f"❌ Error fetching open trades: {e}")
             return []
 
-    def check_trade_health(self):
+    def _track(self, record, previous=None, delta=0.0):
         """
-        Monitors open trades and applies stop-loss & take-profit dynamically.
+        OrderStore listener: a fill (delta > 0) opens or grows the order's position at the fill price & filled
+        quantity. Resting orders carry no position, so they are never tracked (or cancelled) here.
         """
-        open_trades = self.get_open_trades()
-        if not open_trades:
+        if delta <= 0 or record.exchange_id in self.exit_orders:
+            return
+        price = record.average or record.price or self._last_price(record.symbol)
+        if not price:
+            logging.warning(f"⚠️ Fill on {record.symbol} without a price; no stop-loss / take-profit set.")
             return
+        side = record.side.upper()
+        if side == "SELL" and not ALLOW_SHORT:  # Spot: a sell reduces held positions instead of opening a short
+            self._reduce(record.symbol, delta)
+            return
+
+        position = self.triggers.position(record.client_id)
+        quantity, entry = delta, float(price)
+        if position is not None:
+            quantity = position["quantity"] + delta
+            entry = record.average or (position["quantity"] * position["entry"] + delta * price) / quantity
+        self.triggers.add(record.client_id, record.symbol, side, quantity, float(entry))
 
-        for trade in open_trades:
-            trade_id = trade["id"]
-            symbol = trade["symbol"]
-            entry_price = float(trade["price"])
-            trade_type = trade["side"]
-
-            # Apply risk management to get stop-loss & take-profit
-            risk_data = apply_risk_management(entry_price, trade_type)
-            stop_loss = risk_data["stop_loss"]
-            take_profit = risk_data["take_profit"]
-
-            # Get current market price
-            try:
-                ticker = self.exchange.fetch_ticker(symbol)
-                current_price = float(ticker["last"])
-            except Exception as e:
-                logging.error(f"❌ Error fetching current price for {symbol}: {e}")
+    def _reduce(self, symbol, quantity):
+        """Takes a sold quantity off the symbol's long positions, oldest first."""
+        for position_id in list(self.triggers.book.ids):
+            position = self.triggers.position(position_id)
+            if quantity <= 0:
+                break
+            if position is None or position["symbol"] != symbol or position["side"] != "BUY":
                 continue
+            if position["quantity"] <= quantity + 1e-12:
+                self.triggers.remove(position_id)
+            else:
+                self.triggers.update_quantity(position_id, position["quantity"] - quantity)
+            quantity -= position["quantity"]
+
+    def _last_price(self, symbol):
+        """Latest known price of a symbol (a ticker request if it has none yet)."""
+        index = self.triggers.book.symbol_index.get(symbol)
+        if index is not None and self.triggers.book.prices[index] == self.triggers.book.prices[index]:  # Not NaN
+            return float(self.triggers.book.prices[index])
+        try:
+            return (self.exchange.fetch_tickers([symbol]) or {}).get(symbol, {}).get("last")
+        except Exception as e:
+            logging.error(f"❌ Error fetching price for {symbol}: {e}")
+            return None
+
+    def check_trade_health(self):
+        """
+        Monitors open positions and applies stop-loss & take-profit dynamically: one bulk ticker request per tick,
+        every trigger checked in one vectorized comparison, breached positions exited concurrently.
+        Returns:
+            list: (position ID, trigger, price) for each position exited this tick.
+        """
+        try:
+            self.store.maybe_reconcile(self.exchange)  # Fills it resolves reach _track through the store
+        except Exception as e:
+            logging.error(f"❌ Error reconciling open trades: {e}")
+        if not len(self.triggers):
+            return []
+
+        try:
+            tickers = self.exchange.fetch_tickers(self.triggers.book.symbols)
+        except Exception as e:
+            logging.error(f"❌ Error fetching current prices: {e}")
+            return []
+        self.triggers.price_vector(tickers)
+        breaches = self.triggers.evaluate()
+        self.triggers.dispatch(breaches, self._exit)
+        return breaches
+
+    def on_price(self, symbol, price):
+        """
+        Streaming price update (e.g. from a websocket): checks only this symbol's triggers.
+        """
+        breaches = self.triggers.on_price(symbol, price)
+        self.triggers.dispatch(breaches, self._exit)
+        return breaches
 
-            # 🚨 Stop-Loss Trigger
-            if trade_type == "BUY" and current_price <= stop_loss:
-                logging.warning(f"🚨 Stop-loss hit for {trade_id} ({symbol}). Closing trade...")
-                self.close_trade(trade_id)
+    def _exit(self, position, reason, price):
+        """Exit action run on the trigger engine's pool: closes the position with an opposite market order."""
+        if reason == TAKE_PROFIT:
+            logging.info(f"💰 Take-profit reached for {position['id']} ({position['symbol']}) at {price}.")
+        self.close_position(position)
 
-            elif trade_type == "SELL" and current_price >= take_profit:
-                logging.info(f"💰 Take-profit reached for {trade_id} ({symbol}). Closing trade...")
-                self.close_trade(trade_id)
+    def close_position(self, position):
+        """
+        Closes a position with a market order for its quantity.
+        Args:
+            position (dict): Trigger row as passed to _exit (id, symbol, side & quantity).
+        Returns:
+            dict or None: Exchange response.
+        """
+        if ENABLE_SIMULATION_MODE:
+            logging.info(f"🛠️ [SIMULATION] Closing position {position['id']}.")
+            return None
+
+        try:
+            send = self.exchange.create_market_sell_order if position["side"] == "BUY" else self.exchange.create_market_buy_order
+            order = send(position["symbol"], position["quantity"])
+            if order:
+                data = order.get("data") if isinstance(order.get("data"), dict) else order
+                exit_id = data.get("orderId") or data.get("id")
+                if exit_id is not None:
+                    self.exit_orders.add(str(exit_id))
+            logging.info(f"✅ Position {position['id']} closed: {order}")
+            return order
+        except Exception as e:
+            logging.error(f"❌ Error Closing Position {position['id']}: {e}")
+            return None
 
     def close_trade(self, trade_id):
         """
@@ -81,6 +169,8 @@ class TradeMonitor:
         try:
             logging.info(f"🔄 Closing Trade ID: {trade_id}...")
             order = self.exchange.cancel_order(trade_id)
+            if order:
+                self.store.on_execution_report({"status": "CANCELED", **order, "id": trade_id})
             logging.info(f"✅ Trade Closed: {order}")
         except Exception as e:
             logging.error(f"❌ Error Closing Trade: {e}")
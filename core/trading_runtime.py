@@ -0,0 +1,280 @@
+# trading_runtime.py
+# ==================================================
+# ⚡ TRADING RUNTIME – EVENT-DRIVEN STAGED PIPELINE ⚡
+# ==================================================
+
+import json
+import os
+import time
+import queue
+import threading
+from collections import deque
+import numpy as np
+import pandas as pd
+from custom_logging.logger import Logger
+from config import (
+    PAIR, CANDLE_INTERVAL, CANDLE_POLL_INTERVAL, CANDLE_HISTORY, STAGE_QUEUE_SIZE, STAGE_LATENCY_WINDOW,
+    RUNTIME_METRICS_INTERVAL, RUNTIME_METRICS_FILE
+)
+
+STOP = object()  # Sentinel that shuts a stage down and is passed on to the next one
+
+
+class LatencyStats:
+    def __init__(self, window=STAGE_LATENCY_WINDOW):
+        """Rolling latency samples (seconds) with summary statistics."""
+        self.samples = deque(maxlen=window)
+        self.count = 0
+
+    def add(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+
+    def summary(self):
+        """Returns count, last, mean, p50 & p99 in milliseconds."""
+        if not self.samples:
+            return {"count": 0}
+        values = np.fromiter(self.samples, dtype=float) * 1000
+        return {"count": self.count, "last_ms": round(float(values[-1]), 3), "mean_ms": round(float(values.mean()), 3),
+                "p50_ms": round(float(np.percentile(values, 50)), 3), "p99_ms": round(float(np.percentile(values, 99)), 3)}
+
+
+class Stage:
+    def __init__(self, name, fn, maxsize=STAGE_QUEUE_SIZE, conflate=False):
+        """
+        One pipeline stage: a worker thread that takes events from its bounded inbox, runs fn and hands the
+        result to the next stage.
+        Args:
+            name (str): Stage name (used in metrics).
+            fn (callable): fn(event) -> event for the next stage, or None to end the cycle here.
+            maxsize (int): Inbox capacity (0 = unbounded, for stages fed by threads that must never block).
+            conflate (bool): When full, drop the oldest queued event instead of blocking the producer
+                (for stages where only the freshest data matters).
+        """
+        self.name = name
+        self.fn = fn
+        self.inbox = queue.Queue(maxsize=maxsize)
+        self.conflate = conflate
+        self.next = None
+        self.stopped = False  # Set once STOP is queued; later events are dropped, never queued to a dead stage
+        self.latency = LatencyStats()
+        self.stats = {"processed": 0, "passed": 0, "dropped": 0, "errors": 0}
+        self.thread = threading.Thread(target=self._run, name=f"stage-{name}", daemon=True)
+
+    def put(self, event):
+        """Queues an event (blocking on a full inbox unless the stage conflates; dropped once stopped)."""
+        if event is STOP:
+            self.stopped = True
+            self.inbox.put(event)
+            return
+        if self.stopped:
+            self.stats["dropped"] += 1
+            return
+        if not self.conflate:
+            self.inbox.put(event)
+            return
+        while True:
+            try:
+                self.inbox.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self.inbox.get_nowait()
+                    self.stats["dropped"] += 1
+                except queue.Empty:
+                    pass
+
+    def _run(self):
+        while True:
+            event = self.inbox.get()
+            if event is STOP:
+                if self.next is not None:
+                    self.next.put(STOP)
+                return
+            start = time.perf_counter()
+            try:
+                result = self.fn(event)
+            except Exception as e:
+                self.stats["errors"] += 1
+                Logger.error(f"❌ Stage {self.name} failed: {e}")
+                result = None
+            elapsed = time.perf_counter() - start
+            self.latency.add(elapsed)
+            self.stats["processed"] += 1
+            if isinstance(event, dict):
+                event.setdefault("timings", {})[self.name] = elapsed
+            if result is not None and self.next is not None:
+                self.stats["passed"] += 1
+                self.next.put(result)
+
+    def metrics(self):
+        return {"queue_depth": self.inbox.qsize(), "queue_capacity": self.inbox.maxsize, **self.stats,
+                "latency": self.latency.summary()}
+
+
+class CandleFeed:
+    def __init__(self, exchange, pair=PAIR, interval=CANDLE_INTERVAL, poll_interval=CANDLE_POLL_INTERVAL,
+                 history=CANDLE_HISTORY):
+        """
+        Emits the candle history each time a new candle closes. Keeps a rolling window and only requests
+        the last two candles per poll; polling starts when the next close is due, not on a fixed timer.
+        Args:
+            exchange: ExchangeConnector (fetch_market_data(pair, limit)).
+            pair (str): Traded pair.
+            interval (float): Candle length in seconds.
+            poll_interval (float): Seconds between polls once a close is due.
+            history (int): Candles kept in the window.
+        """
+        self.exchange = exchange
+        self.pair = pair
+        self.interval = interval
+        self.poll_interval = poll_interval
+        self.history = history
+        self.candles = None
+        self.last_closed = None
+        self.stop_event = threading.Event()
+
+    def _merge(self, df):
+        """Merges newly fetched candles into the rolling window (later rows replace earlier ones)."""
+        df = df.copy()
+        df[["open", "high", "low", "close", "volume"]] = df[["open", "high", "low", "close", "volume"]].astype(float)
+        if self.candles is not None:
+            df = pd.concat([self.candles, df]).drop_duplicates("timestamp", keep="last")
+        self.candles = df.sort_values("timestamp").tail(self.history).reset_index(drop=True)
+
+    def poll(self):
+        """
+        Fetches the latest candles.
+        Returns:
+            DataFrame or None: The candle window if a candle closed since the last call.
+        """
+        df = self.exchange.fetch_market_data(self.pair, limit=self.history if self.candles is None else 2)
+        if df is None or df.empty:
+            return None
+        self._merge(df)
+        if len(self.candles) < 2:
+            return None
+        closed = self.candles["timestamp"].iloc[-2]  # The last row is the still-forming candle
+        if self.last_closed is not None and closed <= self.last_closed:
+            return None
+        self.last_closed = closed
+        return self.candles
+
+    def wait_for_close(self):
+        """Sleeps until the forming candle is due to close (at most one interval)."""
+        if self.candles is None or self.candles.empty:
+            return
+        forming = self.candles["timestamp"].iloc[-1]
+        due = pd.Timestamp(forming).timestamp() + self.interval
+        self.stop_event.wait(min(max(0.0, due - time.time()), self.interval))
+
+    def run(self, emit):
+        """
+        Calls emit(market_data, closed_at) for every closed candle until stop() is called.
+        """
+        while not self.stop_event.is_set():
+            try:
+                market_data = self.poll()
+            except Exception as e:
+                Logger.error(f"❌ Candle poll failed for {self.pair}: {e}")
+                market_data = None
+            if market_data is not None:
+                emit(market_data, time.time())
+                self.wait_for_close()
+            else:
+                self.stop_event.wait(self.poll_interval)
+
+    def stop(self):
+        self.stop_event.set()
+
+
+class TradingRuntime:
+    def __init__(self, feed, stages, metrics_interval=RUNTIME_METRICS_INTERVAL, metrics_file=RUNTIME_METRICS_FILE,
+                 order_store=None, exchange=None, metric_sources=None):
+        """
+        Chains stages behind a candle feed. Each closed candle starts one cycle event that flows through the
+        stages while the feed waits for the next candle, so slow I/O in one stage overlaps with the others.
+        Args:
+            feed (CandleFeed): Cycle trigger.
+            stages (list): Stages in order; each one's output goes to the next one's inbox.
+            metrics_interval (float): Seconds between metrics logs / file writes (None disables).
+            metrics_file (str): JSON file the metrics are written to.
+            order_store (OrderStore): Reconciled with the exchange every reconcile_interval, so orders the
+                pipeline left ACKNOWLEDGED reach their fills (and the store's listeners) – None disables.
+            exchange (ExchangeConnector): Exchange the order store is reconciled against.
+            metric_sources (dict): Extra name -> callable returning a metrics dict (e.g. prediction-cache stats),
+                included in metrics() and the periodic report.
+        """
+        self.feed = feed
+        self.stages = stages
+        self.metrics_interval = metrics_interval
+        self.metrics_file = metrics_file
+        self.order_store = order_store
+        self.exchange = exchange
+        self.metric_sources = metric_sources or {}
+        for stage, following in zip(stages, stages[1:]):
+            stage.next = following
+        self.cycle_latency = LatencyStats()  # Candle close seen -> order submitted
+        self.cycles = 0
+        self.feed_thread = threading.Thread(target=self.feed.run, args=(self.emit,), name="candle-feed", daemon=True)
+        self.metrics_thread = threading.Thread(target=self._report, name="runtime-metrics", daemon=True)
+        self.reconcile_thread = threading.Thread(target=self._reconcile, name="order-reconcile", daemon=True)
+
+    def stage(self, name):
+        return next(stage for stage in self.stages if stage.name == name)
+
+    def emit(self, market_data, closed_at):
+        """Starts a cycle (also usable directly by a streaming candle source)."""
+        self.cycles += 1
+        self.stages[0].put({"cycle": self.cycles, "market_data": market_data, "closed_at": closed_at})
+
+    def record_submission(self, event):
+        """Called by the execution stage once an order is handed to the exchange pipeline."""
+        self.cycle_latency.add(time.time() - event["closed_at"])
+
+    def start(self):
+        for stage in self.stages:
+            stage.thread.start()
+        self.feed_thread.start()
+        if self.metrics_interval:
+            self.metrics_thread.start()
+        if self.order_store is not None and self.exchange is not None:
+            self.reconcile_thread.start()
+
+    def stop(self, timeout=5):
+        """Stops the feed and drains every stage in order."""
+        self.feed.stop()
+        self.stages[0].put(STOP)
+        for stage in self.stages:
+            stage.thread.join(timeout)
+
+    def metrics(self):
+        """
+        Returns:
+            dict: Per-stage queue depth, counters & latency, plus candle-to-order latency.
+        """
+        return {"cycles": self.cycles, "signal_to_order": self.cycle_latency.summary(),
+                "stages": {stage.name: stage.metrics() for stage in self.stages},
+                **{name: source() for name, source in self.metric_sources.items()}}
+
+    def _report(self):
+        while not self.feed.stop_event.wait(self.metrics_interval):
+            metrics = self.metrics()
+            depths = ", ".join(f"{name}={m['queue_depth']}" for name, m in metrics["stages"].items())
+            extra = "".join(f" | {name}: {metrics[name]}" for name in self.metric_sources)
+            Logger.info(f"📈 Runtime | cycles={metrics['cycles']} | queues: {depths} | "
+                        f"signal→order: {metrics['signal_to_order']}{extra}")
+            try:
+                os.makedirs(os.path.dirname(self.metrics_file) or ".", exist_ok=True)
+                with open(self.metrics_file, "w") as f:
+                    json.dump({"timestamp": time.time(), **metrics}, f, indent=2, default=str)
+            except OSError as e:
+                Logger.warning(f"⚠️ Could not write runtime metrics: {e}")
+
+    def _reconcile(self):
+        """Periodic order reconciliation – resolved fills reach the store's listeners (e.g. portfolio risk)."""
+        while not self.feed.stop_event.wait(self.order_store.reconcile_interval):
+            try:
+                self.order_store.maybe_reconcile(self.exchange)
+            except Exception as e:
+                Logger.error(f"❌ Order reconciliation failed: {e}")
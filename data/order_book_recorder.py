@@ -0,0 +1,238 @@
+# order_book_recorder.py
+# ==================================================
+# 🎙️ ORDER BOOK RECORDER – COMPACT DEPTH SNAPSHOT & DIFF CAPTURE 🎙️
+# ==================================================
+
+import os
+import time
+import struct
+import numpy as np
+from custom_logging.logger import Logger
+from config import PAIR, ORDER_BOOK_DEPTH, ORDER_BOOK_RECORD_INTERVAL, ORDER_BOOK_KEYFRAME_INTERVAL
+
+# ✅ File layout (little-endian):
+#   header  = MAGIC, uint16 depth, uint16 symbol length, symbol (utf-8)
+#   record  = float64 timestamp, uint8 kind, uint32 level count, then `count` LEVEL_DTYPE entries
+# A snapshot record lists every level; a diff record lists only changed levels (quantity 0 = level removed).
+MAGIC = b"OBK1"
+HEADER = struct.Struct("<4sHH")
+RECORD = struct.Struct("<dBI")
+SNAPSHOT, DIFF = 0, 1
+BID, ASK = 1, -1
+LEVEL_DTYPE = np.dtype([("side", "i1"), ("price", "<f8"), ("quantity", "<f8")])
+
+
+def book_to_levels(order_book, depth=ORDER_BOOK_DEPTH):
+    """
+    Converts a fetch_order_book result to {(side, price): quantity}.
+    Args:
+        order_book (dict): {"bids": [[price, qty], ...], "asks": [[price, qty], ...]}.
+        depth (int): Levels kept per side.
+    Returns:
+        dict: Level quantities keyed by (BID/ASK, price).
+    """
+    levels = {(BID, float(price)): float(qty) for price, qty in order_book.get("bids", [])[:depth]}
+    levels.update({(ASK, float(price)): float(qty) for price, qty in order_book.get("asks", [])[:depth]})
+    return levels
+
+
+def diff_levels(previous, current):
+    """
+    Levels that changed between two books (removed levels get quantity 0).
+    Returns:
+        dict: {(side, price): new quantity}.
+    """
+    changes = {key: qty for key, qty in current.items() if previous.get(key) != qty}
+    changes.update({key: 0.0 for key in previous.keys() - current.keys()})
+    return changes
+
+
+def encode_record(timestamp, kind, levels):
+    """
+    Packs one snapshot or diff record.
+    Args:
+        timestamp (float): Epoch seconds.
+        kind (int): SNAPSHOT or DIFF.
+        levels (dict): {(side, price): quantity}.
+    Returns:
+        bytes: Encoded record.
+    """
+    entries = np.empty(len(levels), dtype=LEVEL_DTYPE)
+    if levels:
+        keys = list(levels.keys())
+        entries["side"] = [side for side, _ in keys]
+        entries["price"] = [price for _, price in keys]
+        entries["quantity"] = list(levels.values())
+    return RECORD.pack(timestamp, kind, len(entries)) + entries.tobytes()
+
+
+def read_book_file(path):
+    """
+    Loads a recorded session in one pass.
+    Args:
+        path (str): File written by OrderBookRecorder.
+    Returns:
+        dict: symbol, depth, and columnar records – timestamps, kinds, offsets (levels[offsets[i]:offsets[i + 1]]
+            belong to record i) & levels (LEVEL_DTYPE array).
+    """
+    with open(path, "rb") as file:
+        raw = file.read()
+    magic, depth, symbol_length = HEADER.unpack_from(raw, 0)
+    if magic != MAGIC:
+        raise ValueError(f"Not an order book recording: {path}")
+    position = HEADER.size
+    symbol = raw[position:position + symbol_length].decode()
+    position += symbol_length
+
+    timestamps, kinds, offsets, chunks = [], [], [0], []
+    total = len(raw)
+    while position + RECORD.size <= total:
+        timestamp, kind, count = RECORD.unpack_from(raw, position)
+        end = position + RECORD.size + count * LEVEL_DTYPE.itemsize
+        if end > total:  # Truncated last record (recorder killed mid-write)
+            break
+        chunks.append(raw[position + RECORD.size:end])
+        timestamps.append(timestamp)
+        kinds.append(kind)
+        offsets.append(offsets[-1] + count)
+        position = end
+
+    return {
+        "symbol": symbol,
+        "depth": depth,
+        "timestamps": np.asarray(timestamps, dtype=np.float64),
+        "kinds": np.asarray(kinds, dtype=np.uint8),
+        "offsets": np.asarray(offsets, dtype=np.int64),
+        "levels": np.frombuffer(b"".join(chunks), dtype=LEVEL_DTYPE),
+    }
+
+
+def iter_books(recording, depth=ORDER_BOOK_DEPTH):
+    """
+    Rebuilds the book after every record, e.g. to feed OrderBookAnalyzer directly.
+    Args:
+        recording (str or dict): File path or read_book_file result.
+        depth (int): Levels per side in the yielded books.
+    Yields:
+        tuple: (timestamp, {"bids": [[price, qty], ...], "asks": [[price, qty], ...]})
+    """
+    data = read_book_file(recording) if isinstance(recording, str) else recording
+    offsets = data["offsets"].tolist()
+    sides = data["levels"]["side"].tolist()
+    prices = data["levels"]["price"].tolist()
+    quantities = data["levels"]["quantity"].tolist()
+    book = {BID: {}, ASK: {}}
+    for index, (timestamp, kind) in enumerate(zip(data["timestamps"].tolist(), data["kinds"].tolist())):
+        if kind == SNAPSHOT:
+            book = {BID: {}, ASK: {}}
+        for position in range(offsets[index], offsets[index + 1]):
+            side_book = book[sides[position]]
+            if quantities[position] > 0:
+                side_book[prices[position]] = quantities[position]
+            else:
+                side_book.pop(prices[position], None)
+        yield timestamp, {
+            "bids": [[price, book[BID][price]] for price in sorted(book[BID], reverse=True)[:depth]],
+            "asks": [[price, book[ASK][price]] for price in sorted(book[ASK])[:depth]],
+        }
+
+
+class OrderBookRecorder:
+    def __init__(self, exchange, path, pair=PAIR, depth=ORDER_BOOK_DEPTH, keyframe_interval=ORDER_BOOK_KEYFRAME_INTERVAL):
+        """
+        Records live depth as periodic full snapshots plus diffs of the levels that changed.
+        Args:
+            exchange: Object with fetch_order_book(pair, limit) (ExchangeConnector).
+            path (str): Output file (appended to if it already exists).
+            pair (str): Recorded pair.
+            depth (int): Levels per side.
+            keyframe_interval (int): Records between full snapshots (bounds replay seek & corruption damage).
+        """
+        self.exchange = exchange
+        self.path = path
+        self.pair = pair
+        self.depth = depth
+        self.keyframe_interval = keyframe_interval
+        self.previous = None
+        self.since_keyframe = 0
+        self.stats = {"snapshots": 0, "diffs": 0, "levels": 0, "bytes": 0, "errors": 0}
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.file = open(path, "ab")
+        if new_file:
+            symbol = pair.encode()
+            self.file.write(HEADER.pack(MAGIC, depth, len(symbol)) + symbol)
+
+    def record(self, order_book, timestamp=None):
+        """
+        Appends one book observation (snapshot on keyframes, diff otherwise; unchanged books write nothing).
+        Args:
+            order_book (dict): fetch_order_book result.
+            timestamp (float): Epoch seconds (defaults to the book's timestamp or now).
+        Returns:
+            int: Bytes written.
+        """
+        timestamp = timestamp or order_book.get("timestamp") or time.time()
+        current = book_to_levels(order_book, self.depth)
+        if self.previous is None or self.since_keyframe >= self.keyframe_interval:
+            kind, levels = SNAPSHOT, current
+            self.since_keyframe = 0
+            self.stats["snapshots"] += 1
+        else:
+            levels = diff_levels(self.previous, current)
+            if not levels:
+                return 0
+            kind = DIFF
+            self.stats["diffs"] += 1
+
+        payload = encode_record(timestamp, kind, levels)
+        self.file.write(payload)
+        self.previous = current
+        self.since_keyframe += 1
+        self.stats["levels"] += len(levels)
+        self.stats["bytes"] += len(payload)
+        return len(payload)
+
+    def run(self, duration=None, interval=ORDER_BOOK_RECORD_INTERVAL):
+        """
+        Polls the exchange and records until the duration elapses (None = until interrupted).
+        Args:
+            duration (float): Seconds to record.
+            interval (float): Seconds between polls.
+        Returns:
+            dict: Recording stats.
+        """
+        start = time.time()
+        Logger.info(f"🎙️ Recording {self.pair} depth to {self.path}")
+        try:
+            while duration is None or time.time() - start < duration:
+                poll_start = time.time()
+                order_book = self.exchange.fetch_order_book(self.pair, self.depth)
+                if order_book:
+                    self.record(order_book, order_book.get("timestamp") or poll_start)
+                    self.file.flush()
+                else:
+                    self.stats["errors"] += 1
+                time.sleep(max(0.0, interval - (time.time() - poll_start)))
+        except KeyboardInterrupt:
+            Logger.info("🛑 Order book recording stopped.")
+        finally:
+            self.close()
+        Logger.info(f"✅ Recorded {self.stats['snapshots']} snapshots & {self.stats['diffs']} diffs "
+                    f"({self.stats['bytes']} bytes).")
+        return self.stats
+
+    def close(self):
+        """Flushes and closes the output file."""
+        if not self.file.closed:
+            self.file.close()
+
+
+# 🚀 RECORD A LIVE SESSION
+if __name__ == "__main__":
+    from core.exchange_connector import ExchangeConnector
+    from config import ORDER_BOOK_DIR
+
+    output = os.path.join(ORDER_BOOK_DIR, f"{PAIR.replace('/', '')}_{int(time.time())}.obk")
+    OrderBookRecorder(ExchangeConnector(), output).run()
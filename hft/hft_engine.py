@@ -9,9 +9,13 @@ from data.order_book_analyzer import OrderBookAnalyzer
 from config import ENABLE_HFT, HFT_TRADE_INTERVAL, PAIR
 
 class HFTEngine:
-    def __init__(self):
-        """Initialize high-frequency trading engine."""
-        self.exchange = ExchangeConnector()
+    def __init__(self, exchange=None):
+        """
+        Initialize high-frequency trading engine.
+        Args:
+            exchange: ExchangeConnector (default) or a simulator such as OrderBookReplay.
+        """
+        self.exchange = exchange or ExchangeConnector()
 
     def execute_hft_trade(self):
         """
@@ -1,22 +1,30 @@
-import time
 import threading
-import traceback
+from concurrent.futures import ThreadPoolExecutor
 from core.exchange_connector import ExchangeConnector
 from core.order_manager import OrderManager
+from core.order_pipeline import ACKNOWLEDGED, FILLED, REJECTED, CANCELED
 from core.risk_management import validate_trade
+from core.order_store import OrderStore
+from core.portfolio_risk import PortfolioRiskEngine
+from core.data_preprocessing import DataPreprocessing
+from core.artifact_cache import ArtifactCache
+from core.trading_runtime import TradingRuntime, CandleFeed, Stage
 from ai_models.predictive_ai import PredictiveAI
 from ai_models.ai_feedback_loop import AIFeedbackLoop
 from strategies.dynamic_grid import DynamicGridTrading
 from strategies.hedge_trading import HedgeTrading
 from utilities.profit_tracker import ProfitTracker
 from utilities.utils import Utils
-from config import PAIR, TRADE_INTERVAL, ENABLE_HEDGE_TRADING, ENABLE_DYNAMIC_GRID
+from config import PAIR, ENABLE_HEDGE_TRADING, ENABLE_DYNAMIC_GRID
 
 # 🔌 Initialize Components
 exchange = ExchangeConnector()
-order_manager = OrderManager(exchange)
-ai_model = PredictiveAI()
-feedback_loop = AIFeedbackLoop()
+order_store = OrderStore()
+portfolio_risk = PortfolioRiskEngine()  # Running exposure / drawdown state, updated on fills & candle closes
+order_store.subscribe(portfolio_risk.on_order_update)
+order_manager = OrderManager(exchange, store=order_store)
+ai_model = PredictiveAI(live=True)  # Only the live instance may fine-tune & checkpoint (ONLINE_LEARNING)
+feedback_loop = AIFeedbackLoop(ai_model)  # Shares the live model so retrains swap into the trading loop
 profit_tracker = ProfitTracker()
 
 # ✅ Select Trading Strategy
@@ -27,66 +35,97 @@ elif ENABLE_HEDGE_TRADING:
 else:
     strategy = None
 
-# Lock for thread safety
-from threading import Lock
-trade_lock = Lock()
+# 🧵 I/O that overlaps with compute (balance is fetched while features & inference run)
+io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="io")
+feature_cache = ArtifactCache(enabled=False)  # Live windows never repeat – don't spend disk writes on them
+trade_count = 0
+
+# 🧩 Pipeline Stages (each runs on its own worker thread)
+def compute_features(event):
+    event["balance"] = io_pool.submit(exchange.fetch_balance)
+    portfolio_risk.on_price(PAIR, event["market_data"]["close"].iloc[-1])
+    event["features"] = DataPreprocessing(event["market_data"], cache=feature_cache).preprocess()
+    return event
+
+def run_inference(event):
+    ai_model.learn_from_closed_candles(event["features"], PAIR)  # Live-only online update; no-op unless enabled
+    event["signal"] = ai_model.generate_trade_signal(event["features"])
+    if event["signal"] == "HOLD":
+        Utils.log_message("⏳ AI decided to HOLD. No trade this cycle.", "info")
+        return None
+    return event
+
+def check_risk(event):
+    balance = event["balance"].result()
+    if portfolio_risk.peak_equity == 0:  # First snapshot sets the equity the drawdown limit is measured from
+        price = event["features"]["close"].iloc[-1]
+        portfolio_risk.set_capital(float(balance["USDT"]) + float(balance["PI"]) * price)
+    event["decision"] = validate_trade(event["signal"], event["features"], balance, portfolio_risk=portfolio_risk)
+    if not event["decision"]["valid"]:
+        Utils.log_message(f"⚠️ Trade not valid: {event['decision']['reason']}. Skipping...", "warning")
+        return None
+    return event
+
+def execute_trade(event):
+    # 📈 Submit Trade – order updates come back to the accounting stage from the pipeline's workers
+    handle = order_manager.submit_order(event["signal"], event["decision"])
+    if not handle:
+        portfolio_risk.release(event["decision"].get("client_id"))  # Never sent – free its reserved exposure
+        return None
+    runtime.record_submission(event)
+    handle.add_callback(lambda h, e=event: accounting.put({"update": h, "cycle_event": e}))
+    return event
+
+def account(event):
+    global trade_count
+    if "update" in event:
+        cycle_event = event["cycle_event"]
+        on_order_update(event["update"], cycle_event["signal"], cycle_event["features"], cycle_event["decision"])
+        return None
+
+    # 🔄 Train AI if Needed
+    if trade_count >= 100:
+        feedback_loop.retrain_ai_model()
+        trade_count = 0  # Reset trade count after retraining
+    else:
+        trade_count += 1
+    return None
+
+# 📬 Order Updates (applied on the accounting stage, so tracker & feedback updates never race)
+def on_order_update(handle, trade_signal, market_data, trade_decision):
+    if handle.state == ACKNOWLEDGED:
+        Utils.log_message(f"📨 {trade_signal} order {handle.exchange_id} acknowledged by the exchange.", "info")
+    elif handle.state == FILLED and handle.order:
+        Utils.log_message(f"✅ Trade Executed: {trade_signal} {trade_decision['position_size']} {PAIR}", "info")
+        if "profit" in handle.order:
+            profit_tracker.update_trade("WIN" if handle.order["profit"] > 0 else "LOSS", handle.order["profit"])
+            feedback_loop.update_trade_feedback(trade_signal, market_data, handle.order["profit"])
+    elif handle.state in (REJECTED, CANCELED):
+        Utils.log_message(f"⚠️ {trade_signal} order {handle.client_id} {handle.state}: {handle.error}", "warning")
+
+# 🚀 Trading Runtime – a new closed candle starts each cycle
+accounting = Stage("accounting", account, maxsize=0)  # Unbounded: order-pipeline workers put here and must never block
+runtime = TradingRuntime(CandleFeed(exchange, PAIR), [
+    Stage("features", compute_features, conflate=True),  # Only the freshest candle window matters
+    Stage("inference", run_inference, conflate=True),
+    Stage("risk", check_risk),
+    Stage("execution", execute_trade),
+    accounting,
+], order_store=order_store, exchange=exchange,  # Reconcile resolves ACKNOWLEDGED orders into fills for portfolio_risk
+   metric_sources={"prediction_cache": ai_model.prediction_cache.stats})  # Hit rate in the runtime metrics
 
-# 🚀 Trading Loop
 def trading_loop():
-    trade_count = 0
-    while True:
-        with trade_lock:  # Ensure thread safety
-            try:
-                # 📊 Fetch Market Data
-                market_data = exchange.fetch_market_data(PAIR)
-                if market_data is None or market_data.empty:
-                    Utils.log_message(f"⚠️ Market data for {PAIR} is empty or None. Skipping cycle.", "warning")
-                    time.sleep(TRADE_INTERVAL)
-                    continue
-
-                # 🤖 AI Prediction
-                trade_signal = ai_model.generate_trade_signal(market_data)
-
-                if trade_signal == "HOLD":
-                    Utils.log_message("⏳ AI decided to HOLD. No trade this cycle.", "info")
-                    time.sleep(TRADE_INTERVAL)
-                    continue
-
-                # 🏦 Fetch Account Balance
-                balance = exchange.fetch_balance()
-
-                # 🛡️ Validate Trade
-                trade_decision = validate_trade(trade_signal, market_data, balance)
-
-                if not trade_decision["valid"]:
-                    Utils.log_message(f"⚠️ Trade not valid: {trade_decision['reason']}. Skipping...", "warning")
-                    time.sleep(TRADE_INTERVAL)
-                    continue
-
-                # 📈 Execute Trade
-                order = order_manager.execute_order(trade_signal, trade_decision)
-
-                if order:
-                    profit_tracker.update_trade("WIN" if order["profit"] > 0 else "LOSS", order["profit"])
-                    feedback_loop.update_trade_feedback(trade_signal, market_data, order["profit"])
-                    Utils.log_message(f"✅ Trade Executed: {trade_signal} {trade_decision['position_size']} {PAIR}", "info")
-
-                # 🔄 Train AI if Needed
-                if trade_count >= 100:
-                    feedback_loop.retrain_ai_model()
-                    trade_count = 0  # Reset trade count after retraining
-                else:
-                    trade_count += 1
-
-            except Exception as e:
-                Utils.log_message(f"❌ Trading Error: {str(e)}\n{traceback.format_exc()}", "error")
-
-        time.sleep(TRADE_INTERVAL)
+    runtime.start()
+    runtime.feed_thread.join()
 
 # Graceful shutdown
 import signal
 def graceful_shutdown(signal, frame):
     Utils.log_message("🚨 Bot shutting down...", "info")
+    runtime.stop()  # Stop the candle feed and drain the stages
+    if order_manager.pipeline is not None:
+        order_manager.pipeline.shutdown(wait=True)  # Let in-flight orders finish
+    ai_model.shutdown()
     exit(0)
 
 signal.signal(signal.SIGINT, graceful_shutdown)
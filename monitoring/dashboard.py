@@ -5,7 +5,10 @@
 
 from flask import Flask, render_template, jsonify
 from core.exchange_connector import ExchangeConnector
+from core.order_store import OrderStore
 from utilities.profit_tracker import ProfitTracker
+from config import RUNTIME_METRICS_FILE
+import json
 import logging
 
 # ✅ Initialize Flask App
@@ -14,6 +17,7 @@ app = Flask(__name__)
 # ✅ Initialize Trading Components
 exchange = ExchangeConnector()
 profit_tracker = ProfitTracker()
+order_store = OrderStore()  # Serves open orders from memory; the exchange is polled every ORDER_RECONCILE_INTERVAL
 
 # ✅ Configure Logging
 logging.basicConfig(level=logging.INFO)
@@ -30,7 +34,8 @@ def get_status():
     """
     try:
         balance = exchange.fetch_balance()
-        open_trades = exchange.fetch_open_orders()
+        order_store.maybe_reconcile(exchange)
+        open_trades = [record.to_dict() for record in order_store.open_orders()]
         profit_loss = profit_tracker.get_summary()
 
         return jsonify({
@@ -42,6 +47,20 @@ def get_status():
         logging.error(f"❌ Error Fetching Dashboard Data: {e}")
         return jsonify({"error": "Unable to fetch trading data"}), 500
 
+@app.route("/runtime")
+def get_runtime_metrics():
+    """
+    Returns the trading runtime's latest per-stage queue depth & latency (written by main.py).
+    """
+    try:
+        with open(RUNTIME_METRICS_FILE) as f:
+            return jsonify(json.load(f))
+    except FileNotFoundError:
+        return jsonify({"error": "Trading runtime metrics not available yet"}), 404
+    except Exception as e:
+        logging.error(f"❌ Error Reading Runtime Metrics: {e}")
+        return jsonify({"error": "Unable to read runtime metrics"}), 500
+
 # 🚀 START DASHBOARD
 if __name__ == "__main__":
     import os
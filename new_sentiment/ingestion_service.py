@@ -0,0 +1,321 @@
+# ingestion_service.py
+# ==================================================
+# 📡 INGESTION SERVICE – CONCURRENT INCREMENTAL NEWS & SOCIAL FEEDS 📡
+# ==================================================
+
+import os
+import json
+import time
+import asyncio
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+import aiohttp
+from custom_logging.logger import Logger
+from config import (
+    INGESTION_POLL_INTERVAL, INGESTION_STATE_FILE, INGESTION_SEEN_TTL, INGESTION_TIMEOUT, INGESTION_RETRIES,
+    INGESTION_BACKOFF
+)
+
+
+def _parse_timestamp(value):
+    """
+    Converts an RFC 2822 / ISO 8601 date string or epoch number to epoch seconds.
+    Args:
+        value: Date value from a feed item.
+    Returns:
+        float: Epoch seconds (0.0 if unparseable).
+    """
+    if value is None:
+        return 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return 0.0
+
+
+class NewsFeedSource:
+    def __init__(self, name, url, params=None, retries=INGESTION_RETRIES, backoff=INGESTION_BACKOFF):
+        """
+        HTTP JSON news feed polled with conditional requests.
+        Args:
+            name (str): Source name (also the key for persisted state).
+            url (str): Feed URL.
+            params (dict): Query parameters.
+            retries (int): Retries after a 5xx response or timeout.
+            backoff (float): First retry delay in seconds (doubles on every further retry).
+        """
+        self.name = name
+        self.url = url
+        self.params = params or {}
+        self.retries = retries
+        self.backoff = backoff
+        self.etag = None
+        self.last_modified = None
+        self.last_seen = 0.0  # Newest item timestamp already delivered
+
+    def get_state(self):
+        """Returns the state persisted between runs."""
+        return {"etag": self.etag, "last_modified": self.last_modified, "last_seen": self.last_seen}
+
+    def load_state(self, state):
+        """Restores persisted state."""
+        self.etag = state.get("etag")
+        self.last_modified = state.get("last_modified")
+        self.last_seen = state.get("last_seen", 0.0)
+
+    def parse_items(self, payload):
+        """
+        Normalizes a cryptonews-api style payload.
+        Args:
+            payload (dict): Decoded JSON response.
+        Returns:
+            list: Items with id, source, title, summary, url & published timestamp.
+        """
+        return [
+            {
+                "id": article.get("news_url") or article.get("title"),
+                "source": self.name,
+                "title": article.get("title", ""),
+                "summary": article.get("text", ""),
+                "url": article.get("news_url"),
+                "published": _parse_timestamp(article.get("date")),
+            }
+            for article in payload.get("data", [])
+        ]
+
+    async def fetch(self, session):
+        """
+        Fetches items newer than the last one seen, skipping the download if the feed is unchanged.
+        Args:
+            session (aiohttp.ClientSession): Shared HTTP session.
+        Returns:
+            list: New items.
+        """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+
+        payload = await self._get(session, headers)
+        if payload is None:
+            return []  # ✅ Not modified – nothing downloaded or parsed
+
+        items = [item for item in self.parse_items(payload) if item["published"] == 0.0 or item["published"] > self.last_seen]
+        self.last_seen = max([self.last_seen] + [item["published"] for item in items])
+        return items
+
+    async def _get(self, session, headers):
+        """
+        Conditional GET, retried with exponential backoff on 5xx responses & timeouts.
+        Args:
+            session (aiohttp.ClientSession): Shared HTTP session.
+            headers (dict): Conditional request headers.
+        Returns:
+            dict or None: Decoded JSON, or None if the feed is unchanged (304).
+        """
+        for attempt in range(self.retries + 1):
+            try:
+                async with session.get(self.url, params=self.params, headers=headers) as response:
+                    if response.status == 304:
+                        return None
+                    if response.status < 500 or attempt == self.retries:
+                        response.raise_for_status()
+                        self.etag = response.headers.get("ETag", self.etag)
+                        self.last_modified = response.headers.get("Last-Modified", self.last_modified)
+                        return await response.json(content_type=None)
+                    Logger.warning(f"⚠️ {self.name} returned {response.status}; retrying...")
+            except asyncio.TimeoutError:
+                if attempt == self.retries:
+                    raise
+                Logger.warning(f"⚠️ {self.name} timed out; retrying...")
+            await asyncio.sleep(self.backoff * 2 ** attempt)
+
+
+class TwitterSource:
+    def __init__(self, api, query="#Bitcoin OR #Crypto OR #Ethereum", count=100):
+        """
+        Tweepy search polled incrementally with since_id.
+        Args:
+            api (tweepy.API): Authenticated Tweepy client.
+            query (str): Search query.
+            count (int): Max tweets per poll.
+        """
+        self.name = "twitter"
+        self.api = api
+        self.query = query
+        self.count = count
+        self.since_id = None
+
+    def get_state(self):
+        """Returns the state persisted between runs."""
+        return {"since_id": self.since_id}
+
+    def load_state(self, state):
+        """Restores persisted state."""
+        self.since_id = state.get("since_id")
+
+    async def fetch(self, session):
+        """
+        Fetches tweets newer than the last seen tweet ID.
+        Args:
+            session (aiohttp.ClientSession): Unused (Tweepy manages its own connection).
+        Returns:
+            list: New items.
+        """
+        tweets = await asyncio.to_thread(
+            self.api.search_tweets, q=self.query, count=self.count, lang="en",
+            tweet_mode="extended", since_id=self.since_id
+        )
+        items = [
+            {
+                "id": str(tweet.id),
+                "source": self.name,
+                "title": "",
+                "summary": tweet.full_text,
+                "url": None,
+                "published": tweet.created_at.timestamp(),
+            }
+            for tweet in tweets
+        ]
+        if tweets:
+            self.since_id = max(tweet.id for tweet in tweets)
+        return items
+
+
+class IngestionService:
+    def __init__(self, sources, on_items=None, state_file=INGESTION_STATE_FILE, seen_ttl=INGESTION_SEEN_TTL):
+        """
+        Polls all sources concurrently and hands only new items downstream.
+        Args:
+            sources (list): NewsFeedSource / TwitterSource instances.
+            on_items (callable): Optional callback receiving each batch of new items.
+            state_file (str): JSON file persisting cursors, validators & recently seen IDs.
+            seen_ttl (float): Seconds an item ID is remembered for de-duplication.
+        """
+        self.sources = sources
+        self.on_items = on_items
+        self.state_file = state_file
+        self.seen_ttl = seen_ttl
+        self.seen = {}  # item id -> expiry (in-memory TTL cache)
+        self.queue = asyncio.Queue(maxsize=1000)  # Bounded; oldest batches are dropped if nobody consumes
+        self.stats = {"polls": 0, "new_items": 0, "duplicates": 0, "errors": 0}
+        self._load_state()
+
+    def _load_state(self):
+        """Loads persisted source state & seen IDs (once, at startup)."""
+        try:
+            if os.path.exists(self.state_file):
+                with open(self.state_file, "r") as file:
+                    state = json.load(file)
+                for source in self.sources:
+                    source.load_state(state.get("sources", {}).get(source.name, {}))
+                now = time.time()
+                self.seen = {item_id: expiry for item_id, expiry in state.get("seen", {}).items() if expiry > now}
+        except Exception as e:
+            Logger.error(f"❌ Ingestion state read error: {e}")
+
+    def _save_state(self):
+        """Atomically persists source state & seen IDs."""
+        try:
+            os.makedirs(os.path.dirname(self.state_file) or ".", exist_ok=True)
+            tmp_path = f"{self.state_file}.tmp"
+            with open(tmp_path, "w") as file:
+                json.dump({"sources": {source.name: source.get_state() for source in self.sources}, "seen": self.seen}, file)
+            os.replace(tmp_path, self.state_file)
+        except Exception as e:
+            Logger.error(f"❌ Ingestion state write error: {e}")
+
+    async def _fetch_source(self, source, session):
+        """Fetches one source, isolating its failures from the others."""
+        try:
+            return await source.fetch(session)
+        except Exception as e:
+            self.stats["errors"] += 1
+            Logger.error(f"❌ Ingestion error for {source.name}: {e}")
+            return []
+
+    async def poll_once(self, session):
+        """
+        Polls every source concurrently.
+        Args:
+            session (aiohttp.ClientSession): Shared HTTP session.
+        Returns:
+            list: New, de-duplicated items across all sources.
+        """
+        results = await asyncio.gather(*(self._fetch_source(source, session) for source in self.sources))
+
+        now = time.time()
+        self.seen = {item_id: expiry for item_id, expiry in self.seen.items() if expiry > now}
+        new_items = []
+        for item in (item for items in results for item in items):
+            if item["id"] in self.seen:
+                self.stats["duplicates"] += 1
+                continue
+            self.seen[item["id"]] = now + self.seen_ttl
+            new_items.append(item)
+
+        self.stats["polls"] += 1
+        self.stats["new_items"] += len(new_items)
+        self._save_state()
+
+        if new_items:
+            if self.queue.full():
+                self.queue.get_nowait()
+            self.queue.put_nowait(new_items)
+            if self.on_items:
+                self.on_items(new_items)
+        return new_items
+
+    async def run(self, interval=INGESTION_POLL_INTERVAL, iterations=None):
+        """
+        Polls all sources on a fixed interval.
+        Args:
+            interval (float): Seconds between polls.
+            iterations (int): Number of polls (None = forever).
+        """
+        timeout = aiohttp.ClientTimeout(total=INGESTION_TIMEOUT)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            count = 0
+            while iterations is None or count < iterations:
+                started = time.monotonic()
+                await self.poll_once(session)
+                count += 1
+                await asyncio.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+    async def stream(self):
+        """
+        Yields batches of new items as they arrive (run() must be running).
+        Yields:
+            list: New items.
+        """
+        while True:
+            yield await self.queue.get()
+
+# 🚀 START INGESTION
+if __name__ == "__main__":
+    from new_sentiment.news_scraper import API_KEY
+    from new_sentiment.sentiment_pipeline import SentimentPipeline
+    from new_sentiment.sentiment_index import SentimentIndex
+
+    pipeline = SentimentPipeline()
+    index = SentimentIndex()
+    news = NewsFeedSource("cryptonews", "https://cryptonews-api.com/api/v1/category",
+                          {"section": "general", "items": 50, "apikey": API_KEY})
+
+    def score_new_items(items):
+        scores = pipeline.score_texts([item["summary"] for item in items])
+        index.update_items(items, scores)
+        print(f"📰 {len(items)} new items | sentiment index {index.value():.3f} ({index.label()})")
+
+    service = IngestionService([news], on_items=score_new_items)
+    try:
+        asyncio.run(service.run())
+    finally:
+        pipeline.shutdown()
@@ -21,24 +21,33 @@ class NewsScraper:
         """Initialize news scraper with caching."""
         self.api_url = "https://cryptonews-api.com/api/v1"
         self.cache_expiry = 300  # Cache news for 5 minutes
+        self._cache = self._load_disk_cache()  # ✅ Disk is read once; later reads hit memory
 
-    def _read_cache(self):
-        """Reads cached news data if available."""
+    def _load_disk_cache(self):
+        """Loads the persisted news cache at startup."""
         try:
             if os.path.exists(CACHE_FILE):
                 with open(CACHE_FILE, "r") as file:
-                    data = json.load(file)
-                    if time.time() - data["timestamp"] < self.cache_expiry:
-                        return data["news"]
+                    return json.load(file)
         except Exception as e:
             Logger.error(f"❌ Cache Read Error: {e}")
         return None
 
+    def _read_cache(self):
+        """Reads cached news data if available."""
+        if self._cache and time.time() - self._cache["timestamp"] < self.cache_expiry:
+            return self._cache["news"]
+        return None
+
     def _write_cache(self, news_data):
-        """Writes news data to cache."""
+        """Writes news data to the in-memory cache and atomically to disk."""
+        self._cache = {"timestamp": time.time(), "news": news_data}
         try:
-            with open(CACHE_FILE, "w") as file:
-                json.dump({"timestamp": time.time(), "news": news_data}, file)
+            os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+            tmp_path = f"{CACHE_FILE}.tmp"
+            with open(tmp_path, "w") as file:
+                json.dump(self._cache, file)
+            os.replace(tmp_path, CACHE_FILE)
         except Exception as e:
             Logger.error(f"❌ Cache Write Error: {e}")
 
@@ -3,15 +3,21 @@
 # 📊 SENTIMENT ANALYSIS – MARKET TREND DETECTOR 📊
 # ==================================================
 
-from textblob import TextBlob
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 from custom_logging.logger import Logger
+from new_sentiment.sentiment_pipeline import SentimentPipeline, score_text
 
 
 class SentimentAnalyzer:
-    def __init__(self):
-        """Initialize Sentiment Analyzer with VADER."""
+    def __init__(self, pipeline=None):
+        """
+        Initialize Sentiment Analyzer with VADER.
+        Args:
+            pipeline (SentimentPipeline): Shared batch scorer (a new one is created if omitted).
+        """
         self.analyzer = SentimentIntensityAnalyzer()
+        self.owns_pipeline = pipeline is None
+        self.pipeline = pipeline or SentimentPipeline()
         Logger.info("✅ Sentiment Analyzer Ready.")
 
     def analyze_text(self, text):
@@ -22,11 +28,17 @@ class SentimentAnalyzer:
         Returns:
             float: Sentiment score (-1 to +1).
         """
-        blob_score = TextBlob(text).sentiment.polarity
-        vader_score = self.analyzer.polarity_scores(text)["compound"]
+        return score_text(text, self.analyzer)  # Weighted average of TextBlob & VADER scores
 
-        # Weighted average of both sentiment scores
-        return round((blob_score + vader_score) / 2, 3)
+    def analyze_texts(self, texts):
+        """
+        Analyzes sentiment of many texts in one batch (cached, de-duplicated & parallel).
+        Args:
+            texts (list): Input texts.
+        Returns:
+            np.array: Sentiment score (-1 to +1) per text.
+        """
+        return self.pipeline.score_texts(texts)
 
     def determine_market_sentiment(self, articles):
         """
@@ -39,8 +51,8 @@ class SentimentAnalyzer:
         if not articles:
             return "NEUTRAL"
 
-        sentiment_scores = [self.analyze_text(article["summary"]) for article in articles]
-        avg_sentiment = sum(sentiment_scores) / len(sentiment_scores)
+        sentiment_scores = self.analyze_texts([article["summary"] for article in articles])
+        avg_sentiment = float(sentiment_scores.mean())
 
         if avg_sentiment > 0.2:
             return "BULLISH"
@@ -48,6 +60,11 @@ class SentimentAnalyzer:
             return "BEARISH"
         return "NEUTRAL"
 
+    def shutdown(self):
+        """Stops the scoring pipeline's workers if this analyzer created it."""
+        if self.owns_pipeline:
+            self.pipeline.shutdown()
+
 # 🚀 TEST SENTIMENT ANALYSIS
 if __name__ == "__main__":
     analyzer = SentimentAnalyzer()
@@ -56,3 +73,4 @@ if __name__ == "__main__":
 
     market_sentiment = analyzer.determine_market_sentiment(sample_news)
     print(f"📊 Market Sentiment: {market_sentiment}")
+    analyzer.shutdown()
@@ -0,0 +1,193 @@
+# sentiment_pipeline.py
+# ==================================================
+# ⚙️ SENTIMENT PIPELINE – BATCHED, CACHED & PARALLEL SCORING ⚙️
+# ==================================================
+
+import os
+import hashlib
+import sqlite3
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from textblob import TextBlob
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+from custom_logging.logger import Logger
+from config import (
+    SENTIMENT_CACHE_SIZE, SENTIMENT_CACHE_FILE, SENTIMENT_CHUNK_SIZE, SENTIMENT_MAX_WORKERS
+)
+
+# Per-process VADER analyzer, built once by each pool worker
+_worker_analyzer = None
+
+
+def score_text(text, analyzer):
+    """
+    Scores one text as the average of TextBlob polarity and VADER compound.
+    Args:
+        text (str): The input text (e.g., news or tweet).
+        analyzer (SentimentIntensityAnalyzer): VADER analyzer.
+    Returns:
+        float: Sentiment score (-1 to +1).
+    """
+    blob_score = TextBlob(text).sentiment.polarity
+    vader_score = analyzer.polarity_scores(text)["compound"]
+    return round((blob_score + vader_score) / 2, 3)
+
+
+def _score_chunk(texts):
+    """
+    Scores a chunk of texts inside a pool worker.
+    Args:
+        texts (list): Texts to score.
+    Returns:
+        list: Sentiment scores.
+    """
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        _worker_analyzer = SentimentIntensityAnalyzer()
+    return [score_text(text, _worker_analyzer) for text in texts]
+
+
+def text_hash(text):
+    """
+    Content hash used to de-duplicate texts (whitespace insensitive; case is kept because VADER scores
+    capitalized words more strongly).
+    Args:
+        text (str): Input text.
+    Returns:
+        str: Hex digest.
+    """
+    normalized = " ".join(text.split())
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class SentimentPipeline:
+    def __init__(self, cache_size=SENTIMENT_CACHE_SIZE, cache_file=SENTIMENT_CACHE_FILE,
+                 chunk_size=SENTIMENT_CHUNK_SIZE, max_workers=SENTIMENT_MAX_WORKERS):
+        """
+        Initializes the batch sentiment scoring pipeline.
+        Args:
+            cache_size (int): Scores kept in the in-memory LRU.
+            cache_file (str): SQLite file backing the on-disk score cache (None disables it).
+            chunk_size (int): Texts per worker task; smaller batches are scored inline.
+            max_workers (int): Process pool size (None = one per CPU core).
+        """
+        self.cache_size = cache_size
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.memory_cache = OrderedDict()
+        self.lock = threading.Lock()
+        self.analyzer = SentimentIntensityAnalyzer()
+        self.executor = None
+        self.stats = {"texts": 0, "unique": 0, "memory_hits": 0, "disk_hits": 0, "scored": 0}
+
+        self.db = None
+        if cache_file:
+            os.makedirs(os.path.dirname(cache_file) or ".", exist_ok=True)
+            self.db = sqlite3.connect(cache_file, check_same_thread=False)
+            self.db.execute("CREATE TABLE IF NOT EXISTS scores (hash TEXT PRIMARY KEY, score REAL NOT NULL)")
+            self.db.commit()
+
+    def _remember(self, key, score):
+        """Stores a score in the in-memory LRU."""
+        self.memory_cache[key] = score
+        self.memory_cache.move_to_end(key)
+        while len(self.memory_cache) > self.cache_size:
+            self.memory_cache.popitem(last=False)
+
+    def _lookup_disk(self, keys):
+        """
+        Fetches cached scores from disk.
+        Args:
+            keys (list): Content hashes.
+        Returns:
+            dict: {hash: score} for every key found.
+        """
+        if self.db is None or not keys:
+            return {}
+        found = {}
+        for start in range(0, len(keys), 500):  # Stay under SQLite's bound-parameter limit
+            batch = keys[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            found.update(self.db.execute(f"SELECT hash, score FROM scores WHERE hash IN ({placeholders})", batch))
+        return found
+
+    def _score_missing(self, texts):
+        """
+        Scores texts not found in any cache, in parallel when the batch is large enough.
+        Args:
+            texts (list): Unique texts to score.
+        Returns:
+            list: Sentiment scores.
+        """
+        if len(texts) < self.chunk_size:
+            return [score_text(text, self.analyzer) for text in texts]
+
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                mp_context=multiprocessing.get_context("spawn"))
+        chunks = [texts[i:i + self.chunk_size] for i in range(0, len(texts), self.chunk_size)]
+        return [score for chunk_scores in self.executor.map(_score_chunk, chunks) for score in chunk_scores]
+
+    def score_texts(self, texts):
+        """
+        Scores a batch of texts, de-duplicated by content and served from cache where possible.
+        Args:
+            texts (list): Texts (news summaries, tweets, ...).
+        Returns:
+            np.array: Sentiment score per input text, in input order.
+        """
+        keys = [text_hash(text) for text in texts]
+        unique = dict(zip(keys, texts))  # ✅ Each distinct text is scored at most once
+        scores = {}
+
+        with self.lock:
+            self.stats["texts"] += len(texts)
+            self.stats["unique"] += len(unique)
+
+            for key in unique:
+                if key in self.memory_cache:
+                    scores[key] = self.memory_cache[key]
+                    self.memory_cache.move_to_end(key)
+            self.stats["memory_hits"] += len(scores)
+
+            disk_scores = self._lookup_disk([key for key in unique if key not in scores])
+            for key, score in disk_scores.items():
+                scores[key] = score
+                self._remember(key, score)
+            self.stats["disk_hits"] += len(disk_scores)
+
+        missing = [key for key in unique if key not in scores]
+        if missing:
+            new_scores = self._score_missing([unique[key] for key in missing])
+            with self.lock:
+                for key, score in zip(missing, new_scores):
+                    scores[key] = score
+                    self._remember(key, score)
+                if self.db is not None:
+                    self.db.executemany("INSERT OR REPLACE INTO scores VALUES (?, ?)", zip(missing, new_scores))
+                    self.db.commit()
+                self.stats["scored"] += len(missing)
+
+        return np.fromiter((scores[key] for key in keys), dtype=np.float64, count=len(keys))
+
+    def shutdown(self):
+        """Stops the worker pool and closes the disk cache."""
+        with self.lock:
+            executor, self.executor = self.executor, None
+            db, self.db = self.db, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        if db is not None:
+            db.close()
+        Logger.info(f"📊 Sentiment pipeline stats: {self.stats}")
+
+    close = shutdown
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
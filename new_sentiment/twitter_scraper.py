@@ -5,10 +5,9 @@
 
 import os
 import tweepy
-from textblob import TextBlob
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 from dotenv import load_dotenv
 from custom_logging.logger import Logger
+from new_sentiment.sentiment_pipeline import SentimentPipeline
 
 # Load API credentials securely
 load_dotenv()
@@ -18,10 +17,15 @@ TWITTER_ACCESS_TOKEN = os.getenv("TWITTER_ACCESS_TOKEN")
 TWITTER_ACCESS_SECRET = os.getenv("TWITTER_ACCESS_SECRET")
 
 class TwitterScraper:
-    def __init__(self):
-        """Initialize Twitter API connection."""
+    def __init__(self, pipeline=None):
+        """
+        Initialize Twitter API connection.
+        Args:
+            pipeline (SentimentPipeline): Shared batch scorer (a new one is created if omitted).
+        """
         self.authenticated = self.authenticate()
-        self.analyzer = SentimentIntensityAnalyzer()
+        self.owns_pipeline = pipeline is None
+        self.pipeline = pipeline or SentimentPipeline()
 
     def authenticate(self):
         """Authenticate with Twitter API."""
@@ -53,19 +57,27 @@ class TwitterScraper:
 
         try:
             tweets = self.api.search_tweets(q=query, count=count, lang="en", tweet_mode="extended")
-            sentiment_scores = [self.analyze_sentiment(tweet.full_text) for tweet in tweets]
+            sentiment_scores = self.pipeline.score_texts([tweet.full_text for tweet in tweets])
 
+            bullish = int((sentiment_scores > 0.2).sum())
+            bearish = int((sentiment_scores < -0.2).sum())
             return {
-                "bullish": sum(1 for s in sentiment_scores if s > 0.2),
-                "bearish": sum(1 for s in sentiment_scores if s < -0.2),
-                "neutral": sum(1 for s in sentiment_scores if -0.2 <= s <= 0.2)
+                "bullish": bullish,
+                "bearish": bearish,
+                "neutral": len(sentiment_scores) - bullish - bearish
             }
         except Exception as e:
             Logger.error(f"❌ Twitter Fetch Error: {e}")
             return {"bullish": 0, "bearish": 0, "neutral": 0}
 
+    def shutdown(self):
+        """Stops the scoring pipeline's workers if this scraper created it."""
+        if self.owns_pipeline:
+            self.pipeline.shutdown()
+
 # 🚀 TEST TWITTER SCRAPER
 if __name__ == "__main__":
     scraper = TwitterScraper()
     sentiment = scraper.fetch_crypto_tweets()
-    print(f"📊 Twitter Sentiment: {sentiment}")
\ No newline at end of file
+    print(f"📊 Twitter Sentiment: {sentiment}")
+    scraper.shutdown()
\ No newline at end of file
@@ -0,0 +1,375 @@
+# parameter_sweep.py
+# ==================================================
+# 🧮 PARAMETER SWEEP – MULTI-CORE GRID / RANDOM SEARCH & WALK-FORWARD 🧮
+# ==================================================
+
+import os
+import json
+import glob
+import hashlib
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+from simulation.simulated_exchange import SimulatedExchange, ohlc_to_trades
+from simulation.vectorized_backtest import VectorizedBacktester
+from simulation.performance_analytics import compute_metrics
+from custom_logging.logger import Logger
+from config import (
+    PAIR, SWEEP_MAX_WORKERS, SWEEP_CACHE_DIR, SWEEP_TASK_SIZE, SWEEP_FLUSH_SIZE, SWEEP_SEED,
+    WALK_FORWARD_TRAIN_BARS, WALK_FORWARD_TEST_BARS
+)
+
+# Per-process memory-mapped market data, opened once by each pool worker
+_worker_data = None
+
+
+def _init_sweep_worker(data_dir, columns):
+    """
+    Opens the shared market data as read-only memory maps (no copy per worker).
+    Args:
+        data_dir (str): Directory holding one .npy file per column.
+        columns (list): Column names.
+    """
+    global _worker_data
+    _worker_data = {column: np.load(os.path.join(data_dir, f"{column}.npy"), mmap_mode="r") for column in columns}
+
+
+def _equity_metrics(equity, timestamps, num_trades):
+    """
+    Shared performance analytics for an equity curve sampled by a sweep evaluator.
+    Args:
+        equity (np.array): Equity samples.
+        timestamps (np.array): Epoch seconds per sample (annualization follows the sampling interval).
+        num_trades (int): Number of fills.
+    Returns:
+        dict: performance_analytics.compute_metrics plus roi (%) & num_trades.
+    """
+    metrics = compute_metrics(np.asarray(equity, dtype=np.float64), timestamps=np.asarray(timestamps, dtype=np.float64))
+    metrics.update(roi=metrics["total_return"] * 100, num_trades=num_trades)
+    return metrics
+
+
+def evaluate_signal_thresholds(data, start, end, params):
+    """
+    RSI threshold strategy through the vectorized backtester.
+    Args:
+        data (dict): Column arrays (needs "close" & "rsi"; a "timestamp" column sets the annualization).
+        start, end (int): Bar window.
+        params (dict): buy_threshold, sell_threshold & optional position_fraction.
+    Returns:
+        dict: Metrics for the window.
+    """
+    close = np.asarray(data["close"][start:end])
+    rsi = np.asarray(data["rsi"][start:end])
+    signals = np.where(rsi < params["buy_threshold"], "BUY", np.where(rsi > params["sell_threshold"], "SELL", "HOLD"))
+    frame = pd.DataFrame({"close": close})
+    if "timestamp" in data:
+        frame["timestamp"] = np.asarray(data["timestamp"][start:end])
+    backtester = VectorizedBacktester(position_fraction=params.get("position_fraction", 1.0))
+    result = backtester.run(frame, signals)
+    return {**result["metrics"], "roi": result["roi"], "num_trades": result["num_trades"]}
+
+
+def evaluate_grid(data, start, end, params):
+    """
+    Grid strategy with stop-loss / take-profit on the event-driven simulated exchange.
+    The grid is re-centred every `regrid_interval` seconds; if price breaks below the grid floor by
+    stop_loss_percent, or above the ceiling by take_profit_percent, the inventory is flattened.
+    Args:
+        data (dict): Column arrays (timestamp in epoch seconds, open, high, low, close & volume).
+        start, end (int): Bar window.
+        params (dict): grid_size, grid_spacing (%), risk_per_trade, stop_loss_percent,
+            take_profit_percent & optional regrid_interval / candle_interval (seconds).
+    Returns:
+        dict: Metrics for the window.
+    """
+    interval = params.get("candle_interval", 60)
+    columns = [np.asarray(data[column][start:end]) for column in ("timestamp", "open", "high", "low", "close", "volume")]
+    timestamps, prices, quantities = ohlc_to_trades(*columns, interval=interval)
+    exchange = SimulatedExchange(latency=0.0, candle_interval=interval)
+    grid = {"floor": None, "ceiling": None}
+    equity_samples = []
+
+    def regrid():
+        price = exchange.last_price
+        equity_samples.append((exchange.time, exchange.equity()))
+        for order in exchange.fetch_open_orders():
+            exchange.cancel_order(order["id"])
+
+        inventory = exchange.balance[exchange.base]
+        if inventory > 0 and grid["floor"] is not None and (
+                price <= grid["floor"] * (1 - params["stop_loss_percent"])
+                or price >= grid["ceiling"] * (1 + params["take_profit_percent"])):
+            exchange.create_market_sell_order(PAIR, inventory)
+            inventory = 0.0
+
+        half = params["grid_size"] // 2
+        amount = exchange.equity() * params["risk_per_trade"] / price
+        levels = [price * (1 + (i - half) * params["grid_spacing"] / 100) for i in range(params["grid_size"])]
+        for level in levels:
+            if level < price:
+                exchange.create_limit_buy_order(PAIR, amount, level)
+            elif level > price and inventory >= amount:
+                exchange.create_limit_sell_order(PAIR, amount, level)
+                inventory -= amount
+        grid["floor"], grid["ceiling"] = min(levels), max(levels)
+
+    exchange.replay(timestamps, prices, quantities, [(params.get("regrid_interval", 3600), regrid)])
+    equity_samples.append((exchange.time, exchange.equity()))
+    sample_times, equity = zip(*equity_samples)
+    return _equity_metrics(equity, sample_times, len(exchange.fills))
+
+
+def _run_sweep_task(evaluate, tasks):
+    """
+    Evaluates a batch of (config, window) tasks inside a pool worker.
+    Args:
+        evaluate (callable): Module-level evaluator(data, start, end, params) -> metrics dict.
+        tasks (list): (config_id, fold, segment, start, end, params) tuples.
+    Returns:
+        list: Result rows.
+    """
+    rows = []
+    for config_id, fold, segment, start, end, params in tasks:
+        try:
+            metrics = evaluate(_worker_data, start, end, params)
+        except Exception as e:
+            Logger.error(f"❌ Sweep config {config_id} fold {fold} failed: {e}")
+            metrics = {}
+        rows.append({"config_id": config_id, "fold": fold, "segment": segment,
+                     **{f"param_{name}": value for name, value in params.items()}, **metrics})
+    return rows
+
+
+def walk_forward_splits(n_bars, train_bars=WALK_FORWARD_TRAIN_BARS, test_bars=WALK_FORWARD_TEST_BARS, step=None):
+    """
+    Rolling walk-forward windows.
+    Args:
+        n_bars (int): Length of the data.
+        train_bars (int): Bars per in-sample window.
+        test_bars (int): Bars per out-of-sample window.
+        step (int): Bars the windows roll forward each fold (defaults to test_bars).
+    Returns:
+        list: (train_start, train_end, test_end) per fold.
+    """
+    step = step or test_bars
+    return [(start, start + train_bars, start + train_bars + test_bars)
+            for start in range(0, n_bars - train_bars - test_bars + 1, step)]
+
+
+class ParameterSweep:
+    def __init__(self, evaluate=evaluate_grid, name="grid", max_workers=SWEEP_MAX_WORKERS,
+                 cache_dir=SWEEP_CACHE_DIR, task_size=SWEEP_TASK_SIZE, flush_size=SWEEP_FLUSH_SIZE):
+        """
+        Initializes the parameter sweep runner.
+        Args:
+            evaluate (callable): Module-level evaluator(data, start, end, params) -> metrics dict.
+            name (str): Sweep name (part of the run directory).
+            max_workers (int): Process pool size (None = one per available core).
+            cache_dir (str): Directory for memory-mapped data & result chunks.
+            task_size (int): Configs per worker task.
+            flush_size (int): Result rows buffered before writing a chunk.
+        """
+        self.evaluate = evaluate
+        self.name = name
+        available_cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+        self.max_workers = max(1, min(max_workers or available_cores, available_cores))
+        self.cache_dir = cache_dir
+        self.task_size = task_size
+        self.flush_size = flush_size
+        self.run_dir = None
+
+    @staticmethod
+    def grid_configurations(param_grid):
+        """
+        Expands a parameter grid.
+        Args:
+            param_grid (dict): {name: [values]}.
+        Returns:
+            list: Every combination as a dict.
+        """
+        names = sorted(param_grid)
+        return [dict(zip(names, values)) for values in itertools.product(*(param_grid[name] for name in names))]
+
+    @staticmethod
+    def random_configurations(param_space, n_samples, seed=SWEEP_SEED):
+        """
+        Samples configurations for a random search (deterministic for a given seed, so runs resume).
+        Args:
+            param_space (dict): {name: (low, high)} for uniform ranges (ints if both bounds are ints)
+                or {name: [choices]}.
+            n_samples (int): Number of configurations.
+            seed (int): Random seed.
+        Returns:
+            list: Sampled configurations.
+        """
+        rng = np.random.default_rng(seed)
+        configs = []
+        for _ in range(n_samples):
+            config = {}
+            for name in sorted(param_space):
+                space = param_space[name]
+                if isinstance(space, tuple):
+                    low, high = space
+                    config[name] = int(rng.integers(low, high + 1)) if isinstance(low, int) and isinstance(high, int) \
+                        else float(rng.uniform(low, high))
+                else:
+                    config[name] = space[int(rng.integers(len(space)))]
+            configs.append(config)
+        return configs
+
+    def prepare_data(self, df, configs, splits):
+        """
+        Writes the numeric columns once as .npy files that every worker memory-maps, and
+        selects the run directory (keyed by data, configs, splits & evaluator, so reruns resume).
+        Args:
+            df (pd.DataFrame): Market data.
+            configs (list): Configurations.
+            splits (list): Walk-forward windows.
+        Returns:
+            list: Column names written.
+        """
+        arrays = {}
+        if "timestamp" in df.columns:
+            arrays["timestamp"] = pd.to_datetime(df["timestamp"]).to_numpy().astype("datetime64[ns]").astype(np.int64) / 1e9
+        for column in df.select_dtypes(include=[np.number]).columns:
+            arrays[column] = df[column].to_numpy(dtype=np.float64)
+
+        digest = hashlib.sha1()
+        for column in sorted(arrays):
+            digest.update(column.encode())
+            digest.update(np.ascontiguousarray(arrays[column]).tobytes())
+        digest.update(json.dumps({"configs": configs, "splits": splits, "evaluate": self.evaluate.__name__},
+                                 sort_keys=True, default=str).encode())
+        self.run_dir = os.path.join(self.cache_dir, f"{self.name}_{digest.hexdigest()[:12]}")
+
+        data_dir = os.path.join(self.run_dir, "data")
+        os.makedirs(data_dir, exist_ok=True)
+        for column, values in arrays.items():
+            path = os.path.join(data_dir, f"{column}.npy")
+            if not os.path.exists(path):
+                np.save(f"{path}.tmp.npy", values)
+                os.replace(f"{path}.tmp.npy", path)
+        return list(arrays)
+
+    def load_results(self):
+        """
+        Loads all result chunks of the current run into one columnar table.
+        Returns:
+            pd.DataFrame: One row per (config, fold, segment).
+        """
+        parts = sorted(glob.glob(os.path.join(self.run_dir, "results", "part-*.npz"))) if self.run_dir else []
+        frames = []
+        for part in parts:
+            with np.load(part, allow_pickle=False) as chunk:
+                frames.append(pd.DataFrame({column: chunk[column] for column in chunk.files}))
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def _flush(self, rows):
+        """Atomically writes buffered rows as one columnar chunk."""
+        results_dir = os.path.join(self.run_dir, "results")
+        os.makedirs(results_dir, exist_ok=True)
+        index = len(glob.glob(os.path.join(results_dir, "part-*.npz")))
+        frame = pd.DataFrame(rows)
+        tmp_path = os.path.join(results_dir, f"part-{index:06d}.tmp.npz")
+        arrays = {column: frame[column].to_numpy() for column in frame.columns}
+        # Strings are stored as fixed-width unicode so chunks load without pickle
+        np.savez(tmp_path, **{column: values.astype(str) if values.dtype == object else values
+                              for column, values in arrays.items()})
+        os.replace(tmp_path, os.path.join(results_dir, f"part-{index:06d}.npz"))
+
+    def run(self, df, configs, splits=None):
+        """
+        Evaluates every configuration on every window across a process pool.
+        Args:
+            df (pd.DataFrame): Market data.
+            configs (list): Configurations (see grid_configurations / random_configurations).
+            splits (list): Walk-forward (train_start, train_end, test_end) windows; None = whole history.
+        Returns:
+            pd.DataFrame: Results table (including rows finished by earlier, interrupted runs).
+        """
+        columns = self.prepare_data(df, configs, splits)
+        windows = {0: [("full", 0, len(df))]} if not splits else {
+            fold: [("train", train_start, train_end), ("test", train_end, test_end)]
+            for fold, (train_start, train_end, test_end) in enumerate(splits)
+        }
+
+        done = self.load_results()
+        done_keys = set(zip(done["config_id"], done["fold"])) if len(done) else set()
+        pending = [(config_id, fold) for fold in windows for config_id in range(len(configs))
+                   if (config_id, fold) not in done_keys]
+        Logger.info(f"🚀 Sweep '{self.name}': {len(configs)} configs x {len(windows)} folds, "
+                    f"{len(done_keys)} done, {len(pending)} pending, {self.max_workers} workers")
+
+        batches = [
+            [(config_id, fold, segment, start, end, configs[config_id])
+             for config_id, fold in pending[i:i + self.task_size]
+             for segment, start, end in windows[fold]]
+            for i in range(0, len(pending), self.task_size)
+        ]
+        buffer = []
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=ctx, initializer=_init_sweep_worker,
+                                 initargs=(os.path.join(self.run_dir, "data"), columns)) as pool:
+            futures = [pool.submit(_run_sweep_task, self.evaluate, batch) for batch in batches]
+            for completed, future in enumerate(as_completed(futures), 1):
+                try:
+                    buffer.extend(future.result())
+                except Exception as e:
+                    Logger.error(f"❌ Sweep task failed: {e}")
+                if len(buffer) >= self.flush_size:
+                    self._flush(buffer)  # ✅ Stream results to disk so an interrupted sweep resumes here
+                    buffer = []
+                    Logger.info(f"📊 Sweep progress: {completed}/{len(futures)} tasks")
+        if buffer:
+            self._flush(buffer)
+
+        return self.load_results()
+
+    def walk_forward(self, df, configs, train_bars=WALK_FORWARD_TRAIN_BARS, test_bars=WALK_FORWARD_TEST_BARS,
+                     step=None, metric="sharpe"):
+        """
+        Walk-forward optimization: pick the best config on each training window and score it
+        on the following out-of-sample window.
+        Args:
+            df (pd.DataFrame): Market data.
+            configs (list): Configurations.
+            train_bars, test_bars, step (int): Window sizes (see walk_forward_splits).
+            metric (str): Metric maximised on the training window.
+        Returns:
+            tuple: (full results table, per-fold out-of-sample summary)
+        """
+        splits = walk_forward_splits(len(df), train_bars, test_bars, step)
+        if not splits:
+            Logger.warning("⚠️ Not enough data for a single walk-forward fold.")
+            return pd.DataFrame(), pd.DataFrame()
+
+        results = self.run(df, configs, splits)
+        train = results[results["segment"] == "train"].dropna(subset=[metric])
+        test = results[results["segment"] == "test"].set_index(["fold", "config_id"])
+
+        best = train.loc[train.groupby("fold")[metric].idxmax(), ["fold", "config_id", metric]]
+        best = best.rename(columns={metric: f"train_{metric}"})
+        summary = best.join(test, on=["fold", "config_id"], rsuffix="_test").reset_index(drop=True)
+        Logger.info(f"✅ Walk-forward: {len(summary)} folds, mean out-of-sample {metric} "
+                    f"{summary[metric].mean():.3f}, total out-of-sample PnL {summary['pnl'].sum():.2f}")
+        return results, summary
+
+# 🚀 EXAMPLE USAGE
+if __name__ == "__main__":
+    from core.data_preprocessing import load_market_data
+
+    market_data = load_market_data()
+    sweep = ParameterSweep(evaluate_grid, name="grid")
+    grid_configs = sweep.grid_configurations({
+        "grid_size": [6, 10, 14],
+        "grid_spacing": [0.2, 0.5, 1.0],
+        "risk_per_trade": [0.01, 0.02],
+        "stop_loss_percent": [0.02, 0.05],
+        "take_profit_percent": [0.03, 0.06],
+    })
+    _, oos_summary = sweep.walk_forward(market_data, grid_configs)
+    print(oos_summary)
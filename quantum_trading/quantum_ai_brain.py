@@ -3,14 +3,22 @@
 # 🧠 QUANTUM AI BRAIN – EXPERIMENTAL QUANTUM MODEL 🧠
 # ==================================================
 
+import hashlib
 import numpy as np
 import pennylane as qml  # Quantum Computing Framework
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import Dense, Dropout
+from quantum_trading.quantum_circuits import ry_cnot_expval
+from config import QUANTUM_BACKEND
 
 class QuantumAI:
-    def __init__(self):
-        """Initialize the quantum-enhanced AI model."""
+    def __init__(self, backend=QUANTUM_BACKEND):
+        """
+        Initialize the quantum-enhanced AI model.
+        Args:
+            backend (str): "analytic" (closed form, batched) or "pennylane" (reference simulator).
+        """
+        self.backend = backend
         self.qnode = self._create_quantum_node()
         self.model = self._build_classical_model()
 
@@ -29,9 +37,9 @@ class QuantumAI:
         return quantum_circuit
 
     def _build_classical_model(self):
-        """Builds the hybrid quantum-classical neural network."""
+        """Builds the hybrid quantum-classical neural network (inputs: market state + circuit <Z0>)."""
         model = Sequential([
-            Dense(64, activation="relu", input_shape=(2,)),
+            Dense(64, activation="relu", input_shape=(3,)),
             Dropout(0.2),
             Dense(32, activation="relu"),
             Dense(1, activation="sigmoid")  # Predicts probability of market going up or down
@@ -39,6 +47,32 @@ class QuantumAI:
         model.compile(optimizer="adam", loss="binary_crossentropy", metrics=["accuracy"])
         return model
 
+    def weights_fingerprint(self):
+        """
+        Content hash of the network weights & circuit backend (keys cached signals, e.g. the signal tape).
+        Returns:
+            str: Hex digest.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self.backend.encode())
+        for weights in self.model.get_weights():
+            digest.update(str(weights.shape).encode())
+            digest.update(np.ascontiguousarray(weights).tobytes())
+        return digest.hexdigest()
+
+    def evaluate_circuit(self, market_states):
+        """
+        Evaluates the quantum circuit for a whole batch of market states.
+        Args:
+            market_states (np.array): Circuit weights, shape (batch, 2).
+        Returns:
+            np.array: <Z0> expectation value per state.
+        """
+        market_states = np.atleast_2d(np.asarray(market_states, dtype=np.float64))
+        if self.backend == "pennylane":
+            return np.array([float(self.qnode(state)) for state in market_states])
+        return ry_cnot_expval(market_states[:, 0], market_states[:, 1])
+
     def predict_market_direction(self, market_state):
         """
         Uses the quantum circuit and classical AI model to predict market movement.
@@ -47,14 +81,22 @@ class QuantumAI:
         Returns:
             str: "BUY", "SELL", or "HOLD".
         """
-        quantum_output = self.qnode(market_state)
-        ai_prediction = self.model.predict(np.array([market_state]), verbose=0)
-        
-        if ai_prediction > 0.6:
-            return "BUY"
-        elif ai_prediction < 0.4:
-            return "SELL"
-        return "HOLD"
+        return str(self.predict_market_directions([market_state])[0])
+
+    def predict_market_directions(self, market_states):
+        """
+        Predicts market movement for a batch of market states in one model call.
+        Args:
+            market_states (np.array): Market indicators in quantum representation, shape (batch, 2).
+        Returns:
+            np.array: "BUY", "SELL", or "HOLD" per state.
+        """
+        market_states = np.atleast_2d(np.asarray(market_states, dtype=np.float64))
+        quantum_output = self.evaluate_circuit(market_states)
+        hybrid_features = np.column_stack([market_states, quantum_output])  # ✅ Circuit output feeds the network
+        ai_prediction = self.model.predict(hybrid_features, verbose=0).ravel()
+
+        return np.where(ai_prediction > 0.6, "BUY", np.where(ai_prediction < 0.4, "SELL", "HOLD"))
 
 # 🚀 EXAMPLE USAGE
 if __name__ == "__main__":
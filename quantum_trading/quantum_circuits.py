@@ -0,0 +1,20 @@
+# quantum_circuits.py
+# ==================================================
+# ⚛️ QUANTUM CIRCUITS – FAST BATCHED CIRCUIT EVALUATION ⚛️
+# ==================================================
+
+import numpy as np
+
+
+def ry_cnot_expval(theta0, theta1=None):
+    """
+    Closed-form <Z0> of the RY(theta0)⊗RY(theta1) → CNOT(0, 1) circuit.
+    CNOT is controlled on wire 0, so it leaves Z0 unchanged and <Z0> = cos(theta0).
+    Args:
+        theta0 (float or np.array): RY angle(s) on wire 0.
+        theta1 (float or np.array): RY angle(s) on wire 1 (does not affect <Z0>).
+    Returns:
+        np.array: Expectation value for every input in the batch.
+    """
+    return np.cos(np.asarray(theta0, dtype=np.float64))
+
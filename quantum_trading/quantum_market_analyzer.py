@@ -6,24 +6,23 @@
 import numpy as np
 import pennylane as qml
 import pandas as pd
+from quantum_trading.quantum_circuits import ry_cnot_expval
+from config import QUANTUM_BACKEND
 
 class QuantumMarketAnalyzer:
-    def __init__(self, num_qubits=2):
+    def __init__(self, num_qubits=2, backend=QUANTUM_BACKEND):
         """
         Initializes the quantum market analysis module.
         Args:
             num_qubits (int): Number of qubits used in quantum modeling.
+            backend (str): "analytic" (closed form, batched) or "pennylane" (reference simulator).
         """
+        self.backend = backend
         self.dev = qml.device("default.qubit", wires=num_qubits)
+        self.circuit = self._create_circuit()  # ✅ Built once, not on every call
 
-    def quantum_wave_function(self, price_movement):
-        """
-        Encodes price movement as a quantum wave function.
-        Args:
-            price_movement (float): Market price movement percentage.
-        Returns:
-            float: Quantum measurement outcome (market prediction).
-        """
+    def _create_circuit(self):
+        """Creates the PennyLane reference circuit."""
         @qml.qnode(self.dev)
         def circuit(weight):
             """Quantum circuit to analyze market fluctuations."""
@@ -32,8 +31,22 @@ class QuantumMarketAnalyzer:
             qml.CNOT(wires=[0, 1])
             return qml.expval(qml.PauliZ(0))
 
-        weight = np.tanh(price_movement)  # Normalize input data for quantum circuit
-        return circuit(weight)
+        return circuit
+
+    def quantum_wave_function(self, price_movement):
+        """
+        Encodes price movement as a quantum wave function.
+        Args:
+            price_movement (float or np.array): Market price movement percentage(s).
+        Returns:
+            float or np.array: Quantum measurement outcome (market prediction) per input.
+        """
+        weight = np.tanh(np.asarray(price_movement, dtype=np.float64))  # Normalize input data for quantum circuit
+        if self.backend == "pennylane":
+            values = np.array([float(self.circuit(w)) for w in np.ravel(weight)])
+        else:
+            values = ry_cnot_expval(weight, weight)
+        return values.reshape(np.shape(weight)) if np.ndim(weight) else float(np.ravel(values)[0])
 
     def calculate_quantum_correlation(self, asset1_prices, asset2_prices):
         """
@@ -64,6 +77,26 @@ class QuantumMarketAnalyzer:
             "market_correlation": self.calculate_quantum_correlation(df["close"], df["volume"])
         }
 
+    def get_market_analysis_history(self, df):
+        """
+        Computes the market analysis for every bar of a history in one vectorized pass.
+        Row i matches get_market_analysis(df.iloc[:i + 1]).
+        Args:
+            df (pd.DataFrame): Market data.
+        Returns:
+            pd.DataFrame: "market_wave_function" & "market_correlation" per bar (NaN where undefined).
+        """
+        price_movement = df["close"].pct_change().to_numpy()
+        wave_function = np.full(len(df), np.nan)
+        valid = ~np.isnan(price_movement)
+        wave_function[valid] = self.quantum_wave_function(price_movement[valid])
+
+        expanding_corr = df["close"].expanding(min_periods=2).corr(df["volume"]).to_numpy()
+        return pd.DataFrame({
+            "market_wave_function": np.round(wave_function, 5),
+            "market_correlation": np.round(np.exp(-np.abs(expanding_corr)), 5),
+        }, index=df.index)
+
 # 🚀 EXAMPLE USAGE
 if __name__ == "__main__":
     data = {
@@ -4,11 +4,13 @@
 # ==================================================
 
 import time
+import hashlib
+import numpy as np
 import pandas as pd
 from quantum_trading.quantum_ai_brain import QuantumAI
 from quantum_trading.quantum_market_analyzer import QuantumMarketAnalyzer
 from core.exchange_connector import ExchangeConnector
-from config import PAIR, MAX_QUANTUM_TRADES
+from config import PAIR, MAX_QUANTUM_TRADES, QUANTUM_BACKEND
 
 class QuantumTradingExecutor:
     def __init__(self):
@@ -42,6 +44,35 @@ class QuantumTradingExecutor:
         self.trade_count += 1
         print(f"✅ Quantum {quantum_prediction} Trade Executed: {order}")
 
+    def weights_fingerprint(self):
+        """
+        Identifies what the signals depend on: the QuantumAI weights plus the circuit backends in use.
+        Returns:
+            str: Hex digest.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self.quantum_ai.weights_fingerprint().encode())
+        for backend in (QUANTUM_BACKEND, self.quantum_ai.backend, self.market_analyzer.backend):
+            digest.update(f"|{backend}".encode())
+        return digest.hexdigest()
+
+    def generate_signal_history(self, df):
+        """
+        Computes the quantum signal for every bar of a history in one batched pass.
+        Args:
+            df (pd.DataFrame): Market data.
+        Returns:
+            pd.Series: "BUY", "SELL", or "HOLD" per bar ("HOLD" where there is too little data).
+        """
+        insights = self.market_analyzer.get_market_analysis_history(df)
+        states = insights[["market_wave_function", "market_correlation"]].to_numpy()
+        ready = ~np.isnan(states).any(axis=1)
+
+        signals = np.full(len(df), "HOLD", dtype=object)
+        if ready.any():
+            signals[ready] = self.quantum_ai.predict_market_directions(states[ready])
+        return pd.Series(signals, index=df.index, name="quantum_signal")
+
 # 🚀 EXAMPLE USAGE
 if __name__ == "__main__":
     df = pd.read_csv("market_data.csv")  # Example market data
@@ -8,6 +8,9 @@ import logging
 from core.exchange_connector import ExchangeConnector
 from ai_models.predictive_ai import PredictiveAI
 from core.risk_management import validate_trade
+from simulation.vectorized_backtest import VectorizedBacktester
+from simulation.trade_store import TradeStore
+from simulation.signal_tape import SignalTape
 from config import PAIR, BACKTEST_START_DATE, BACKTEST_END_DATE
 
 # ✅ Configure Logging
@@ -25,7 +28,8 @@ class BacktestEngine:
         self.exchange = ExchangeConnector()
         self.ai_model = PredictiveAI()
         self.initial_balance = {"USDT": 1000, "PI": 0}  # Simulated balance
-        self.trade_history = []
+        self.trade_history = TradeStore(self.initial_balance["USDT"])
+        self.metrics = {}
 
     def fetch_historical_data(self):
         """
@@ -76,26 +80,22 @@ class BacktestEngine:
             self.initial_balance["USDT"] += trade_size * entry_price
 
         # ✅ Store Trade History
-        self.trade_history.append(
-            {
-                "timestamp": market_data["timestamp"].iloc[-1],
-                "signal": trade_signal,
-                "entry_price": entry_price,
-                "position_size": trade_size,
-                "usdt_balance": self.initial_balance["USDT"],
-                "pi_balance": self.initial_balance["PI"],
-            }
-        )
+        self.trade_history.record_trade(market_data["timestamp"].iloc[-1], trade_signal, entry_price, trade_size)
 
-    def run_backtest(self):
+    def run_backtest(self, vectorized=False):
         """
         Executes the backtest simulation.
+        Args:
+            vectorized (bool): Predict every bar in one batched pass and derive PnL with array operations.
         """
         df = self.fetch_historical_data()
         if df is None:
             print("⚠️ Backtest aborted due to missing data.")
             return
 
+        if vectorized:
+            return self.run_vectorized_backtest(df)
+
         print("🚀 Running Backtest...")
         for i in range(30, len(df)):
             market_data = df.iloc[:i]  # Use past data up to the current point
@@ -106,15 +106,43 @@ class BacktestEngine:
             if signal != "HOLD":
                 self.execute_trade(signal, market_data)
 
+            price = market_data["close"].iloc[-1]
+            position_value = self.initial_balance["PI"] * price
+            self.trade_history.record_equity(market_data["timestamp"].iloc[-1],
+                                             self.initial_balance["USDT"] + position_value, position_value)
+
         # ✅ Backtest Summary
         final_balance = self.initial_balance["USDT"] + (
             self.initial_balance["PI"] * df.iloc[-1]["close"]
         )
         profit_loss = final_balance - 1000
-        print(f"✅ Backtest Complete! Final Balance: {final_balance:.2f} USDT (PnL: {profit_loss:.2f} USDT)")
+        self.metrics = self.trade_history.metrics()
+        print(f"✅ Backtest Complete! Final Balance: {final_balance:.2f} USDT (PnL: {profit_loss:.2f} USDT), "
+              f"Sharpe: {self.metrics['sharpe']:.2f}, Max Drawdown: {self.metrics['max_drawdown']:.2%}")
+        logging.info(
+            f"🏆 Backtest Results: Final Balance = {final_balance:.2f} USDT, PnL = {profit_loss:.2f} USDT | "
+            f"Metrics: {self.metrics}"
+        )
+
+    def run_vectorized_backtest(self, df):
+        """
+        Runs the backtest with batched AI signals & array-based fills, fees and slippage.
+        Args:
+            df (DataFrame): Historical market data.
+        Returns:
+            dict: Backtest result (equity curve, positions, trades & summary).
+        """
+        print("🚀 Running Vectorized Backtest...")
+        initial_usdt = self.initial_balance["USDT"]
+        result = VectorizedBacktester(initial_balance=initial_usdt).run_strategy(df, self.ai_model, SignalTape())
+        self.trade_history = result["store"]
+        self.metrics = result["metrics"]
+
+        print(f"✅ Backtest Complete! Final Balance: {result['final_balance']:.2f} USDT (PnL: {result['pnl']:.2f} USDT)")
         logging.info(
-            f"🏆 Backtest Results: Final Balance = {final_balance:.2f} USDT, PnL = {profit_loss:.2f} USDT"
+            f"🏆 Backtest Results: Final Balance = {result['final_balance']:.2f} USDT, PnL = {result['pnl']:.2f} USDT"
         )
+        return result
 
 # 🚀 Run Backtest
 if __name__ == "__main__":
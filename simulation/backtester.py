@@ -4,11 +4,13 @@
 # ==================================================
 
 import pandas as pd
-import numpy as np
 import logging
 from strategies.grid_trading import GridTrading
 from strategies.hedge_trading import HedgeTrading
 from ai_models.predictive_ai import PredictiveAI
+from simulation.vectorized_backtest import VectorizedBacktester
+from simulation.trade_store import TradeStore
+from simulation.signal_tape import SignalTape
 from config import BACKTEST_START_DATE, BACKTEST_END_DATE, PAIR
 
 # ✅ Configure Logging
@@ -29,7 +31,8 @@ class Backtester:
         self.initial_balance = 10000  # Start with 10,000 USDT
         self.balance = self.initial_balance
         self.position = 0
-        self.trade_history = []
+        self.trade_history = TradeStore(self.initial_balance)
+        self.metrics = {}
 
         # Select strategy
         if strategy == "grid":
@@ -64,50 +67,84 @@ class Backtester:
             logging.error(f"❌ Error loading historical data: {e}")
             return None
 
-    def execute_trade(self, trade_type, price):
+    def execute_trade(self, trade_type, price, timestamp=0.0):
         """
         Simulates trade execution during backtesting.
         Args:
             trade_type (str): "BUY" or "SELL".
             price (float): Trade execution price.
+            timestamp: Bar time of the fill.
         """
         trade_size = self.balance * 0.02 / price  # Risk 2% of balance per trade
 
         if trade_type == "BUY":
             self.position += trade_size
             self.balance -= trade_size * price
+            self.trade_history.record_trade(timestamp, "BUY", price, trade_size)
         elif trade_type == "SELL" and self.position > 0:
+            self.trade_history.record_trade(timestamp, "SELL", price, self.position)
             self.balance += self.position * price
             self.position = 0
 
-        self.trade_history.append((trade_type, price, self.balance))
-
-    def run_backtest(self):
+    def run_backtest(self, vectorized=False):
         """
         Runs a backtest using historical market data.
+        Args:
+            vectorized (bool): Compute all signals in one batched pass and derive PnL with array operations.
         """
         df = self.load_historical_data()
         if df is None:
             print("⚠️ No historical data available. Backtest aborted.")
             return
 
+        if vectorized:
+            return self.run_vectorized_backtest(df)
+
         print("🚀 Running Backtest...")
         for i in range(len(df) - 1):
             market_data = df.iloc[: i + 1]
             signal = self.strategy_instance.generate_trade_signal(market_data)
+            price = df.iloc[i]["close"]
+            timestamp = df.iloc[i]["timestamp"]
 
             if signal == "BUY":
-                self.execute_trade("BUY", df.iloc[i]["close"])
+                self.execute_trade("BUY", price, timestamp)
             elif signal == "SELL":
-                self.execute_trade("SELL", df.iloc[i]["close"])
+                self.execute_trade("SELL", price, timestamp)
+            self.trade_history.record_equity(timestamp, self.balance + self.position * price, self.position * price)
 
         final_balance = self.balance + (self.position * df.iloc[-1]["close"])
         roi = (final_balance - self.initial_balance) / self.initial_balance * 100
+        self.metrics = self.trade_history.metrics()
 
-        print(f"✅ Backtest Complete: ROI = {roi:.2f}%")
-        logging.info(f"📈 Final ROI: {roi:.2f}%")
+        print(f"✅ Backtest Complete: ROI = {roi:.2f}%, Sharpe = {self.metrics['sharpe']:.2f}, "
+              f"Max Drawdown = {self.metrics['max_drawdown']:.2%}")
+        logging.info(f"📈 Final ROI: {roi:.2f}% | Metrics: {self.metrics}")
         return roi
 
+    def run_vectorized_backtest(self, df):
+        """
+        Runs the vectorized backtest mode (strategies with generate_signal_history only).
+        Args:
+            df (pd.DataFrame): Historical market data.
+        Returns:
+            float: ROI percentage.
+        """
+        if not hasattr(self.strategy_instance, "generate_signal_history"):
+            raise ValueError(f"Strategy '{self.strategy}' does not support vectorized backtesting.")
+
+        print("🚀 Running Vectorized Backtest...")
+        result = VectorizedBacktester(initial_balance=self.initial_balance).run_strategy(df, self.strategy_instance, SignalTape())
+        self.balance = result["final_balance"]
+        self.position = 0
+        self.trade_history = result["store"]
+        self.metrics = result["metrics"]
+
+        print(f"✅ Backtest Complete: ROI = {result['roi']:.2f}% ({result['num_trades']} trades), "
+              f"Sharpe = {self.metrics['sharpe']:.2f}, Max Drawdown = {self.metrics['max_drawdown']:.2%}")
+        logging.info(f"📈 Final ROI: {result['roi']:.2f}% | Metrics: {self.metrics}")
+        return result["roi"]
+
 # 🚀 EXAMPLE USAGE
 if __name__ == "__main__":
     backtester = Backtester(strategy="grid")  # Choose "grid", "hedge", or "ai"
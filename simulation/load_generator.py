@@ -0,0 +1,254 @@
+# load_generator.py
+# ==================================================
+# 📈 LOAD GENERATOR – ORDER-PATH THROUGHPUT & LATENCY UNDER LOAD 📈
+# ==================================================
+
+import json
+import time
+import random
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from aiohttp import web
+from requests.adapters import HTTPAdapter
+from custom_logging.logger import Logger
+from config import (
+    PAIR, LOAD_TEST_CONCURRENCY, LOAD_TEST_RATE, LOAD_TEST_DURATION, STANDIN_LATENCY, STANDIN_RATE_LIMIT
+)
+
+
+class ExchangeStandIn:
+    def __init__(self, latency=STANDIN_LATENCY, jitter=0.5, error_rate=0.0, rate_limit=STANDIN_RATE_LIMIT,
+                 price=1.0, host="127.0.0.1", port=0):
+        """
+        Local HTTP stand-in for the MEXC order & ticker endpoints, run on its own thread.
+        Args:
+            latency (float): Mean service time per request (seconds).
+            jitter (float): Log-normal sigma of the service time.
+            error_rate (float): Fraction of requests answered with an exchange error.
+            rate_limit (float): Requests per second before HTTP 429 (None = unlimited).
+            price (float): Price served by the ticker.
+            host (str): Bind address.
+            port (int): Bind port (0 = any free port).
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.price = price
+        self.host = host
+        self.port = port
+        self.tokens = rate_limit or 0.0
+        self.last_refill = time.monotonic()
+        self.next_order_id = 1
+        self.stats = {"requests": 0, "throttled": 0, "errors": 0, "orders": 0}
+        self.loop = None
+        self.runner = None
+        self.thread = None
+        self.ready = threading.Event()
+
+    def _take_token(self):
+        """Token-bucket rate limit; False means the request is throttled."""
+        if not self.rate_limit:
+            return True
+        now = time.monotonic()
+        self.tokens = min(self.rate_limit, self.tokens + (now - self.last_refill) * self.rate_limit)
+        self.last_refill = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+    async def _respond(self, payload):
+        """Applies throttling, service time & injected errors around a payload."""
+        self.stats["requests"] += 1
+        if not self._take_token():
+            self.stats["throttled"] += 1
+            return web.json_response({"code": 429, "msg": "Too many requests"}, status=429)
+        if self.latency:
+            await asyncio.sleep(self.latency * random.lognormvariate(-0.5 * self.jitter ** 2, self.jitter))
+        if random.random() < self.error_rate:
+            self.stats["errors"] += 1
+            return web.json_response({"code": 500, "msg": "Internal error"}, status=500)
+        return web.json_response(payload)
+
+    async def _handle_order(self, request):
+        order_id = self.next_order_id
+        self.next_order_id += 1
+        self.stats["orders"] += 1
+        return await self._respond({"code": 200, "data": {
+            "orderId": order_id, "symbol": request.query.get("symbol"), "side": request.query.get("side"),
+            "quantity": request.query.get("quantity"), "status": "FILLED",
+        }})
+
+    async def _handle_ticker(self, request):
+        return await self._respond({"symbol": request.query.get("symbol"), "price": str(self.price)})
+
+    def _serve(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        app = web.Application()
+        app.router.add_post("/api/v3/order", self._handle_order)
+        app.router.add_get("/api/v3/ticker/price", self._handle_ticker)
+        self.runner = web.AppRunner(app, access_log=None)
+        self.loop.run_until_complete(self.runner.setup())
+        site = web.TCPSite(self.runner, self.host, self.port)
+        self.loop.run_until_complete(site.start())
+        self.port = self.runner.addresses[0][1]
+        self.ready.set()
+        self.loop.run_forever()
+        self.loop.run_until_complete(self.runner.cleanup())
+        self.loop.close()
+
+    def start(self):
+        """
+        Starts the stand-in in a background thread.
+        Returns:
+            str: Base URL to assign to ExchangeConnector.base_url.
+        """
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+        self.ready.wait()
+        return f"http://{self.host}:{self.port}/api/v3"
+
+    def stop(self):
+        """Stops the stand-in."""
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+
+
+def build_order_target(target, base_url, pool_size=LOAD_TEST_CONCURRENCY):
+    """
+    Builds a zero-argument callable exercising one layer of the order stack against the stand-in.
+    Args:
+        target (str): "connector" (ExchangeConnector.place_order), "order_manager"
+            (OrderManager.execute_order) or "order_router" (OrderRouter.place_order).
+        base_url (str): Stand-in base URL.
+        pool_size (int): HTTP connection pool size (one connection per in-flight request).
+    Returns:
+        callable: Sends one order; returns None on failure.
+    """
+    from core.exchange_connector import ExchangeConnector
+    from core.order_manager import OrderManager
+    from core.order_router import OrderRouter
+    from core.order_pipeline import OrderPipeline
+
+    connector = ExchangeConnector()
+    connector.base_url = base_url
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    connector.session.mount("http://", adapter)
+
+    if target == "connector":
+        return lambda: connector.place_order(PAIR, "buy", 10.0)
+    if target == "order_manager":
+        manager = OrderManager(connector)
+        decision = {"symbol": PAIR, "position_size": 10.0, "entry_price": 1.0}
+        return lambda: manager.execute_order("BUY", decision)
+    if target == "order_router":
+        router = OrderRouter(connector, OrderPipeline(connector, max_workers=pool_size))
+        market_data = pd.DataFrame({"close": [1.0]})
+        balance = {"USDT": 10000.0, "PI": 10000.0}
+        return lambda: router.place_order("BUY", market_data, balance)
+    raise ValueError("Invalid target. Choose 'connector', 'order_manager', or 'order_router'.")
+
+
+class LoadGenerator:
+    # Histogram bucket upper bounds in milliseconds (log-spaced, 0.1 ms – 10 s)
+    BUCKETS_MS = np.logspace(-1, 4, 26)
+
+    def __init__(self, call, concurrency=LOAD_TEST_CONCURRENCY, rate=LOAD_TEST_RATE, duration=LOAD_TEST_DURATION):
+        """
+        Drives a synchronous order call at a target rate with bounded concurrency.
+        Args:
+            call (callable): Zero-argument call sending one order (None / exception = failure).
+            concurrency (int): Max requests in flight.
+            rate (float): Target requests per second (None = closed loop at full concurrency).
+            duration (float): Seconds to generate load.
+        """
+        self.call = call
+        self.concurrency = concurrency
+        self.rate = rate
+        self.duration = duration
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        latencies = []
+        outcomes = {"succeeded": 0, "failed": 0}
+
+        async def send(scheduled):
+            async with semaphore:
+                try:
+                    ok = await loop.run_in_executor(executor, self.call) is not None
+                except Exception:
+                    ok = False
+            # ✅ Latency from the intended send time, so queueing behind a saturated stack is counted
+            latencies.append(time.perf_counter() - scheduled)
+            outcomes["succeeded" if ok else "failed"] += 1
+
+        start = time.perf_counter()
+        if self.rate:
+            tasks = []
+            sent = 0
+            while True:
+                scheduled = start + sent / self.rate
+                if scheduled - start >= self.duration:
+                    break
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                tasks.append(asyncio.create_task(send(scheduled)))
+                sent += 1
+            await asyncio.gather(*tasks)
+        else:
+            async def worker():
+                while time.perf_counter() - start < self.duration:
+                    await send(time.perf_counter())
+            await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        elapsed = time.perf_counter() - start
+        executor.shutdown(wait=True)
+        return np.asarray(latencies), outcomes, elapsed
+
+    def run(self):
+        """
+        Generates load and summarizes it.
+        Returns:
+            dict: Throughput, error rate, latency percentiles (ms) & histogram.
+        """
+        latencies, outcomes, elapsed = asyncio.run(self._run())
+        latencies_ms = latencies * 1000
+        completed = len(latencies)
+        counts, _ = np.histogram(latencies_ms, bins=np.concatenate(([0.0], self.BUCKETS_MS, [np.inf])))
+        percentiles = {"p50": 50, "p90": 90, "p99": 99, "p99.9": 99.9}
+        return {
+            "concurrency": self.concurrency,
+            "target_rate": self.rate,
+            "duration": round(elapsed, 3),
+            "requests": completed,
+            "succeeded": outcomes["succeeded"],
+            "failed": outcomes["failed"],
+            "error_rate": outcomes["failed"] / completed if completed else 0.0,
+            "achieved_rate": completed / elapsed if elapsed else 0.0,
+            "throughput": outcomes["succeeded"] / elapsed if elapsed else 0.0,
+            "latency_ms": {
+                **{name: float(np.percentile(latencies_ms, q)) if completed else None for name, q in percentiles.items()},
+                "mean": float(latencies_ms.mean()) if completed else None,
+                "max": float(latencies_ms.max()) if completed else None,
+            },
+            "histogram_ms": {
+                "upper_bounds": self.BUCKETS_MS.round(3).tolist() + ["inf"],
+                "counts": counts.tolist(),
+            },
+        }
+
+
+def write_report(report, path):
+    """Writes a load-test report as JSON."""
+    with open(path, "w") as file:
+        json.dump(report, file, indent=2)
+    Logger.info(f"📄 Load-test report written to {path}")
@@ -0,0 +1,293 @@
+# order_book_replay.py
+# ==================================================
+# ⏪ ORDER BOOK REPLAY – QUEUE-AWARE HFT SIMULATION ON RECORDED DEPTH ⏪
+# ==================================================
+
+import time
+from data.order_book_recorder import read_book_file, SNAPSHOT, BID, ASK
+from simulation.simulated_exchange import SimulatedExchange
+from custom_logging.logger import Logger
+from config import (
+    PAIR, BACKTEST_FEE_RATE, BACKTEST_SLIPPAGE, SIM_MAKER_FEE_RATE, SIM_LATENCY, ORDER_BOOK_DEPTH, HFT_TRADE_INTERVAL
+)
+
+BOOK_SIDE = {"BUY": BID, "SELL": ASK}
+
+
+class OrderBookReplay(SimulatedExchange):
+    def __init__(self, pair=PAIR, initial_balance=10000, initial_base=0.0, latency=SIM_LATENCY,
+                 taker_fee=BACKTEST_FEE_RATE, maker_fee=SIM_MAKER_FEE_RATE, slippage=BACKTEST_SLIPPAGE,
+                 depth=ORDER_BOOK_DEPTH):
+        """
+        Simulated exchange driven by a recorded depth session (see OrderBookRecorder).
+        Market & marketable limit orders walk the recorded book; resting limit orders join the back of
+        the visible queue at their price and are filled as that queue is consumed.
+        Queue model:
+            - Quantity removed at the best level is treated as executions: it consumes the queue ahead of
+              us first, then fills us.
+            - Quantity removed at deeper levels is treated as cancellations spread evenly over the queue.
+            - Quantity added joins behind us.
+            - If the opposite side reaches our price we are filled in full.
+        Our own fills don't alter the recorded book (no market impact).
+        Args:
+            pair (str): Traded pair.
+            initial_balance (float): Starting quote balance.
+            initial_base (float): Starting base balance.
+            latency (float): Seconds for orders & cancels to reach the matching engine.
+            taker_fee (float): Fee rate when taking liquidity.
+            maker_fee (float): Fee rate for filled resting orders.
+            slippage (float): Headroom reserved on market buys (fills use actual book prices).
+            depth (int): Levels per side served by fetch_order_book.
+        """
+        super().__init__(pair, initial_balance, latency, taker_fee, maker_fee, slippage, initial_base=initial_base)
+        self.depth = depth
+        self.book = {BID: {}, ASK: {}}  # price -> visible quantity
+        self._resting = {BID: {}, ASK: {}}  # price -> our open orders in time priority
+        self._book_view = None
+        self.stats["book_events"] = 0
+
+    # ------------------------------------------------------------------
+    # 📥 Market data
+    # ------------------------------------------------------------------
+    def fetch_order_book(self, symbol=PAIR, limit=None):
+        """Returns the reconstructed book ({"bids", "asks", "timestamp"}) at the simulated time."""
+        if self._book_view is None:
+            bids, asks = self.book[BID], self.book[ASK]
+            self._book_view = {
+                "bids": [[price, bids[price]] for price in sorted(bids, reverse=True)[:self.depth]],
+                "asks": [[price, asks[price]] for price in sorted(asks)[:self.depth]],
+                "timestamp": self.time,
+            }
+        if limit is not None and limit < self.depth:
+            return {"bids": self._book_view["bids"][:limit], "asks": self._book_view["asks"][:limit],
+                    "timestamp": self.time}
+        return self._book_view
+
+    def _best_quotes(self):
+        bids, asks = self.book[BID], self.book[ASK]
+        return (max(bids) if bids else None), (min(asks) if asks else None)
+
+    def _book_quantity_at(self, side, price):
+        return self.book[BOOK_SIDE[side]].get(price, 0.0)
+
+    # ------------------------------------------------------------------
+    # ⚙️ Matching engine
+    # ------------------------------------------------------------------
+    def _activate(self, order):
+        """Takes liquidity up to the order's limit; limit remainders rest at the back of the queue."""
+        self._take(order, order["price"])
+        if order["remaining"] <= 1e-12:
+            return
+        if order["type"] == "market":  # Book exhausted – remainder is canceled (IOC)
+            order["status"] = "canceled"
+            self._release(order)
+            return
+
+        side = BOOK_SIDE[order["side"]]
+        order["status"] = "open"
+        order["queue_ahead"] = self.book[side].get(order["price"], 0.0)
+        self._resting[side].setdefault(order["price"], []).append(order)
+
+    def _take(self, order, limit):
+        """Walks the opposite side of the book (limit None = any price)."""
+        buy = order["side"] == "BUY"
+        levels = self.fetch_order_book()["asks" if buy else "bids"]
+        for price, quantity in levels:
+            if order["remaining"] <= 1e-12:
+                break
+            if limit is not None and (price > limit if buy else price < limit):
+                break
+            self._fill(order, price, min(quantity, order["remaining"]), "taker")
+
+    def _apply(self, kind, sides, prices, quantities):
+        """
+        Applies one recorded snapshot or diff and works our resting orders through the changes.
+        """
+        resting = self._resting
+        changed = []
+        if kind == SNAPSHOT:
+            book = {BID: {}, ASK: {}}
+            for side, price, quantity in zip(sides, prices, quantities):
+                if quantity > 0:
+                    book[side][price] = quantity
+            for side in (BID, ASK):
+                for price in resting[side]:
+                    changed.append((side, price, self.book[side].get(price, 0.0), book[side].get(price, 0.0)))
+            self.book = book
+        else:
+            book = self.book
+            for side, price, quantity in zip(sides, prices, quantities):
+                side_book = book[side]
+                if resting[side] and price in resting[side]:
+                    changed.append((side, price, side_book.get(price, 0.0), quantity))
+                if quantity > 0:
+                    side_book[price] = quantity
+                else:
+                    side_book.pop(price, None)
+
+        self._book_view = None
+        bid, ask = self._best_quotes()
+        if bid is not None and ask is not None:
+            self.last_price = (bid + ask) / 2
+        for side, price, before, after in changed:
+            self._on_level_change(side, price, before, after)
+        if resting[BID] or resting[ASK]:
+            self._fill_crossed(bid, ask)
+
+    def _on_level_change(self, side, price, before, after):
+        """Advances our queue position (and fills us) when visible quantity leaves our price level."""
+        orders = self._resting[side].get(price)
+        decrease = before - after
+        if not orders or decrease <= 0:
+            return
+        side_book = self.book[side]
+        at_touch = not side_book or (price >= max(side_book) if side == BID else price <= min(side_book))
+        for order in orders:
+            if order["status"] != "open":
+                continue
+            if at_touch:
+                consumed = min(order["queue_ahead"], decrease)
+                order["queue_ahead"] -= consumed
+                decrease -= consumed
+                quantity = min(decrease, order["remaining"])
+                if quantity > 0:
+                    self._fill(order, price, quantity, "maker")
+                    decrease -= quantity
+            elif before > 0:
+                order["queue_ahead"] -= decrease * order["queue_ahead"] / before
+            order["queue_ahead"] = min(order["queue_ahead"], after)
+        self._prune(side, price)
+
+    def _fill_crossed(self, bid, ask):
+        """Fills resting orders the opposite side has reached or crossed."""
+        for side, limit in ((BID, ask), (ASK, bid)):
+            if limit is None or not self._resting[side]:
+                continue
+            for price in [price for price in self._resting[side] if (price >= limit if side == BID else price <= limit)]:
+                for order in self._resting[side][price]:
+                    if order["status"] == "open":
+                        self._fill(order, price, order["remaining"], "maker")
+                self._prune(side, price)
+
+    def _prune(self, side, price):
+        """Drops filled & canceled orders from a resting level."""
+        orders = [order for order in self._resting[side].get(price, ()) if order["status"] == "open"]
+        if orders:
+            self._resting[side][price] = orders
+        else:
+            self._resting[side].pop(price, None)
+
+    def _process_pending(self, now):
+        super()._process_pending(now)
+        for side in (BID, ASK):
+            for price in list(self._resting[side]):
+                self._prune(side, price)
+
+    # ------------------------------------------------------------------
+    # ▶️ Replay
+    # ------------------------------------------------------------------
+    def replay(self, recording, callbacks=(), speed=None):
+        """
+        Replays a recorded session through the simulator.
+        Args:
+            recording (str or dict): File path or read_book_file result.
+            callbacks (list): (interval seconds, callable) pairs on the simulated clock (0 = every book update).
+            speed (float): Replay speed relative to real time (None = as fast as possible).
+        Returns:
+            dict: Session & wall-clock durations, events & speed-up over real time.
+        """
+        data = read_book_file(recording) if isinstance(recording, str) else recording
+        timestamps = data["timestamps"].tolist()
+        kinds = data["kinds"].tolist()
+        offsets = data["offsets"].tolist()
+        sides = data["levels"]["side"].tolist()
+        prices = data["levels"]["price"].tolist()
+        quantities = data["levels"]["quantity"].tolist()
+        if not timestamps:
+            return {"events": 0, "session_seconds": 0.0, "wall_seconds": 0.0, "speedup": None}
+
+        schedule = [[timestamps[0], interval, fn] for interval, fn in callbacks]
+        next_callback = min((entry[0] for entry in schedule), default=float("inf"))
+        wall_start = time.perf_counter()
+        first = timestamps[0]
+
+        for index, ts in enumerate(timestamps):
+            if speed:
+                delay = (ts - first) / speed - (time.perf_counter() - wall_start)
+                if delay > 0:
+                    time.sleep(delay)
+            self.time = ts
+            if self._pending and self._pending[0][0] <= ts:
+                self._process_pending(ts)
+            start, end = offsets[index], offsets[index + 1]
+            self._apply(kinds[index], sides[start:end], prices[start:end], quantities[start:end])
+            if ts >= next_callback:
+                for entry in schedule:
+                    if ts >= entry[0]:
+                        entry[2]()
+                        entry[0] = ts + entry[1]
+                next_callback = min(entry[0] for entry in schedule)
+                if self._pending and self._pending[0][0] <= ts:
+                    self._process_pending(ts)  # Zero-latency configs act immediately
+
+        wall = time.perf_counter() - wall_start
+        session = timestamps[-1] - first
+        self.stats["events"] += len(timestamps)
+        self.stats["book_events"] += len(timestamps)
+        return {"events": len(timestamps), "session_seconds": session, "wall_seconds": wall,
+                "speedup": session / wall if wall > 0 else None}
+
+
+def replay_hft(recording, engine=None, interval=HFT_TRADE_INTERVAL, speed=None, **exchange_kwargs):
+    """
+    Runs HFTEngine.execute_hft_trade against a recorded session.
+    Args:
+        recording (str or dict): File path or read_book_file result.
+        engine (HFTEngine): Engine to evaluate (a fresh one on the replay exchange by default).
+        interval (float): Simulated seconds between engine calls (0 = every book update).
+        speed (float): Replay speed relative to real time (None = as fast as possible).
+        **exchange_kwargs: OrderBookReplay settings (latency, fees, balances, ...).
+    Returns:
+        dict: PnL, fills, fees & replay timing.
+    """
+    from hft.hft_engine import HFTEngine
+
+    exchange = OrderBookReplay(**exchange_kwargs)
+    initial_equity = None
+    if engine is None:
+        engine = HFTEngine(exchange)
+    else:
+        engine.exchange = exchange
+
+    data = read_book_file(recording) if isinstance(recording, str) else recording
+
+    def mark_start():
+        nonlocal initial_equity
+        if initial_equity is None:
+            initial_equity = exchange.equity()
+
+    timing = exchange.replay(data, callbacks=[(float("inf"), mark_start), (interval, engine.execute_hft_trade)],
+                             speed=speed)
+    fills = exchange.fills_frame()
+    final_equity = exchange.equity()
+    result = {
+        "initial_equity": initial_equity,
+        "final_equity": final_equity,
+        "pnl": final_equity - initial_equity if initial_equity is not None else 0.0,
+        "fills": len(fills),
+        "maker_fills": int((fills["liquidity"] == "maker").sum()) if len(fills) else 0,
+        "fees_paid": float(fills["fee"].sum()) if len(fills) else 0.0,
+        "balance": exchange.fetch_balance(),
+        "open_orders": len(exchange.fetch_open_orders()),
+        **{key: value for key, value in exchange.stats.items() if key != "events"},
+        **timing,
+    }
+    Logger.info(f"⏪ HFT replay: {result['events']} book events, PnL {result['pnl']:.4f}, "
+                f"{result['speedup'] or 0:.0f}x real time")
+    return result
+
+
+# 🚀 REPLAY A RECORDED SESSION
+if __name__ == "__main__":
+    import sys
+    print(replay_hft(sys.argv[1], initial_base=100.0))
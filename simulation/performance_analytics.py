@@ -0,0 +1,160 @@
+# performance_analytics.py
+# ==================================================
+# 📐 PERFORMANCE ANALYTICS – VECTORIZED BACKTEST METRICS 📐
+# ==================================================
+
+import numpy as np
+import pandas as pd
+from config import BACKTEST_PERIODS_PER_YEAR
+
+SECONDS_PER_YEAR = 365 * 24 * 3600
+
+
+def infer_periods_per_year(timestamps):
+    """
+    Infers the bar frequency from timestamps.
+    Args:
+        timestamps (np.array): Epoch seconds.
+    Returns:
+        float: Bars per year (BACKTEST_PERIODS_PER_YEAR if it can't be inferred).
+    """
+    if timestamps is None or len(timestamps) < 2:
+        return BACKTEST_PERIODS_PER_YEAR
+    spacing = np.median(np.diff(timestamps))
+    return SECONDS_PER_YEAR / spacing if spacing > 0 else BACKTEST_PERIODS_PER_YEAR
+
+
+def _curve_metrics(equity, periods_per_year):
+    """
+    Core curve statistics, vectorized along the last axis so one call handles one curve or thousands.
+    Args:
+        equity (np.array): Equity curves (results x bars).
+        periods_per_year (float): Bars per year for annualization.
+    Returns:
+        dict: Arrays with one value per curve.
+    """
+    returns = equity[:, 1:] / equity[:, :-1] - 1
+    n_returns = returns.shape[1]
+    mean = returns.mean(axis=1) if n_returns else np.zeros(len(equity))
+    std = returns.std(axis=1) if n_returns else np.zeros(len(equity))
+    downside = np.sqrt(np.mean(np.minimum(returns, 0.0) ** 2, axis=1)) if n_returns else np.zeros(len(equity))
+    scale = np.sqrt(periods_per_year)
+
+    peak = np.maximum.accumulate(equity, axis=1)
+    drawdown = 1 - equity / peak
+    # ✅ Drawdown duration: bars since the last equity high, without a per-bar loop
+    bars = np.broadcast_to(np.arange(equity.shape[1]), equity.shape)
+    last_peak = np.maximum.accumulate(np.where(equity >= peak, bars, 0), axis=1)
+    duration = bars - last_peak
+
+    total_return = equity[:, -1] / equity[:, 0] - 1
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        annualized = np.where(n_returns > 0, (1 + total_return) ** (periods_per_year / max(n_returns, 1)) - 1, 0.0)
+        sharpe = np.where(std > 0, mean / std * scale, 0.0)
+        sortino = np.where(downside > 0, mean / downside * scale, 0.0)
+    return {
+        "total_return": total_return,
+        "annualized_return": annualized,
+        "volatility": std * scale,
+        "sharpe": sharpe,
+        "sortino": sortino,
+        "max_drawdown": drawdown.max(axis=1),
+        "max_drawdown_duration": duration.max(axis=1),
+        "_duration": duration,
+    }
+
+
+def compute_metrics(equity, timestamps=None, position_value=None, traded_notional=None, fees=None,
+                    periods_per_year=None):
+    """
+    Computes every performance metric for one backtest from its arrays.
+    Args:
+        equity (np.array): Equity curve.
+        timestamps (np.array): Epoch seconds per equity sample (for annualization & durations).
+        position_value (np.array): Signed open-position value per sample (for exposure).
+        traded_notional (np.array): Notional per fill (for turnover).
+        fees (np.array): Fee per fill.
+        periods_per_year (float): Bars per year (inferred from timestamps if None).
+    Returns:
+        dict: total/annualized return, volatility, Sharpe, Sortino, max drawdown & its duration,
+            turnover, exposure, time in market, trade count & fees.
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    periods_per_year = periods_per_year or infer_periods_per_year(timestamps)
+    curve = _curve_metrics(equity[None, :], periods_per_year)
+
+    metrics = {name: float(values[0]) for name, values in curve.items() if not name.startswith("_")}
+    metrics["max_drawdown_duration"] = int(curve["max_drawdown_duration"][0])
+    if timestamps is not None and len(timestamps):
+        end = int(np.argmax(curve["_duration"][0]))
+        metrics["max_drawdown_duration_seconds"] = float(timestamps[end] - timestamps[end - curve["_duration"][0][end]])
+
+    metrics["final_equity"] = float(equity[-1])
+    metrics["pnl"] = float(equity[-1] - equity[0])
+    if position_value is not None and len(position_value):
+        exposure = np.abs(position_value) / equity
+        metrics["exposure"] = float(exposure.mean())
+        metrics["time_in_market"] = float(np.mean(position_value != 0))
+    if traded_notional is not None:
+        metrics["num_trades"] = int(len(traded_notional))
+        metrics["turnover"] = float(np.sum(traded_notional) / equity.mean())
+    if fees is not None:
+        metrics["fees_paid"] = float(np.sum(fees))
+    return metrics
+
+
+def batch_metrics(equity_matrix, names=None, periods_per_year=BACKTEST_PERIODS_PER_YEAR):
+    """
+    Compares many backtests at once.
+    Args:
+        equity_matrix (np.array): Aligned equity curves (results x bars).
+        names (list): Label per result.
+        periods_per_year (float): Bars per year.
+    Returns:
+        pd.DataFrame: One row of metrics per result, sorted by Sharpe.
+    """
+    curve = _curve_metrics(np.asarray(equity_matrix, dtype=np.float64), periods_per_year)
+    table = pd.DataFrame({name: values for name, values in curve.items() if not name.startswith("_")},
+                         index=names)
+    return table.sort_values("sharpe", ascending=False)
+
+
+def period_returns(timestamps, equity, freq="D"):
+    """
+    Per-period returns (daily, weekly, monthly, ...).
+    Args:
+        timestamps (np.array): Epoch seconds.
+        equity (np.array): Equity curve.
+        freq (str): Pandas offset alias, e.g. "D", "W", "ME".
+    Returns:
+        pd.Series: Return per period (first period measured from the starting equity).
+    """
+    series = pd.Series(np.asarray(equity, dtype=np.float64), index=pd.to_datetime(np.asarray(timestamps), unit="s"))
+    period_end = series.resample(freq).last().dropna()
+    previous = period_end.shift(1)
+    previous.iloc[0] = series.iloc[0]
+    return (period_end / previous - 1).rename("return")
+
+
+def export_results(path, equity_matrix, names, timestamps=None):
+    """
+    Exports many aligned equity curves in one compressed file.
+    Args:
+        path (str): .npz path.
+        equity_matrix (np.array): Equity curves (results x bars).
+        names (list): Label per result.
+        timestamps (np.array): Shared epoch-second axis.
+    """
+    np.savez_compressed(path, equity=np.asarray(equity_matrix, dtype=np.float64), names=np.asarray(names, dtype=str),
+                        timestamps=np.asarray([] if timestamps is None else timestamps, dtype=np.float64))
+
+
+def load_results(path):
+    """
+    Loads curves written by export_results.
+    Returns:
+        tuple: (equity_matrix, names, timestamps or None)
+    """
+    with np.load(path) as data:
+        timestamps = data["timestamps"]
+        return data["equity"], data["names"].tolist(), timestamps if len(timestamps) else None
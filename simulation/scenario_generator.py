@@ -0,0 +1,135 @@
+# scenario_generator.py
+# ==================================================
+# 🌪️ SCENARIO GENERATOR – VECTORIZED MONTE CARLO PRICE PATHS 🌪️
+# ==================================================
+
+import numpy as np
+from config import STRESS_PATHS, STRESS_STEPS, STRESS_VOLATILITY, STRESS_SEED, BACKTEST_SLIPPAGE
+
+MINUTES_PER_YEAR = 365 * 24 * 60
+
+
+class ScenarioGenerator:
+    def __init__(self, s0=1.0, sigma=STRESS_VOLATILITY, mu=0.0, dt=1 / MINUTES_PER_YEAR, seed=STRESS_SEED):
+        """
+        Generates batches of synthetic price paths, all paths in one array call.
+        Args:
+            s0 (float): Starting price.
+            sigma (float): Annualized volatility.
+            mu (float): Annualized drift.
+            dt (float): Step length in years (default one minute).
+            seed (int): Random seed.
+        """
+        self.s0 = s0
+        self.sigma = sigma
+        self.mu = mu
+        self.dt = dt
+        self.rng = np.random.default_rng(seed)
+
+    def _to_prices(self, log_returns):
+        """Turns per-step log returns (paths x steps) into price paths starting at s0."""
+        return self.s0 * np.exp(np.cumsum(log_returns, axis=1))
+
+    def _gbm_log_returns(self, n_paths, n_steps, sigma=None):
+        """Per-step GBM log returns; sigma may be a scalar or a (paths x steps) array."""
+        sigma = self.sigma if sigma is None else sigma
+        shocks = self.rng.standard_normal((n_paths, n_steps))
+        return (self.mu - 0.5 * sigma ** 2) * self.dt + sigma * np.sqrt(self.dt) * shocks
+
+    def gbm(self, n_paths=STRESS_PATHS, n_steps=STRESS_STEPS):
+        """
+        Geometric Brownian motion.
+        Returns:
+            np.array: Prices (paths x steps).
+        """
+        return self._to_prices(self._gbm_log_returns(n_paths, n_steps))
+
+    def jump_diffusion(self, n_paths=STRESS_PATHS, n_steps=STRESS_STEPS, jump_intensity=50.0,
+                       jump_mean=-0.02, jump_std=0.04):
+        """
+        Merton jump-diffusion: GBM plus Poisson-arriving log-normal jumps.
+        Args:
+            jump_intensity (float): Expected jumps per year.
+            jump_mean (float): Mean log jump size.
+            jump_std (float): Std of the log jump size.
+        Returns:
+            np.array: Prices (paths x steps).
+        """
+        jumps = self.rng.poisson(jump_intensity * self.dt, (n_paths, n_steps))
+        jump_sizes = jump_mean * jumps + jump_std * np.sqrt(jumps) * self.rng.standard_normal((n_paths, n_steps))
+        return self._to_prices(self._gbm_log_returns(n_paths, n_steps) + jump_sizes)
+
+    def regime_switching(self, n_paths=STRESS_PATHS, n_steps=STRESS_STEPS, sigmas=(0.5, 2.0),
+                         drifts=(0.0, -2.0), switch_prob=(0.001, 0.01)):
+        """
+        Two-state Markov regime switching between a calm and a turbulent regime.
+        Args:
+            sigmas (tuple): Annualized volatility per regime.
+            drifts (tuple): Annualized drift per regime.
+            switch_prob (tuple): Per-step probability of leaving each regime.
+        Returns:
+            np.array: Prices (paths x steps).
+        """
+        # ✅ Regime durations are geometric, so a path's regime is the parity of switches so far
+        leave = np.asarray(switch_prob)
+        uniforms = self.rng.random((n_paths, n_steps))
+        regimes = np.zeros((n_paths, n_steps), dtype=np.int8)
+        current = np.zeros(n_paths, dtype=np.int8)
+        for step in range(n_steps):
+            current ^= (uniforms[:, step] < leave[current]).astype(np.int8)
+            regimes[:, step] = current
+        sigma = np.asarray(sigmas)[regimes]
+        drift = np.asarray(drifts)[regimes]
+        shocks = self.rng.standard_normal((n_paths, n_steps))
+        return self._to_prices((drift - 0.5 * sigma ** 2) * self.dt + sigma * np.sqrt(self.dt) * shocks)
+
+    def flash_crash(self, n_paths=STRESS_PATHS, n_steps=STRESS_STEPS, crash_size=0.3, crash_steps=5,
+                    recovery=0.5, recovery_steps=60):
+        """
+        GBM with one sudden crash at a random time, followed by a partial recovery.
+        Args:
+            crash_size (float): Fractional drop (0.3 = -30%).
+            crash_steps (int): Steps the drop is spread over.
+            recovery (float): Fraction of the drop recovered afterwards.
+            recovery_steps (int): Steps the recovery is spread over.
+        Returns:
+            np.array: Prices (paths x steps).
+        """
+        log_returns = self._gbm_log_returns(n_paths, n_steps)
+        drop = np.log(1 - crash_size)
+        crash_start = self.rng.integers(0, max(1, n_steps - crash_steps - recovery_steps), n_paths)
+        offsets = np.arange(n_steps)[None, :] - crash_start[:, None]
+        log_returns += np.where((offsets >= 0) & (offsets < crash_steps), drop / crash_steps, 0.0)
+        log_returns += np.where((offsets >= crash_steps) & (offsets < crash_steps + recovery_steps),
+                                -drop * recovery / recovery_steps, 0.0)
+        return self._to_prices(log_returns)
+
+    def liquidity_drought(self, n_paths=STRESS_PATHS, n_steps=STRESS_STEPS, duration=240, vol_multiplier=3.0,
+                          slippage_multiplier=20.0, base_slippage=BACKTEST_SLIPPAGE):
+        """
+        GBM with a window of thin liquidity: volatility jumps and execution slippage widens.
+        Args:
+            duration (int): Steps the drought lasts.
+            vol_multiplier (float): Volatility multiplier during the drought.
+            slippage_multiplier (float): Slippage multiplier during the drought.
+            base_slippage (float): Normal per-fill slippage.
+        Returns:
+            tuple: (prices, slippage), both paths x steps.
+        """
+        start = self.rng.integers(0, max(1, n_steps - duration), n_paths)
+        offsets = np.arange(n_steps)[None, :] - start[:, None]
+        in_drought = (offsets >= 0) & (offsets < duration)
+        sigma = np.where(in_drought, self.sigma * vol_multiplier, self.sigma)
+        slippage = np.where(in_drought, base_slippage * slippage_multiplier, base_slippage)
+        return self._to_prices(self._gbm_log_returns(n_paths, n_steps, sigma)), slippage
+
+    def generate(self, scenario, n_paths=STRESS_PATHS, n_steps=STRESS_STEPS, **kwargs):
+        """
+        Generates a named scenario.
+        Args:
+            scenario (str): "gbm", "jump_diffusion", "regime_switching", "flash_crash" or "liquidity_drought".
+        Returns:
+            tuple: (prices, slippage) – slippage is None unless the scenario models it.
+        """
+        result = getattr(self, scenario)(n_paths, n_steps, **kwargs)
+        return result if isinstance(result, tuple) else (result, None)
@@ -0,0 +1,163 @@
+# signal_tape.py
+# ==================================================
+# 📼 SIGNAL TAPE – PRECOMPUTED MODEL SIGNALS FOR REPLAYS 📼
+# ==================================================
+
+import os
+import json
+import shutil
+import hashlib
+import numpy as np
+import pandas as pd
+from simulation.trade_store import SIDE_CODES, to_epoch_array
+from custom_logging.logger import Logger
+from config import SIGNAL_TAPE_DIR
+
+SIGNAL_LABELS = np.array(["SELL", "HOLD", "BUY"], dtype=object)  # Indexed by code + 1
+TAPE_COLUMNS = ["timestamp", "close", "signal"]
+
+
+def model_fingerprint(strategy):
+    """
+    Identifies the model that produced a tape.
+    Args:
+        strategy: Object with generate_signal_history (PredictiveAI, QuantumTradingExecutor, ...).
+    Returns:
+        str or None: Hash of the strategy class & its weights_fingerprint() (which covers the weights and any
+            config the signals depend on), or None if the model can't be hashed – its signals are never cached.
+    """
+    fingerprint = getattr(strategy, "weights_fingerprint", None)
+    if fingerprint is None:
+        return None
+    try:
+        weights = fingerprint()
+    except Exception as e:
+        Logger.warning(f"⚠️ Could not hash {type(strategy).__name__} weights: {e}")
+        return None
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(type(strategy).__name__.encode())
+    digest.update(str(weights).encode())
+    return digest.hexdigest()
+
+
+def data_fingerprint(df):
+    """
+    Content hash of a market-data DataFrame (values, columns & index).
+    Returns:
+        str: Hex digest.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(",".join(map(str, df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return digest.hexdigest()
+
+
+class SignalTape:
+    def __init__(self, tape_dir=SIGNAL_TAPE_DIR):
+        """
+        Stores every model signal for a dataset once, so simulations, backtests & reports replay
+        them instead of re-running inference.
+        Args:
+            tape_dir (str): Directory holding one tape per (model, data) pair.
+        """
+        self.tape_dir = tape_dir
+        self.stats = {"hits": 0, "recorded": 0, "uncached": 0}
+
+    def tape_path(self, strategy, df):
+        """Returns the directory of the tape for a model & dataset (None if the model can't be hashed)."""
+        model = model_fingerprint(strategy)
+        if model is None:
+            return None
+        return os.path.join(self.tape_dir, f"{model[:16]}_{data_fingerprint(df)[:16]}")
+
+    @staticmethod
+    def _compute(strategy, df):
+        """
+        Runs the batched signal pass.
+        Returns:
+            dict: timestamp, close & signal-code arrays (the tape's columns).
+        """
+        signals = np.asarray(strategy.generate_signal_history(df))
+        codes = np.zeros(len(signals), dtype=np.int8)
+        for label, code in SIDE_CODES.items():
+            codes[signals == label] = code
+        timestamps = to_epoch_array(df["timestamp"]) if "timestamp" in df.columns else np.arange(len(df), dtype=np.float64)
+        return {"timestamp": timestamps, "close": df["close"].to_numpy(dtype=np.float64), "signal": codes}
+
+    def record(self, strategy, df):
+        """
+        Runs the batched signal pass and writes the tape (one .npy per column, written atomically).
+        Args:
+            strategy: Object with generate_signal_history(df).
+            df (pd.DataFrame): Market data.
+        Returns:
+            str: Tape directory.
+        Raises:
+            ValueError: If the model can't be hashed (a tape could be replayed for a different model).
+        """
+        path = self.tape_path(strategy, df)
+        if path is None:
+            raise ValueError(f"{type(strategy).__name__} has no weights fingerprint; refusing to record a tape.")
+        columns = self._compute(strategy, df)
+
+        tmp_path = f"{path}.tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        for column in TAPE_COLUMNS:
+            np.save(os.path.join(tmp_path, f"{column}.npy"), columns[column])
+        with open(os.path.join(tmp_path, "meta.json"), "w") as file:
+            json.dump({"model": model_fingerprint(strategy), "data": data_fingerprint(df), "rows": len(df),
+                       "strategy": type(strategy).__name__, "model_version": getattr(strategy, "model_version", None)}, file)
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_path, path)
+
+        self.stats["recorded"] += 1
+        Logger.info(f"📼 Signal tape recorded: {len(df)} bars -> {path}")
+        return path
+
+    def ensure(self, strategy, df):
+        """
+        Returns the tape directory, recording it first if it doesn't exist yet.
+        Returns:
+            str or None: Tape directory, or None if the model can't be hashed (nothing is cached).
+        """
+        path = self.tape_path(strategy, df)
+        if path is None:
+            self.stats["uncached"] += 1
+            Logger.warning(f"⚠️ {type(strategy).__name__} can't be fingerprinted; computing signals without a tape.")
+            return None
+        if os.path.exists(os.path.join(path, "meta.json")):
+            self.stats["hits"] += 1
+            return path
+        return self.record(strategy, df)
+
+    def _open(self, path):
+        """Memory-maps a tape's columns."""
+        return {column: np.load(os.path.join(path, f"{column}.npy"), mmap_mode="r") for column in TAPE_COLUMNS}
+
+    def signals(self, strategy, df):
+        """
+        Signal per bar from the tape (recorded on first use).
+        Args:
+            strategy: Object with generate_signal_history(df).
+            df (pd.DataFrame): Market data.
+        Returns:
+            pd.Series: "BUY", "SELL", or "HOLD" per bar, aligned with df.
+        """
+        path = self.ensure(strategy, df)
+        codes = self._open(path)["signal"] if path is not None else self._compute(strategy, df)["signal"]
+        return pd.Series(SIGNAL_LABELS[np.asarray(codes) + 1], index=df.index, name="signal")
+
+    def stream(self, strategy, df, chunk_size=65536):
+        """
+        Streams the tape in chunks without loading it fully into memory.
+        Yields:
+            pd.DataFrame: timestamp, close & signal for up to chunk_size bars.
+        """
+        path = self.ensure(strategy, df)
+        columns = self._open(path) if path is not None else self._compute(strategy, df)
+        for start in range(0, len(columns["signal"]), chunk_size):
+            chunk = {column: np.asarray(values[start:start + chunk_size]) for column, values in columns.items()}
+            chunk["signal"] = SIGNAL_LABELS[chunk["signal"] + 1]
+            chunk["timestamp"] = pd.to_datetime(chunk["timestamp"], unit="s")
+            yield pd.DataFrame(chunk)
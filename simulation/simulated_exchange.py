@@ -0,0 +1,423 @@
+# simulated_exchange.py
+# ==================================================
+# 🏛️ SIMULATED EXCHANGE – EVENT-DRIVEN MATCHING FOR BACKTESTS 🏛️
+# ==================================================
+
+import heapq
+import itertools
+from collections import defaultdict
+from bisect import bisect_right
+import numpy as np
+import pandas as pd
+from config import PAIR, BACKTEST_FEE_RATE, BACKTEST_SLIPPAGE, SIM_MAKER_FEE_RATE, SIM_LATENCY
+
+
+def ohlc_to_trades(start, o, h, l, c, volume, interval=60):
+    """
+    Expands OHLCV arrays into a synthetic trade tape (open → high/low → low/high → close).
+    Args:
+        start (np.array): Candle open times in epoch seconds.
+        o, h, l, c, volume (np.array): Candle prices & volume.
+        interval (float): Candle length in seconds.
+    Returns:
+        tuple: (timestamps, prices, quantities) as Python lists, ready for replay.
+    """
+    up = c >= o
+    # ✅ Bullish candles are assumed to visit the low first, bearish candles the high first
+    prices = np.stack([o, np.where(up, l, h), np.where(up, h, l), c], axis=1).ravel()
+    timestamps = (np.asarray(start, dtype=np.float64)[:, None] + np.array([0.0, 0.25, 0.5, 0.75]) * interval).ravel()
+    quantities = np.repeat(np.asarray(volume, dtype=np.float64) / 4, 4)
+    return timestamps.tolist(), prices.tolist(), quantities.tolist()
+
+
+def candles_to_trades(df, interval=60):
+    """
+    Expands an OHLCV DataFrame into a synthetic trade tape (see ohlc_to_trades).
+    Args:
+        df (pd.DataFrame): Candles with timestamp, open, high, low, close & volume.
+        interval (float): Candle length in seconds.
+    Returns:
+        tuple: (timestamps, prices, quantities) as Python lists.
+    """
+    start = pd.to_datetime(df["timestamp"]).to_numpy().astype("datetime64[ns]").astype(np.int64) / 1e9
+    o, h, l, c = (df[col].to_numpy(dtype=np.float64) for col in ("open", "high", "low", "close"))
+    volume = df["volume"].to_numpy(dtype=np.float64) if "volume" in df.columns else np.ones(len(df))
+    return ohlc_to_trades(start, o, h, l, c, volume, interval)
+
+
+class SimulatedExchange:
+    def __init__(self, pair=PAIR, initial_balance=10000, latency=SIM_LATENCY, taker_fee=BACKTEST_FEE_RATE,
+                 maker_fee=SIM_MAKER_FEE_RATE, slippage=BACKTEST_SLIPPAGE, candle_interval=60, initial_base=0.0):
+        """
+        Simulated exchange exposing the ExchangeConnector / ccxt calls used by the strategies.
+        Args:
+            pair (str): Traded pair, e.g. "PI/USDT".
+            initial_balance (float): Starting quote balance.
+            latency (float): Seconds between sending an order/cancel and the matching engine seeing it
+                (0 applies them immediately).
+            taker_fee (float): Fee rate for orders that take liquidity.
+            maker_fee (float): Fee rate for resting limit orders that get filled.
+            slippage (float): Adverse move applied to market orders when no book is loaded.
+            candle_interval (float): Candle length in seconds (for fetch_market_data).
+            initial_base (float): Starting base-asset balance (lets sell-first strategies trade).
+        """
+        self.pair = pair
+        self.base, self.quote = pair.split("/")
+        self.balance = {self.quote: float(initial_balance), self.base: float(initial_base)}
+        self.reserved = {self.quote: 0.0, self.base: 0.0}
+        self.latency = latency
+        self.taker_fee = taker_fee
+        self.maker_fee = maker_fee
+        self.slippage = slippage
+        self.candle_interval = candle_interval
+
+        self.time = 0.0
+        self.last_price = None
+        self.order_book = None
+        self.candles = None
+        self._candle_close_times = []
+
+        self.orders = {}  # id -> live (pending / open) order
+        self.closed_orders = {}  # id -> filled or canceled order (kept for fetch_order, never scanned)
+        self.open_by_symbol = defaultdict(dict)  # symbol -> {id: order resting on the book}
+        self._ids = itertools.count(1)
+        self._seq = itertools.count()
+        self._pending = []  # (activation time, seq, action, order)
+        self._bids = []  # (-price, seq, order) – resting buy orders
+        self._asks = []  # (price, seq, order) – resting sell orders
+        self.fills = []  # (time, order id, side, price, quantity, fee, liquidity)
+        self.stats = {"orders": 0, "rejected": 0, "canceled": 0, "events": 0}
+
+    # ------------------------------------------------------------------
+    # 📥 Market data
+    # ------------------------------------------------------------------
+    def load_candles(self, df):
+        """
+        Sets the candle history served by fetch_market_data.
+        Args:
+            df (pd.DataFrame): Candles (with indicators if strategies need them).
+        """
+        self.candles = df.reset_index(drop=True)
+        start = pd.to_datetime(df["timestamp"]).to_numpy().astype("datetime64[ns]").astype(np.int64) / 1e9
+        self._candle_close_times = (start + self.candle_interval).tolist()
+
+    def fetch_market_data(self, pair=PAIR):
+        """
+        Returns the last 200 fully closed candles at the current simulated time (no lookahead).
+        """
+        if self.candles is None:
+            return None
+        end = bisect_right(self._candle_close_times, self.time)
+        if end == 0:
+            return None
+        return self.candles.iloc[max(0, end - 200):end]
+
+    def fetch_ticker(self, symbol=PAIR):
+        """Returns the latest simulated ticker."""
+        bid, ask = self._best_quotes()
+        return {"symbol": symbol, "last": self.last_price, "bid": bid, "ask": ask, "timestamp": self.time}
+
+    def fetch_tickers(self, symbols=None):
+        """Bulk ticker snapshot (the simulator trades a single pair)."""
+        return {symbol: self.fetch_ticker(symbol) for symbol in (symbols or [PAIR])}
+
+    def fetch_order_book(self, symbol=PAIR):
+        """Returns the loaded order book, or a one-level synthetic book around the last price."""
+        if self.order_book is not None:
+            return self.order_book
+        bid, ask = self._best_quotes()
+        return {"bids": [[bid, float("inf")]], "asks": [[ask, float("inf")]]}
+
+    def _best_quotes(self):
+        """Best bid & ask from the loaded book, or last price ± slippage."""
+        if self.order_book and self.order_book.get("bids") and self.order_book.get("asks"):
+            return self.order_book["bids"][0][0], self.order_book["asks"][0][0]
+        if self.last_price is None:
+            return None, None
+        return self.last_price * (1 - self.slippage), self.last_price * (1 + self.slippage)
+
+    def fetch_balance(self):
+        """Returns balances in the ExchangeConnector format."""
+        return {self.quote: self.balance[self.quote], self.base: self.balance[self.base]}
+
+    # ------------------------------------------------------------------
+    # 📤 Order entry (ExchangeConnector & ccxt style)
+    # ------------------------------------------------------------------
+    def place_order(self, pair, side, amount):
+        """ExchangeConnector.place_order equivalent (market order)."""
+        return self._submit(pair, "market", side, amount)
+
+    def create_market_order(self, symbol, side, amount):
+        return self._submit(symbol, "market", side, amount)
+
+    def create_market_buy_order(self, symbol, amount):
+        return self._submit(symbol, "market", "BUY", amount)
+
+    def create_market_sell_order(self, symbol, amount):
+        return self._submit(symbol, "market", "SELL", amount)
+
+    def create_limit_order(self, symbol, side, amount, price):
+        return self._submit(symbol, "limit", side, amount, price)
+
+    def create_limit_buy_order(self, symbol, amount, price):
+        return self._submit(symbol, "limit", "BUY", amount, price)
+
+    def create_limit_sell_order(self, symbol, amount, price):
+        return self._submit(symbol, "limit", "SELL", amount, price)
+
+    def cancel_order(self, order_id, symbol=None):
+        """
+        Requests a cancel; it reaches the matching engine after the modelled latency.
+        Returns:
+            dict or None: The order, or None if unknown.
+        """
+        order = self.orders.get(order_id)
+        if order is None:
+            return self.closed_orders.get(order_id)  # Already filled or canceled – nothing to do
+        heapq.heappush(self._pending, (self.time + self.latency, next(self._seq), "cancel", order))
+        if self.latency <= 0:
+            self._process_pending(self.time)
+        return order
+
+    def fetch_open_orders(self, symbol=None):
+        """Returns orders resting on the simulated book (from the open-order index, not a scan)."""
+        if symbol is not None:
+            return list(self.open_by_symbol.get(symbol, {}).values())
+        return [order for orders in self.open_by_symbol.values() for order in orders.values()]
+
+    def fetch_order(self, order_id, symbol=None):
+        return self.orders.get(order_id) or self.closed_orders.get(order_id)
+
+    def _set_status(self, order, status):
+        """Updates an order's status and keeps the open-order index & live/closed dicts in step."""
+        order["status"] = status
+        if status == "open":
+            self.open_by_symbol[order["symbol"]][order["id"]] = order
+            return
+        self.open_by_symbol[order["symbol"]].pop(order["id"], None)
+        if status in ("closed", "canceled"):
+            self.orders.pop(order["id"], None)
+            self.closed_orders[order["id"]] = order
+
+    def _submit(self, symbol, order_type, side, amount, price=None):
+        """
+        Validates & reserves funds for a new order and queues it for the matching engine.
+        Returns:
+            dict or None: Order (status "pending" until it arrives), or None if rejected.
+        """
+        side = side.upper()
+        self.stats["orders"] += 1
+        reference_price = price if price is not None else self.last_price
+        if amount <= 0 or reference_price is None:
+            self.stats["rejected"] += 1
+            return None
+
+        if side == "BUY":
+            reserve_asset, reserve = self.quote, amount * reference_price * (1 + self.slippage) * (1 + self.taker_fee)
+        else:
+            reserve_asset, reserve = self.base, amount
+        if self.balance[reserve_asset] - self.reserved[reserve_asset] < reserve - 1e-12:
+            self.stats["rejected"] += 1
+            return None
+        self.reserved[reserve_asset] += reserve
+
+        order = {
+            "id": str(next(self._ids)), "symbol": symbol, "type": order_type, "side": side,
+            "price": price, "amount": amount, "filled": 0.0, "remaining": amount, "cost": 0.0, "fee": 0.0,
+            "status": "pending", "timestamp": self.time, "queue_ahead": 0.0,
+            "reserve_asset": reserve_asset, "reserved": reserve,
+        }
+        self.orders[order["id"]] = order
+        heapq.heappush(self._pending, (self.time + self.latency, next(self._seq), "new", order))
+        if self.latency <= 0:
+            self._process_pending(self.time)
+        return order
+
+    # ------------------------------------------------------------------
+    # ⚙️ Matching engine
+    # ------------------------------------------------------------------
+    def _process_pending(self, now):
+        """Applies every order & cancel whose latency has elapsed."""
+        pending = self._pending
+        while pending and pending[0][0] <= now:
+            _, _, action, order = heapq.heappop(pending)
+            if action == "cancel":
+                if order["status"] in ("pending", "open"):
+                    self._set_status(order, "canceled")
+                    self._release(order)
+                    self.stats["canceled"] += 1
+            elif order["status"] == "pending":
+                self._activate(order)
+
+    def _activate(self, order):
+        """Executes a market order or rests / crosses a limit order once it reaches the engine."""
+        if order["type"] == "market":
+            self._execute_market(order)
+            return
+
+        last = self.last_price
+        marketable = last is not None and (  # No trade yet – nothing to cross, so the order rests
+            (order["side"] == "BUY" and order["price"] >= last) or (order["side"] == "SELL" and order["price"] <= last))
+        if marketable:
+            fill_price = min(order["price"], last) if order["side"] == "BUY" else max(order["price"], last)
+            self._fill(order, fill_price, order["remaining"], "taker")
+            return
+
+        self._set_status(order, "open")
+        order["queue_ahead"] = self._book_quantity_at(order["side"], order["price"])
+        if order["side"] == "BUY":
+            heapq.heappush(self._bids, (-order["price"], next(self._seq), order))
+        else:
+            heapq.heappush(self._asks, (order["price"], next(self._seq), order))
+
+    def _book_quantity_at(self, side, price):
+        """Visible quantity already queued at a price level (0 if no book is loaded)."""
+        if not self.order_book:
+            return 0.0
+        for level_price, quantity in self.order_book.get("bids" if side == "BUY" else "asks", []):
+            if level_price == price:
+                return quantity
+        return 0.0
+
+    def _execute_market(self, order):
+        """Fills a market order by walking the loaded book, or at last price ± slippage."""
+        levels = self.order_book.get("asks" if order["side"] == "BUY" else "bids") if self.order_book else None
+        if not levels:
+            direction = 1 if order["side"] == "BUY" else -1
+            self._fill(order, self.last_price * (1 + direction * self.slippage), order["remaining"], "taker")
+            return
+
+        for level_price, quantity in levels:
+            if order["remaining"] <= 0:
+                break
+            self._fill(order, level_price, min(quantity, order["remaining"]), "taker")
+        if order["remaining"] > 0:  # Book exhausted – remainder is canceled (IOC)
+            self._set_status(order, "canceled")
+            self._release(order)
+
+    def _match_trade(self, price, quantity):
+        """Fills resting orders crossed by a trade, honouring queue position at the touch."""
+        bids, asks = self._bids, self._asks
+
+        volume = quantity
+        while bids and -bids[0][0] >= price:
+            order = bids[0][2]
+            if order["status"] != "open":
+                heapq.heappop(bids)
+                continue
+            if order["price"] > price:  # Traded through our level – we must have been filled first
+                self._fill(order, order["price"], order["remaining"], "maker")
+            else:
+                volume = self._fill_at_touch(order, volume)
+                if order["remaining"] > 0:
+                    break
+            heapq.heappop(bids)
+
+        volume = quantity
+        while asks and asks[0][0] <= price:
+            order = asks[0][2]
+            if order["status"] != "open":
+                heapq.heappop(asks)
+                continue
+            if order["price"] < price:
+                self._fill(order, order["price"], order["remaining"], "maker")
+            else:
+                volume = self._fill_at_touch(order, volume)
+                if order["remaining"] > 0:
+                    break
+            heapq.heappop(asks)
+
+    def _fill_at_touch(self, order, volume):
+        """
+        Trade printed exactly at our price: volume first consumes the queue ahead of us.
+        Returns:
+            float: Trade volume left for orders behind this one.
+        """
+        queue_consumed = min(order["queue_ahead"], volume)
+        order["queue_ahead"] -= queue_consumed
+        volume -= queue_consumed
+        fill_quantity = min(volume, order["remaining"])
+        if fill_quantity > 0:
+            self._fill(order, order["price"], fill_quantity, "maker")
+        return volume - fill_quantity
+
+    def _fill(self, order, price, quantity, liquidity):
+        """Books a (partial) fill and updates balances, fees & reservations."""
+        fee_rate = self.maker_fee if liquidity == "maker" else self.taker_fee
+        notional = price * quantity
+        fee = notional * fee_rate
+        if order["side"] == "BUY":
+            self.balance[self.quote] -= notional + fee
+            self.balance[self.base] += quantity
+        else:
+            self.balance[self.base] -= quantity
+            self.balance[self.quote] += notional - fee
+
+        release = order["reserved"] * quantity / order["remaining"]
+        self.reserved[order["reserve_asset"]] -= release
+        order["reserved"] -= release
+
+        order["filled"] += quantity
+        order["remaining"] -= quantity
+        order["cost"] += notional
+        order["fee"] += fee
+        order["average"] = order["cost"] / order["filled"]
+        self._set_status(order, "closed" if order["remaining"] <= 1e-12 else "open")
+        self.fills.append((self.time, order["id"], order["side"], price, quantity, fee, liquidity))
+
+    def _release(self, order):
+        """Returns an order's remaining reservation to the available balance."""
+        self.reserved[order["reserve_asset"]] -= order["reserved"]
+        order["reserved"] = 0.0
+
+    # ------------------------------------------------------------------
+    # ▶️ Replay
+    # ------------------------------------------------------------------
+    def replay(self, timestamps, prices, quantities, callbacks=()):
+        """
+        Replays a trade tape through the matching engine.
+        Args:
+            timestamps (list): Event times in epoch seconds (ascending).
+            prices (list): Trade prices.
+            quantities (list): Trade quantities.
+            callbacks (list): (interval seconds, callable) pairs run on the simulated clock.
+        """
+        schedule = [[timestamps[0] if timestamps else 0.0, interval, fn] for interval, fn in callbacks]
+        next_callback = min((entry[0] for entry in schedule), default=float("inf"))
+        inf = float("inf")
+        next_pending = self._pending[0][0] if self._pending else inf
+        best_bid = -self._bids[0][0] if self._bids else -inf
+        best_ask = self._asks[0][0] if self._asks else inf
+
+        for ts, price, quantity in zip(timestamps, prices, quantities):
+            # ✅ Fast path: nothing to do unless a timer fired or the trade crossed one of our orders
+            if ts >= next_pending or price <= best_bid or price >= best_ask or ts >= next_callback:
+                self.time = ts
+                self.last_price = price
+                if ts >= next_pending:
+                    self._process_pending(ts)
+                if self._bids or self._asks:
+                    self._match_trade(price, quantity)
+                if ts >= next_callback:
+                    for entry in schedule:
+                        if ts >= entry[0]:
+                            entry[2]()
+                            entry[0] = ts + entry[1]
+                    next_callback = min(entry[0] for entry in schedule)
+                    self._process_pending(ts)  # Zero-latency configs act immediately
+                next_pending = self._pending[0][0] if self._pending else inf
+                best_bid = -self._bids[0][0] if self._bids else -inf
+                best_ask = self._asks[0][0] if self._asks else inf
+
+        if timestamps:
+            self.time = timestamps[-1]
+            self.last_price = prices[-1]
+        self.stats["events"] += len(timestamps)
+
+    def equity(self):
+        """Marks balances to the last price."""
+        return self.balance[self.quote] + self.balance[self.base] * (self.last_price or 0.0)
+
+    def fills_frame(self):
+        """Returns all fills as a DataFrame."""
+        return pd.DataFrame(self.fills, columns=["time", "order_id", "side", "price", "quantity", "fee", "liquidity"])
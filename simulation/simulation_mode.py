@@ -7,6 +7,8 @@ import pandas as pd
 import logging
 from core.exchange_connector import ExchangeConnector
 from ai_models.predictive_ai import PredictiveAI
+from simulation.trade_store import TradeStore
+from simulation.signal_tape import SignalTape
 from config import BACKTEST_START_DATE, BACKTEST_END_DATE, PAIR
 
 # ✅ Configure Logging
@@ -22,7 +24,9 @@ class SimulationMode:
         self.exchange = ExchangeConnector()
         self.ai_model = PredictiveAI()
         self.balance = {"USDT": 10000, "PI": 0}  # Simulated balance
-        self.trade_history = []
+        self.trade_history = TradeStore(self.balance["USDT"])
+        self.metrics = {}
+        self.signal_tape = SignalTape()
 
     def load_historical_data(self):
         """
@@ -40,20 +44,21 @@ class SimulationMode:
             logging.error(f"❌ Error loading historical data: {e}")
             return None
 
-    def execute_trade(self, trade_type, amount, price):
+    def execute_trade(self, trade_type, amount, price, timestamp=0.0):
         """
         Simulates a trade execution.
         Args:
             trade_type (str): "BUY" or "SELL".
             amount (float): Trade size.
             price (float): Trade execution price.
+            timestamp: Bar time of the fill.
         """
         if trade_type == "BUY":
             cost = amount * price
             if self.balance["USDT"] >= cost:
                 self.balance["USDT"] -= cost
                 self.balance["PI"] += amount
-                self.trade_history.append((trade_type, amount, price))
+                self.trade_history.record_trade(timestamp, trade_type, price, amount)
                 print(f"✅ Simulated BUY: {amount:.6f} PI at {price:.2f} USDT")
             else:
                 print("⚠️ Not enough USDT for BUY trade.")
@@ -61,14 +66,17 @@ class SimulationMode:
             if self.balance["PI"] >= amount:
                 self.balance["PI"] -= amount
                 self.balance["USDT"] += amount * price
-                self.trade_history.append((trade_type, amount, price))
+                self.trade_history.record_trade(timestamp, trade_type, price, amount)
                 print(f"✅ Simulated SELL: {amount:.6f} PI at {price:.2f} USDT")
             else:
                 print("⚠️ Not enough PI for SELL trade.")
 
-    def run_simulation(self):
+    def run_simulation(self, trade_amount=0.01):
         """
         Runs a backtest using historical market data.
+        Signals come from the signal tape, so re-running with other execution settings skips inference.
+        Args:
+            trade_amount (float): PI traded per signal.
         """
         df = self.load_historical_data()
         if df is None:
@@ -76,18 +84,24 @@ class SimulationMode:
             return
 
         print("🚀 Running Simulation...")
-        for _, row in df.iterrows():
-            signal = self.ai_model.generate_trade_signal(df)
-            if signal == "BUY":
-                self.execute_trade("BUY", 0.01, row["close"])
-            elif signal == "SELL":
-                self.execute_trade("SELL", 0.01, row["close"])
+        # ✅ One batched inference pass per (model, dataset), then every run replays the tape
+        for chunk in self.signal_tape.stream(self.ai_model, df):
+            for timestamp, price, signal in zip(chunk["timestamp"], chunk["close"], chunk["signal"]):
+                if signal == "BUY":
+                    self.execute_trade("BUY", trade_amount, price, timestamp)
+                elif signal == "SELL":
+                    self.execute_trade("SELL", trade_amount, price, timestamp)
+                position_value = self.balance["PI"] * price
+                self.trade_history.record_equity(timestamp, self.balance["USDT"] + position_value, position_value)
 
         final_balance = self.balance["USDT"] + (self.balance["PI"] * df.iloc[-1]["close"])
         profit_loss = final_balance - 10000  # Initial balance
+        self.metrics = self.trade_history.metrics()
 
-        print(f"✅ Simulation Complete! Final Balance: {final_balance:.2f} USDT (PnL: {profit_loss:.2f} USDT)")
-        logging.info(f"🏆 Simulation Results: Final Balance = {final_balance:.2f} USDT, PnL = {profit_loss:.2f} USDT")
+        print(f"✅ Simulation Complete! Final Balance: {final_balance:.2f} USDT (PnL: {profit_loss:.2f} USDT), "
+              f"Sharpe: {self.metrics['sharpe']:.2f}, Max Drawdown: {self.metrics['max_drawdown']:.2%}")
+        logging.info(f"🏆 Simulation Results: Final Balance = {final_balance:.2f} USDT, PnL = {profit_loss:.2f} USDT | "
+                     f"Metrics: {self.metrics}")
 
 # 🚀 RUN SIMULATION
 if __name__ == "__main__":
@@ -6,8 +6,42 @@
 import time
 import random
 import logging
+import numpy as np
 from core.exchange_connector import ExchangeConnector
-from config import PAIR, STRESS_TEST_TRADES
+from simulation.scenario_generator import ScenarioGenerator
+from simulation.load_generator import ExchangeStandIn, LoadGenerator, build_order_target, write_report
+from config import (
+    PAIR, STRESS_TEST_TRADES, STRESS_PATHS, STRESS_STEPS, STOP_LOSS_PERCENT, TAKE_PROFIT_PERCENT,
+    RISK_PER_TRADE, MAX_DRAWDOWN, ORDER_MINIMUM_VALUE, BACKTEST_FEE_RATE, BACKTEST_SLIPPAGE,
+    LOAD_TEST_CONCURRENCY, LOAD_TEST_RATE, LOAD_TEST_DURATION, LOAD_TEST_REPORT_FILE
+)
+
+SCENARIOS = ["gbm", "jump_diffusion", "regime_switching", "flash_crash", "liquidity_drought"]
+
+
+def momentum_signals(prices, fast=10, slow=30):
+    """
+    Moving-average crossover signals for every path at once.
+    Args:
+        prices (np.array): Prices (paths x steps).
+        fast (int): Fast moving-average window.
+        slow (int): Slow moving-average window.
+    Returns:
+        np.array: +1 (BUY), -1 (SELL) or 0 (HOLD) per path & step.
+    """
+    cumulative = np.cumsum(prices, axis=1)
+
+    def moving_average(window):
+        average = np.full(prices.shape, np.nan)
+        average[:, window - 1:] = cumulative[:, window - 1:]
+        average[:, window:] -= cumulative[:, :-window]
+        return average / window
+
+    above = moving_average(fast) > moving_average(slow)
+    crossed = np.zeros(prices.shape, dtype=bool)
+    crossed[:, 1:] = above[:, 1:] != above[:, :-1]
+    crossed[:, :slow] = False
+    return np.where(crossed, np.where(above, 1, -1), 0).astype(np.int8)
 
 # ✅ Configure Logging
 logging.basicConfig(
@@ -54,7 +88,203 @@ class StressTester:
         print("✅ Stress test completed successfully.")
         logging.info("🏁 Stress test completed.")
 
+    def run_batch_strategy(self, prices, signals, slippage=None, initial_balance=10000,
+                           position_fraction=RISK_PER_TRADE, fee_rate=BACKTEST_FEE_RATE, halt_on_breach=True):
+        """
+        Applies the risk rules (position sizing, stop-loss / take-profit, MAX_DRAWDOWN kill switch)
+        to every path at once – one vectorized step per bar instead of one Python loop per path.
+        Args:
+            prices (np.array): Prices (paths x steps).
+            signals (np.array): +1 / -1 / 0 per path & step.
+            slippage (np.array): Per-step slippage (paths x steps), BACKTEST_SLIPPAGE if None.
+            initial_balance (float): Starting USDT per path.
+            position_fraction (float): Fraction of cash committed per entry.
+            fee_rate (float): Fee per fill.
+            halt_on_breach (bool): Flatten & stop trading a path once its drawdown exceeds MAX_DRAWDOWN.
+        Returns:
+            dict: Per-path final equity, PnL, max drawdown, breach flags & trade counts.
+        """
+        n_paths, n_steps = prices.shape
+        cash = np.full(n_paths, float(initial_balance))
+        quantity = np.zeros(n_paths)
+        stop_loss = np.zeros(n_paths)
+        take_profit = np.zeros(n_paths)
+        peak = cash.copy()
+        max_drawdown = np.zeros(n_paths)
+        halted = np.zeros(n_paths, dtype=bool)
+        trades = np.zeros(n_paths, dtype=np.int64)
+
+        for step in range(n_steps):
+            price = prices[:, step]
+            slip = BACKTEST_SLIPPAGE if slippage is None else slippage[:, step]
+            signal = signals[:, step]
+
+            # ✅ Exits: stop-loss, take-profit or SELL signal (filled at the bar price, so gaps hurt)
+            exiting = (quantity > 0) & ((price <= stop_loss) | (price >= take_profit) | (signal == -1))
+            cash += np.where(exiting, quantity * price * (1 - slip) * (1 - fee_rate), 0.0)
+            quantity[exiting] = 0.0
+            trades += exiting
+
+            # ✅ Entries sized like validate_trade: RISK_PER_TRADE of cash, at least ORDER_MINIMUM_VALUE
+            notional = np.maximum(cash * position_fraction, ORDER_MINIMUM_VALUE)
+            entering = (quantity == 0) & (signal == 1) & ~halted & (cash >= notional * (1 + fee_rate))
+            fill_price = price * (1 + slip)
+            quantity = np.where(entering, notional / fill_price, quantity)
+            cash -= np.where(entering, notional * (1 + fee_rate), 0.0)
+            stop_loss = np.where(entering, fill_price * (1 - STOP_LOSS_PERCENT), stop_loss)
+            take_profit = np.where(entering, fill_price * (1 + TAKE_PROFIT_PERCENT), take_profit)
+            trades += entering
+
+            equity = cash + quantity * price
+            np.maximum(peak, equity, out=peak)
+            np.maximum(max_drawdown, 1 - equity / peak, out=max_drawdown)
+
+            if halt_on_breach:
+                breaching = ~halted & (max_drawdown >= MAX_DRAWDOWN)
+                if breaching.any():
+                    cash += np.where(breaching, quantity * price * (1 - slip) * (1 - fee_rate), 0.0)
+                    trades += breaching & (quantity > 0)
+                    quantity[breaching] = 0.0
+                    halted |= breaching
+
+        final_equity = cash + quantity * prices[:, -1]
+        return {
+            "final_equity": final_equity,
+            "pnl": final_equity - initial_balance,
+            "max_drawdown": max_drawdown,
+            "breached": max_drawdown >= MAX_DRAWDOWN,
+            "trades": trades,
+        }
+
+    @staticmethod
+    def summarize(result, initial_balance=10000):
+        """
+        Reduces per-path results to distribution statistics.
+        Args:
+            result (dict): Output of run_batch_strategy.
+            initial_balance (float): Starting USDT per path.
+        Returns:
+            dict: PnL / drawdown percentiles, VaR & CVaR (95%), MAX_DRAWDOWN breach rate & mean trades.
+        """
+        pnl = result["pnl"]
+        var_95 = np.percentile(pnl, 5)
+        percentiles = [1, 5, 25, 50, 75, 95, 99]
+        return {
+            "paths": int(len(pnl)),
+            "pnl_mean": float(pnl.mean()),
+            "pnl_percentiles": dict(zip(percentiles, np.percentile(pnl, percentiles).round(4).tolist())),
+            "roi_mean": float(pnl.mean() / initial_balance * 100),
+            "var_95": float(-var_95),
+            "cvar_95": float(-pnl[pnl <= var_95].mean()),
+            "max_drawdown_percentiles": dict(zip(percentiles, np.percentile(result["max_drawdown"], percentiles).round(6).tolist())),
+            "max_drawdown_breach_rate": float(result["breached"].mean()),
+            "mean_trades": float(result["trades"].mean()),
+        }
+
+    def run_scenarios(self, scenarios=None, n_paths=STRESS_PATHS, n_steps=STRESS_STEPS, signal_fn=momentum_signals,
+                      generator=None, initial_balance=10000):
+        """
+        Runs the strategy & risk rules over thousands of synthetic paths per stress scenario.
+        Args:
+            scenarios (list): Scenario names (defaults to all of SCENARIOS).
+            n_paths (int): Paths per scenario.
+            n_steps (int): Steps per path.
+            signal_fn (callable): prices (paths x steps) -> signals (+1 / -1 / 0).
+            generator (ScenarioGenerator): Path generator (seeded default if None).
+            initial_balance (float): Starting USDT per path.
+        Returns:
+            dict: {scenario: summary} (see summarize).
+        """
+        generator = generator or ScenarioGenerator()
+        report = {}
+        for scenario in scenarios or SCENARIOS:
+            start_time = time.time()
+            prices, slippage = generator.generate(scenario, n_paths, n_steps)
+            result = self.run_batch_strategy(prices, signal_fn(prices), slippage, initial_balance=initial_balance)
+            report[scenario] = self.summarize(result, initial_balance)
+            report[scenario]["seconds"] = round(time.time() - start_time, 2)
+
+            print(f"🌪️ {scenario}: mean PnL {report[scenario]['pnl_mean']:.2f}, VaR95 {report[scenario]['var_95']:.2f}, "
+                  f"MAX_DRAWDOWN breaches {report[scenario]['max_drawdown_breach_rate']:.2%} "
+                  f"({n_paths} paths in {report[scenario]['seconds']}s)")
+            logging.info(f"🌪️ Scenario {scenario}: {report[scenario]}")
+        return report
+
+    def run_load_test(self, target="order_manager", concurrency=LOAD_TEST_CONCURRENCY, rate=LOAD_TEST_RATE,
+                      duration=LOAD_TEST_DURATION, standin=None, report_file=LOAD_TEST_REPORT_FILE):
+        """
+        Async load-generation mode: drives one layer of the order stack against a local exchange stand-in.
+        Args:
+            target (str): "connector", "order_manager" or "order_router".
+            concurrency (int): Max orders in flight.
+            rate (float): Target orders per second (None = closed loop).
+            duration (float): Seconds of load.
+            standin (ExchangeStandIn): Stand-in to use (a default one is started & stopped if None).
+            report_file (str): JSON report path (None = don't write).
+        Returns:
+            dict: Load-test report (throughput, latency percentiles & histogram, error & throttle rates).
+        """
+        owns_standin = standin is None
+        standin = standin or ExchangeStandIn()
+        base_url = standin.start() if owns_standin else f"http://{standin.host}:{standin.port}/api/v3"
+        try:
+            before = dict(standin.stats)
+            call = build_order_target(target, base_url, pool_size=concurrency)
+            report = LoadGenerator(call, concurrency, rate, duration).run()
+            served = {key: standin.stats[key] - before[key] for key in before}
+        finally:
+            if owns_standin:
+                standin.stop()
+
+        report = {
+            "target": target,
+            **report,
+            "throttle_rate": served["throttled"] / served["requests"] if served["requests"] else 0.0,
+            "standin": served,
+        }
+        print(f"📈 Load test [{target}] {report['achieved_rate']:.0f} req/s (target {rate}), "
+              f"p50 {report['latency_ms']['p50']:.1f} ms, p99 {report['latency_ms']['p99']:.1f} ms, "
+              f"errors {report['error_rate']:.2%}, throttled {report['throttle_rate']:.2%}")
+        logging.info(f"📈 Load test: {report}")
+        if report_file:
+            write_report(report, report_file)
+        return report
+
+    def find_saturation(self, target="order_manager", rates=(50, 100, 200, 400, 800, 1600),
+                        concurrency=LOAD_TEST_CONCURRENCY, duration=LOAD_TEST_DURATION, report_file=LOAD_TEST_REPORT_FILE):
+        """
+        Steps the target rate up until the order stack stops keeping up.
+        A rate is saturated when achieved throughput falls below 95% of target or more than 1% of orders fail.
+        Args:
+            target (str): "connector", "order_manager" or "order_router".
+            rates (tuple): Increasing target rates (orders per second).
+            concurrency (int): Max orders in flight.
+            duration (float): Seconds per step.
+            report_file (str): JSON report path (None = don't write).
+        Returns:
+            dict: {"saturation_rate": first saturated rate or None, "runs": [reports]}
+        """
+        standin = ExchangeStandIn()
+        standin.start()
+        runs = []
+        saturation_rate = None
+        try:
+            for rate in rates:
+                run = self.run_load_test(target, concurrency, rate, duration, standin=standin, report_file=None)
+                runs.append(run)
+                if run["throughput"] < 0.95 * rate or run["error_rate"] > 0.01:
+                    saturation_rate = rate
+                    break
+        finally:
+            standin.stop()
+
+        summary = {"target": target, "saturation_rate": saturation_rate, "runs": runs}
+        print(f"🏁 Saturation point for {target}: {saturation_rate or 'not reached'} orders/s")
+        if report_file:
+            write_report(summary, report_file)
+        return summary
+
 # 🚀 RUN STRESS TEST
 if __name__ == "__main__":
     tester = StressTester()
-    tester.simulate_trades()
+    tester.run_scenarios()
@@ -0,0 +1,192 @@
+# trade_store.py
+# ==================================================
+# 🗄️ TRADE STORE – APPEND-ONLY COLUMNAR TRADE & EQUITY LOG 🗄️
+# ==================================================
+
+import numpy as np
+import pandas as pd
+from simulation.performance_analytics import compute_metrics
+from config import TRADE_STORE_CAPACITY
+
+SIDE_CODES = {"BUY": 1, "SELL": -1}
+SIDE_LABELS = {1: "BUY", -1: "SELL"}
+TRADE_SCHEMA = {"timestamp": np.float64, "side": np.int8, "price": np.float64, "quantity": np.float64,
+                "notional": np.float64, "fee": np.float64}
+EQUITY_SCHEMA = {"timestamp": np.float64, "equity": np.float64, "position_value": np.float64}
+
+
+def to_epoch(value):
+    """
+    Converts a timestamp (epoch seconds, pd.Timestamp, datetime or datetime64) to epoch seconds.
+    Args:
+        value: Timestamp.
+    Returns:
+        float: Epoch seconds.
+    """
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return float(value)
+    return pd.Timestamp(value).timestamp()
+
+
+def to_epoch_array(values):
+    """Vectorized to_epoch for a column of timestamps."""
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.number):
+        return values.astype(np.float64)
+    return pd.to_datetime(values).to_numpy().astype("datetime64[ns]").astype(np.int64) / 1e9
+
+
+class ColumnarLog:
+    def __init__(self, schema, capacity=TRADE_STORE_CAPACITY):
+        """
+        Append-only table stored as one preallocated NumPy array per column.
+        Capacity doubles when full, so appends are amortized O(1) with no per-row objects.
+        Args:
+            schema (dict): {column: dtype}.
+            capacity (int): Initial rows preallocated.
+        """
+        self.schema = schema
+        self.size = 0
+        self.arrays = {name: np.empty(max(1, capacity), dtype=dtype) for name, dtype in schema.items()}
+
+    def __len__(self):
+        return self.size
+
+    def _reserve(self, extra):
+        """Grows every column so `extra` more rows fit."""
+        capacity = len(next(iter(self.arrays.values())))
+        needed = self.size + extra
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2)
+        for name, array in self.arrays.items():
+            grown = np.empty(new_capacity, dtype=array.dtype)
+            grown[:self.size] = array[:self.size]
+            self.arrays[name] = grown
+
+    def append(self, **row):
+        """Appends one row (missing columns are stored as 0)."""
+        self._reserve(1)
+        for name, array in self.arrays.items():
+            array[self.size] = row.get(name, 0)
+        self.size += 1
+
+    def extend(self, **columns):
+        """Appends many rows at once from equal-length arrays (missing columns are stored as 0)."""
+        count = len(next(iter(columns.values())))
+        self._reserve(count)
+        for name, array in self.arrays.items():
+            array[self.size:self.size + count] = columns.get(name, 0)
+        self.size += count
+
+    def column(self, name):
+        """Returns a view of a column's filled rows."""
+        return self.arrays[name][:self.size]
+
+    def to_frame(self):
+        """Returns the filled rows as a DataFrame."""
+        return pd.DataFrame({name: self.column(name) for name in self.schema})
+
+
+class TradeStore:
+    def __init__(self, initial_balance=0.0, capacity=TRADE_STORE_CAPACITY):
+        """
+        Columnar trade & equity log for backtests and simulations.
+        Args:
+            initial_balance (float): Starting equity (used when no equity samples exist yet).
+            capacity (int): Initial rows preallocated per log.
+        """
+        self.initial_balance = initial_balance
+        self.trades = ColumnarLog(TRADE_SCHEMA, capacity)
+        self.equity = ColumnarLog(EQUITY_SCHEMA, capacity)
+
+    def __len__(self):
+        return len(self.trades)
+
+    def record_trade(self, timestamp, side, price, quantity, fee=0.0):
+        """
+        Appends one fill.
+        Args:
+            timestamp: Fill time.
+            side (str): "BUY" or "SELL".
+            price (float): Fill price.
+            quantity (float): Filled quantity.
+            fee (float): Fee paid in USDT.
+        """
+        self.trades.append(timestamp=to_epoch(timestamp), side=SIDE_CODES[side], price=price, quantity=quantity,
+                           notional=price * quantity, fee=fee)
+
+    def record_equity(self, timestamp, equity, position_value=0.0):
+        """
+        Appends one mark-to-market sample.
+        Args:
+            timestamp: Sample time.
+            equity (float): Total equity in USDT.
+            position_value (float): Value of the open position in USDT (signed).
+        """
+        self.equity.append(timestamp=to_epoch(timestamp), equity=equity, position_value=position_value)
+
+    def extend_trades(self, timestamps, sides, prices, quantities, fees=None):
+        """Appends many fills at once (sides as "BUY"/"SELL" labels or +1/-1 codes)."""
+        sides = np.asarray(sides)
+        if sides.dtype.kind in "UO":
+            sides = np.where(sides == "BUY", 1, -1)
+        prices = np.asarray(prices, dtype=np.float64)
+        quantities = np.asarray(quantities, dtype=np.float64)
+        self.trades.extend(timestamp=to_epoch_array(timestamps), side=sides, price=prices, quantity=quantities,
+                           notional=prices * quantities, fee=0.0 if fees is None else np.asarray(fees))
+
+    def extend_equity(self, timestamps, equity, position_values=None):
+        """Appends many mark-to-market samples at once."""
+        self.equity.extend(timestamp=to_epoch_array(timestamps), equity=np.asarray(equity, dtype=np.float64),
+                           position_value=0.0 if position_values is None else np.asarray(position_values))
+
+    def trades_frame(self):
+        """Returns the trade log as a DataFrame with side labels & datetime timestamps."""
+        frame = self.trades.to_frame()
+        frame["side"] = frame["side"].map(SIDE_LABELS)
+        frame["timestamp"] = pd.to_datetime(frame["timestamp"], unit="s")
+        return frame
+
+    def equity_frame(self):
+        """Returns the equity curve as a DataFrame with datetime timestamps."""
+        frame = self.equity.to_frame()
+        frame["timestamp"] = pd.to_datetime(frame["timestamp"], unit="s")
+        return frame
+
+    def metrics(self, periods_per_year=None, epoch_timestamps=True):
+        """
+        Performance analytics over the stored equity curve & trades.
+        Args:
+            periods_per_year (float): Bars per year (inferred from timestamps if None).
+            epoch_timestamps (bool): Whether the stored timestamps are epoch seconds. Bar indices are not passed on,
+                so no duration is reported in seconds for them.
+        Returns:
+            dict: See performance_analytics.compute_metrics.
+        """
+        equity = self.equity.column("equity")
+        if len(equity) == 0:
+            equity = np.array([self.initial_balance], dtype=np.float64)
+        return compute_metrics(
+            equity,
+            timestamps=self.equity.column("timestamp") if epoch_timestamps and len(self.equity) else None,
+            position_value=self.equity.column("position_value") if len(self.equity) else None,
+            traded_notional=self.trades.column("notional"),
+            fees=self.trades.column("fee"),
+            periods_per_year=periods_per_year,
+        )
+
+    def save(self, path):
+        """Saves both logs to one .npz file."""
+        np.savez(path, initial_balance=self.initial_balance,
+                 **{f"trades_{name}": self.trades.column(name) for name in TRADE_SCHEMA},
+                 **{f"equity_{name}": self.equity.column(name) for name in EQUITY_SCHEMA})
+
+    @classmethod
+    def load(cls, path):
+        """Loads a store written by save()."""
+        with np.load(path) as data:
+            store = cls(float(data["initial_balance"]), capacity=len(data["trades_timestamp"]) or 1)
+            store.trades.extend(**{name: data[f"trades_{name}"] for name in TRADE_SCHEMA})
+            store.equity.extend(**{name: data[f"equity_{name}"] for name in EQUITY_SCHEMA})
+        return store
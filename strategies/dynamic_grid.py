@@ -6,6 +6,7 @@
 import numpy as np
 from core.exchange_connector import ExchangeConnector
 from data.volatility_scaling import VolatilityScaling
+from strategies.grid_manager import GridManager
 from config import PAIR, BASE_GRID_SIZE
 
 class DynamicGridTrading:
@@ -13,6 +14,7 @@ class DynamicGridTrading:
         """Initializes dynamic grid trading strategy."""
         self.exchange = ExchangeConnector()
         self.base_grid_size = BASE_GRID_SIZE
+        self.grid = GridManager(owner=self)  # Follows self.exchange (e.g. when a backtest swaps it)
 
     def adjust_grid_parameters(self):
         """
@@ -40,23 +42,16 @@ class DynamicGridTrading:
             return {"grid_size": self.base_grid_size, "grid_spacing": 0.5}
 
     def execute_dynamic_grid_trades(self):
-        """Places dynamically adjusted grid trades."""
+        """Moves the live grid to the dynamically adjusted ladder (only changed levels are sent)."""
         try:
             market_price = self.exchange.fetch_ticker(PAIR)['last']
             grid_params = self.adjust_grid_parameters()
 
-            grid_levels = [
-                market_price * (1 + (i - grid_params["grid_size"] // 2) * grid_params["grid_spacing"] / 100)
-                for i in range(grid_params["grid_size"])
-            ]
+            ladder = self.grid.build_ladder(market_price, grid_params["grid_size"], grid_params["grid_spacing"], 0.01)
+            changes = self.grid.sync(ladder)
 
-            for price in grid_levels:
-                if price < market_price:
-                    self.exchange.create_limit_buy_order(PAIR, 0.01, price)
-                else:
-                    self.exchange.create_limit_sell_order(PAIR, 0.01, price)
-
-            print(f"✅ Dynamic Grid Trading Activated: {grid_params['grid_size']} Levels, {grid_params['grid_spacing']}% Spacing")
+            print(f"✅ Dynamic Grid Trading Activated: {grid_params['grid_size']} Levels, {grid_params['grid_spacing']}% Spacing "
+                  f"(kept {changes['keep']}, placed {changes['place']}, canceled {changes['cancel']})")
         except Exception as e:
             print(f"⚠️ Error executing dynamic grid trades: {e}")
 
@@ -0,0 +1,231 @@
+# grid_manager.py
+# ==================================================
+# 🪜 GRID MANAGER – INCREMENTAL LADDER UPDATES 🪜
+# ==================================================
+
+from concurrent.futures import ThreadPoolExecutor
+from custom_logging.logger import Logger
+from config import PAIR, GRID_PRICE_TOLERANCE, GRID_SPACING_STEP, GRID_ORDER_WORKERS
+
+OPEN_STATUSES = {"open", "pending", "NEW", "PARTIALLY_FILLED"}
+
+
+def order_id(response):
+    """Extracts the order ID from a ccxt-style, MEXC or SimulatedExchange response."""
+    if not response:
+        return None
+    data = response.get("data") if isinstance(response.get("data"), dict) else response
+    value = data.get("id") or data.get("orderId")
+    return str(value) if value is not None else None
+
+
+class GridManager:
+    def __init__(self, exchange=None, pair=PAIR, price_tolerance=GRID_PRICE_TOLERANCE, max_workers=GRID_ORDER_WORKERS,
+                 use_batch=True, owner=None):
+        """
+        Keeps the desired grid and the live grid in memory and only sends the orders needed to turn one into
+        the other.
+        Args:
+            exchange: ExchangeConnector, SimulatedExchange or any ccxt-style client (ignored when owner is set).
+            pair (str): Traded pair.
+            price_tolerance (float): Relative distance within which a live order counts as sitting on a level.
+            max_workers (int): Concurrent requests (1 = sequential, required for single-threaded simulators).
+            use_batch (bool): Place new orders through create_batch_orders when the exchange has it.
+            owner: Strategy whose `exchange` attribute is read on every request, so re-pointing the strategy
+                (e.g. EventDrivenBacktester.attach) re-points its grid too.
+        """
+        self.owner = owner
+        self._exchange = exchange
+        self.pair = pair
+        self.price_tolerance = price_tolerance
+        self.max_workers = max_workers
+        self.use_batch = use_batch
+        self.executor = ThreadPoolExecutor(max_workers=max_workers) if max_workers > 1 else None
+        self.live = {}  # order id -> {"id", "side", "price", "amount"}
+        self.anchor = None
+        self.spacing = None
+        self.stats = {"placed": 0, "canceled": 0, "amended": 0, "kept": 0, "requests": 0, "failed": 0}
+
+    @property
+    def exchange(self):
+        return self.owner.exchange if self.owner is not None else self._exchange
+
+    # ------------------------------------------------------------------
+    # 📐 Desired ladder
+    # ------------------------------------------------------------------
+    def build_ladder(self, market_price, grid_size, grid_spacing, amount):
+        """
+        Grid levels on a fixed price lattice, so a price move only shifts the levels at the ends of the ladder.
+        The lattice is re-anchored at the market price when the (quantized) spacing changes.
+        Args:
+            market_price (float): Current price.
+            grid_size (int): Number of levels.
+            grid_spacing (float): Spacing in percent (rounded to GRID_SPACING_STEP).
+            amount (float): Size per level.
+        Returns:
+            list: {"side", "price", "amount"} per level – buys below the market, sells at or above it.
+        """
+        spacing = max(GRID_SPACING_STEP, round(grid_spacing / GRID_SPACING_STEP) * GRID_SPACING_STEP)
+        if self.anchor is None or abs(spacing - (self.spacing or 0)) > 1e-9:
+            self.anchor, self.spacing = market_price, spacing
+        step = self.anchor * spacing / 100
+        center = round((market_price - self.anchor) / step)
+        half = grid_size // 2
+        ladder = []
+        for k in range(center - half, center - half + grid_size):
+            price = self.anchor + k * step
+            if price <= 0:
+                continue
+            ladder.append({"side": "BUY" if price < market_price else "SELL", "price": price, "amount": amount})
+        return ladder
+
+    # ------------------------------------------------------------------
+    # 🧮 Diff
+    # ------------------------------------------------------------------
+    def plan(self, desired):
+        """
+        Minimal changes from the live grid to the desired one.
+        Args:
+            desired (list): {"side", "price", "amount"} levels.
+        Returns:
+            dict: keep (live orders), cancel (live orders), amend ((live order, level) pairs with a new size),
+                place (levels).
+        """
+        keep, amend, place = [], [], []
+        unmatched = {order_id: order for order_id, order in self.live.items()}
+        for level in sorted(desired, key=lambda level: level["price"]):
+            tolerance = level["price"] * self.price_tolerance
+            best = None
+            for order in unmatched.values():
+                if order["side"] == level["side"] and abs(order["price"] - level["price"]) <= tolerance:
+                    if best is None or abs(order["price"] - level["price"]) < abs(best["price"] - level["price"]):
+                        best = order
+            if best is None:
+                place.append(level)
+                continue
+            del unmatched[best["id"]]
+            if abs(best["amount"] - level["amount"]) <= 1e-12:
+                keep.append(best)
+            else:
+                amend.append((best, level))
+
+        # ✅ Without a native amend, a size change is a cancel plus a new order
+        if not hasattr(self.exchange, "edit_order"):
+            place.extend(level for _, level in amend)
+            cancel = list(unmatched.values()) + [order for order, _ in amend]
+            amend = []
+        else:
+            cancel = list(unmatched.values())
+        return {"keep": keep, "cancel": cancel, "amend": amend, "place": place}
+
+    # ------------------------------------------------------------------
+    # 📤 Execution
+    # ------------------------------------------------------------------
+    def _run(self, fn, items):
+        """Applies fn to every item, concurrently when a pool is configured."""
+        if not items:
+            return []
+        self.stats["requests"] += len(items)
+        if self.executor is None or getattr(self.exchange, "session", None) is None:  # In-process simulators: sequential
+            return [fn(item) for item in items]
+        return list(self.executor.map(fn, items))
+
+    def _cancel(self, order):
+        try:
+            return self.exchange.cancel_order(order["id"], self.pair)
+        except Exception as e:
+            Logger.warning(f"⚠️ Cancel failed for grid order {order['id']}: {e}")
+            return None
+
+    def _amend(self, change):
+        order, level = change
+        try:
+            return self.exchange.edit_order(order["id"], self.pair, "limit", level["side"].lower(), level["amount"],
+                                            level["price"])
+        except Exception as e:
+            Logger.warning(f"⚠️ Amend failed for grid order {order['id']}: {e}")
+            return None
+
+    def _place(self, level):
+        try:
+            return self.exchange.create_limit_order(self.pair, level["side"].lower(), level["amount"], level["price"])
+        except Exception as e:
+            Logger.warning(f"⚠️ Grid order failed at {level['price']}: {e}")
+            return None
+
+    def _track(self, level, response):
+        """Adds an accepted order to the live grid."""
+        identifier = order_id(response)
+        if identifier is None:
+            self.stats["failed"] += 1
+            return False
+        self.live[identifier] = {"id": identifier, "side": level["side"], "price": level["price"], "amount": level["amount"]}
+        return True
+
+    def refresh(self):
+        """
+        Drops live-grid orders that are no longer open on the exchange (filled or canceled elsewhere),
+        so sync() re-places those levels.
+        """
+        if not self.live or not hasattr(self.exchange, "fetch_open_orders"):
+            return
+        open_orders = self.exchange.fetch_open_orders(self.pair)
+        if open_orders is None:
+            return  # Unknown state – keep the live grid rather than double-placing
+        self.stats["requests"] += 1
+        open_ids = {str(order["id"]) for order in open_orders}
+        for identifier in [identifier for identifier in self.live if identifier not in open_ids]:
+            if hasattr(self.exchange, "fetch_order"):
+                order = self.exchange.fetch_order(identifier)
+                if order and order.get("status") in OPEN_STATUSES:
+                    continue  # Still in flight to the matching engine
+            del self.live[identifier]
+
+    def sync(self, desired, reconcile=True):
+        """
+        Moves the live grid to the desired ladder with the fewest order requests.
+        Cancels go first so their reserved balance is free for the new orders.
+        Args:
+            desired (list): {"side", "price", "amount"} levels (see build_ladder).
+            reconcile (bool): Refresh the live grid from open orders first.
+        Returns:
+            dict: Counts of kept orders and of cancels, amends & placements the exchange accepted.
+        """
+        if reconcile:
+            self.refresh()
+        plan = self.plan(desired)
+        summary = {"keep": len(plan["keep"]), "cancel": 0, "amend": 0, "place": 0}
+        exchange = self.exchange
+
+        for order, response in zip(plan["cancel"], self._run(self._cancel, plan["cancel"])):
+            if response is not None:
+                self.live.pop(order["id"], None)
+                summary["cancel"] += 1
+            else:
+                self.stats["failed"] += 1
+
+        for (order, level), response in zip(plan["amend"], self._run(self._amend, plan["amend"])):
+            if response is not None:
+                self.live.pop(order["id"], None)
+                summary["amend"] += self._track(level, response)
+            else:
+                self.stats["failed"] += 1
+
+        if self.use_batch and hasattr(exchange, "create_batch_orders") and plan["place"]:
+            self.stats["requests"] += (len(plan["place"]) + 19) // 20
+            responses = exchange.create_batch_orders([{"symbol": self.pair, **level} for level in plan["place"]])
+        else:
+            responses = self._run(self._place, plan["place"])
+        for level, response in zip(plan["place"], responses):
+            summary["place"] += self._track(level, response)
+
+        # ✅ Only requests the exchange accepted count; failed levels are retried on the next sync
+        self.stats["kept"] += summary["keep"]
+        self.stats["canceled"] += summary["cancel"]
+        self.stats["amended"] += summary["amend"]
+        self.stats["placed"] += summary["place"]
+        return summary
+
+    def cancel_all(self):
+        """Cancels every order in the live grid."""
+        return self.sync([], reconcile=False)
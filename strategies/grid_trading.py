@@ -4,12 +4,14 @@
 # ==================================================
 
 from core.exchange_connector import ExchangeConnector
+from strategies.grid_manager import GridManager
 from config import PAIR, GRID_SIZE, GRID_SPACING
 
 class GridTrading:
     def __init__(self):
         """Initializes grid trading strategy."""
         self.exchange = ExchangeConnector()
+        self.grid = GridManager(owner=self)  # Follows self.exchange (e.g. when a backtest swaps it)
 
     def generate_grid_levels(self, base_price):
         """
@@ -23,17 +25,12 @@ class GridTrading:
         ]
 
     def execute_grid_trades(self):
-        """Places buy & sell orders at predefined grid levels."""
+        """Moves the live grid to the levels around the current price (only changed levels are sent)."""
         market_price = self.exchange.fetch_ticker(PAIR)['last']
-        grid_levels = self.generate_grid_levels(market_price)
+        changes = self.grid.sync(self.grid.build_ladder(market_price, GRID_SIZE, GRID_SPACING, 0.01))
 
-        for price in grid_levels:
-            if price < market_price:
-                self.exchange.create_limit_buy_order(PAIR, 0.01, price)
-            else:
-                self.exchange.create_limit_sell_order(PAIR, 0.01, price)
-
-        print(f"✅ Grid Trading Activated with {GRID_SIZE} Levels")
+        print(f"✅ Grid Trading Activated with {GRID_SIZE} Levels "
+              f"(kept {changes['keep']}, placed {changes['place']}, canceled {changes['cancel']})")
 
 # 🚀 START STATIC GRID TRADING
 if __name__ == "__main__":
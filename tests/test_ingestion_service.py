@@ -0,0 +1,151 @@
+# test_ingestion_service.py
+# ==================================================
+# 🧪 INGESTION SERVICE TESTS – LOCAL STAND-IN FEED SERVERS 🧪
+# ==================================================
+
+import time
+import asyncio
+from contextlib import asynccontextmanager
+import aiohttp
+import pytest
+from aiohttp import web
+from new_sentiment.ingestion_service import NewsFeedSource, IngestionService
+
+ETAG = '"v1"'
+LAST_MODIFIED = "Mon, 19 Oct 2026 10:00:00 GMT"
+
+
+def _article(n, date="Mon, 19 Oct 2026 09:00:00 GMT"):
+    return {"news_url": f"https://news.local/{n}", "title": f"Story {n}", "text": f"Text {n}", "date": date}
+
+
+@asynccontextmanager
+async def serve(handler):
+    """Runs handler on an ephemeral localhost port and yields the feed URL."""
+    app = web.Application()
+    app.router.add_get("/feed", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    try:
+        yield f"http://127.0.0.1:{port}/feed"
+    finally:
+        await runner.cleanup()
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.mark.parametrize("validator", ["If-None-Match", "If-Modified-Since"])
+def test_conditional_request_skips_unchanged_feed(validator):
+    requests = []
+
+    async def handler(request):
+        requests.append(dict(request.headers))
+        if request.headers.get("If-None-Match") == ETAG or request.headers.get("If-Modified-Since") == LAST_MODIFIED:
+            return web.Response(status=304)
+        headers = {"ETag": ETAG} if validator == "If-None-Match" else {"Last-Modified": LAST_MODIFIED}
+        return web.json_response({"data": [_article(1)]}, headers=headers)
+
+    async def scenario():
+        async with serve(handler) as url, aiohttp.ClientSession() as session:
+            source = NewsFeedSource("local", url, retries=0)
+            first = await source.fetch(session)
+            second = await source.fetch(session)
+            return first, second
+
+    first, second = run(scenario())
+    assert len(first) == 1
+    assert second == []
+    assert len(requests) == 2
+    assert validator not in requests[0]
+    assert requests[1][validator] == (ETAG if validator == "If-None-Match" else LAST_MODIFIED)
+
+
+def test_server_errors_are_retried_with_backoff():
+    arrivals = []
+
+    async def handler(request):
+        arrivals.append(time.monotonic())
+        if len(arrivals) < 3:
+            return web.Response(status=503)
+        return web.json_response({"data": [_article(1)]})
+
+    async def scenario():
+        async with serve(handler) as url, aiohttp.ClientSession() as session:
+            return await NewsFeedSource("local", url, retries=3, backoff=0.1).fetch(session)
+
+    items = run(scenario())
+    assert len(items) == 1
+    assert len(arrivals) == 3
+    first_gap, second_gap = arrivals[1] - arrivals[0], arrivals[2] - arrivals[1]
+    assert first_gap >= 0.1
+    assert second_gap >= 0.2
+
+
+def test_server_errors_give_up_after_retries():
+    arrivals = []
+
+    async def handler(request):
+        arrivals.append(time.monotonic())
+        return web.Response(status=500)
+
+    async def scenario():
+        async with serve(handler) as url, aiohttp.ClientSession() as session:
+            return await NewsFeedSource("local", url, retries=2, backoff=0.01).fetch(session)
+
+    with pytest.raises(aiohttp.ClientResponseError):
+        run(scenario())
+    assert len(arrivals) == 3
+
+
+def test_timeouts_are_retried_with_backoff():
+    arrivals = []
+
+    async def handler(request):
+        arrivals.append(time.monotonic())
+        if len(arrivals) < 3:
+            await asyncio.sleep(1.0)
+        return web.json_response({"data": [_article(1)]})
+
+    async def scenario():
+        timeout = aiohttp.ClientTimeout(total=0.2)
+        async with serve(handler) as url, aiohttp.ClientSession(timeout=timeout) as session:
+            return await NewsFeedSource("local", url, retries=3, backoff=0.1).fetch(session)
+
+    items = run(scenario())
+    assert len(items) == 1
+    assert len(arrivals) == 3
+    assert arrivals[1] - arrivals[0] >= 0.2 + 0.1  # Timeout, then the first backoff
+    assert arrivals[2] - arrivals[1] >= 0.2 + 0.2  # Timeout, then the doubled backoff
+
+
+def test_duplicate_items_are_suppressed(tmp_path):
+    async def first_feed(request):
+        return web.json_response({"data": [_article(1), _article(2)]})
+
+    async def second_feed(request):  # Syndicates story 2 and re-serves it with a newer date
+        return web.json_response({"data": [_article(2, date="Mon, 19 Oct 2026 09:30:00 GMT"), _article(3)]})
+
+    batches = []
+
+    async def scenario():
+        async with serve(first_feed) as first_url, serve(second_feed) as second_url, \
+                aiohttp.ClientSession() as session:
+            service = IngestionService([NewsFeedSource("first", first_url), NewsFeedSource("second", second_url)],
+                                       on_items=batches.append, state_file=str(tmp_path / "state.json"))
+            first_poll = await service.poll_once(session)
+            second_poll = await service.poll_once(session)
+            return service, first_poll, second_poll
+
+    service, first_poll, second_poll = run(scenario())
+    assert sorted(item["id"] for item in first_poll) == [f"https://news.local/{n}" for n in (1, 2, 3)]
+    assert second_poll == []
+    assert service.stats["duplicates"] >= 1
+    assert len(batches) == 1
+
+    restarted = IngestionService([], state_file=str(tmp_path / "state.json"))
+    assert set(restarted.seen) == {f"https://news.local/{n}" for n in (1, 2, 3)}
@@ -0,0 +1,28 @@
+# test_performance_analytics.py
+# ==================================================
+# 🧪 PERFORMANCE ANALYTICS TESTS – DURATIONS IN BARS VS SECONDS 🧪
+# ==================================================
+
+import numpy as np
+import pandas as pd
+from simulation.vectorized_backtest import VectorizedBacktester
+
+
+def _frame():
+    close = np.r_[np.linspace(100, 120, 50), np.linspace(120, 90, 50), np.linspace(90, 130, 50)]
+    signals = pd.Series(np.where(np.arange(len(close)) % 20 < 10, "BUY", "SELL"))
+    return pd.DataFrame({"close": close}), signals
+
+
+def test_bar_indexed_backtest_reports_no_seconds():
+    df, signals = _frame()
+    metrics = VectorizedBacktester().run(df, signals)["metrics"]
+    assert metrics["max_drawdown_duration"] > 0
+    assert "max_drawdown_duration_seconds" not in metrics
+
+
+def test_timestamped_backtest_reports_seconds():
+    df, signals = _frame()
+    df["timestamp"] = pd.date_range("2026-01-01", periods=len(df), freq="h")
+    metrics = VectorizedBacktester().run(df, signals)["metrics"]
+    assert metrics["max_drawdown_duration_seconds"] == metrics["max_drawdown_duration"] * 3600
@@ -0,0 +1,27 @@
+# test_quantum_circuits.py
+# ==================================================
+# 🧪 QUANTUM CIRCUIT TESTS – ANALYTIC BACKEND VS PENNYLANE REFERENCE 🧪
+# ==================================================
+
+import numpy as np
+import pytest
+from quantum_trading.quantum_circuits import ry_cnot_expval
+
+qml = pytest.importorskip("pennylane")
+
+
+def test_analytic_expval_matches_pennylane():
+    dev = qml.device("default.qubit", wires=2)
+
+    @qml.qnode(dev)
+    def circuit(theta0, theta1):
+        qml.RY(theta0, wires=0)
+        qml.RY(theta1, wires=1)
+        qml.CNOT(wires=[0, 1])
+        return qml.expval(qml.PauliZ(0))
+
+    angles = np.linspace(-2 * np.pi, 2 * np.pi, 17)
+    theta0, theta1 = (grid.ravel() for grid in np.meshgrid(angles, angles))
+    reference = np.array([float(circuit(a, b)) for a, b in zip(theta0, theta1)])
+
+    np.testing.assert_allclose(ry_cnot_expval(theta0, theta1), reference, atol=1e-9)
@@ -0,0 +1,95 @@
+# test_trade_monitor.py
+# ==================================================
+# 🧪 TRADE MONITOR TESTS – TRIGGERS FOLLOW FILLS, NOT RESTING ORDERS 🧪
+# ==================================================
+
+from core.order_pipeline import SENT, ACKNOWLEDGED, FILLED
+from core.order_store import OrderStore
+from core.risk_triggers import STOP_LOSS
+from core.trade_monitor import TradeMonitor
+
+
+class StubExchange:
+    """Ticker source that records every order & cancel sent to it."""
+
+    def __init__(self, prices):
+        self.prices = prices
+        self.sent = []
+        self.cancels = []
+
+    def fetch_tickers(self, symbols=None):
+        return {symbol: {"last": self.prices[symbol]} for symbol in (symbols or self.prices)}
+
+    def create_market_sell_order(self, symbol, amount):
+        self.sent.append(("SELL", symbol, amount))
+        return {"id": f"exit-{len(self.sent)}", "status": "closed"}
+
+    def create_market_buy_order(self, symbol, amount):
+        self.sent.append(("BUY", symbol, amount))
+        return {"id": f"exit-{len(self.sent)}", "status": "closed"}
+
+    def cancel_order(self, order_id, symbol=None):
+        self.cancels.append(order_id)
+        return {"id": order_id}
+
+
+def _monitor(prices):
+    exchange = StubExchange(prices)
+    store = OrderStore(reconcile_interval=float("inf"))  # No reconciliation – the test drives the store
+    return TradeMonitor(exchange=exchange, store=store), exchange, store
+
+
+def _acknowledged(store, client_id, side, amount, price=None, order_type="limit"):
+    record = store.add(client_id, "PI/USDT", side, amount, price=price, order_type=order_type)
+    store.transition(record, SENT)
+    store.transition(record, ACKNOWLEDGED, exchange_id=f"ex-{client_id}")
+    return record
+
+
+def _settle(monitor):
+    monitor.triggers.executor.shutdown(wait=True)
+
+
+def test_resting_entry_order_is_never_cancelled():
+    monitor, exchange, store = _monitor({"PI/USDT": 1.00})
+    _acknowledged(store, "resting", "BUY", 10, price=0.94)  # Below the market: would read as take-profit
+
+    assert monitor.check_trade_health() == []
+    _settle(monitor)
+    assert exchange.cancels == [] and exchange.sent == []
+    assert "resting" not in monitor.triggers
+
+
+def test_filled_position_past_its_stop_is_exited():
+    monitor, exchange, store = _monitor({"PI/USDT": 1.00})
+    record = _acknowledged(store, "entry", "BUY", 10, price=1.10)
+    store.transition(record, FILLED, filled=10, average=1.10)
+    assert monitor.triggers.position("entry")["entry"] == 1.10
+
+    breaches = monitor.check_trade_health()
+    _settle(monitor)
+    assert [(position_id, reason) for position_id, reason, _ in breaches] == [("entry", STOP_LOSS)]
+    assert exchange.sent == [("SELL", "PI/USDT", 10.0)]
+    assert exchange.cancels == []
+    assert "entry" not in monitor.triggers
+
+
+def test_market_order_without_price_is_tracked_at_fill():
+    monitor, exchange, store = _monitor({"PI/USDT": 2.00})
+    record = _acknowledged(store, "market", "BUY", 5, order_type="market")
+    assert "market" not in monitor.triggers
+
+    store.transition(record, FILLED, filled=5)
+    position = monitor.triggers.position("market")
+    assert position["quantity"] == 5 and position["entry"] == 2.00
+
+
+def test_spot_sell_fill_reduces_the_long():
+    monitor, exchange, store = _monitor({"PI/USDT": 1.00})
+    buy = _acknowledged(store, "buy", "BUY", 10, price=1.00)
+    store.transition(buy, FILLED, filled=10, average=1.00)
+    sell = _acknowledged(store, "sell", "SELL", 4, price=1.01)
+    store.transition(sell, FILLED, filled=4, average=1.01)
+
+    assert monitor.triggers.position("buy")["quantity"] == 6
+    assert "sell" not in monitor.triggers